@@ -0,0 +1,111 @@
+"""
+Markdown Benchmark - Long single-speaker monologues through write_md
+
+Renders a synthetic single-speaker lecture (3 hours by default) with write_md
+and with the previous implementation, which re-joined the whole turn on every
+word once a monologue passed 45 seconds. Both outputs must be byte-identical;
+a few edge-case transcripts (empty and whitespace-only words) are checked too.
+
+Usage:
+    python benchmarks/bench_markdown.py [--hours H] [--sentence-words N] [--repeat N]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.transit.rendering import write_md, milliseconds_to_hms, is_sentence_boundary
+from benchmarks.synthetic import make_words
+
+def reference_write_md(words, file_name):
+    """Previous implementation: joins the turn on every word to look for a sentence end"""
+    if not words:
+        return
+    with open(file_name, 'w') as file:
+        current_speaker = words[0]['speaker']
+        current_words = []
+        current_start = words[0]['start']
+        for word in words:
+            if word['speaker'] != current_speaker:
+                if current_words:
+                    text = ' '.join(current_words)
+                    file.write(f"{current_speaker.strip().upper()} ({milliseconds_to_hms(current_start)}):\n{text}\n\n")
+                current_speaker = word['speaker']
+                current_words = [word['text']]
+                current_start = word['start']
+            else:
+                current_words.append(word['text'])
+                if (word['end'] - current_start) / 1000 > 45:
+                    current_text = ' '.join(current_words)
+                    if is_sentence_boundary(current_text):
+                        file.write(f"{current_speaker.strip().upper()} ({milliseconds_to_hms(current_start)}):\n{current_text}\n\n")
+                        current_words = []
+                        current_start = word['end']
+        if current_words:
+            text = ' '.join(current_words)
+            file.write(f"{current_speaker.strip().upper()} ({milliseconds_to_hms(current_start)}):\n{text}\n\n")
+
+def make_lecture(hours, sentence_words):
+    """Build a single-speaker transcript covering `hours` of audio"""
+    limit_ms = hours * 3600 * 1000
+    words = make_words(int(hours * 3600 * 3) + 1000, speakers=1, sentence_words=sentence_words)
+    return [w for w in words if w['end'] <= limit_ms]
+
+def edge_cases():
+    """Small transcripts with empty, whitespace-only and padded word texts"""
+    def word(text, start, speaker='A'):
+        return {'text': text, 'start': start, 'end': start + 400, 'speaker': speaker}
+    long_tail = [word('w', i * 500) for i in range(100)]
+    return [
+        long_tail + [word('end.', 50000), word('', 50500), word('next', 51000)],
+        long_tail + [word('end. ', 50000), word('  ', 50500), word('more', 51000)],
+        long_tail + [word('', 50000), word('', 50500), word('B', 51000, 'B')],
+        [word('solo.', 0)],
+    ]
+
+def render(function, words, path, repeat=1):
+    """Render with a writer and return (bytes, best elapsed ms)"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(words, path)
+        timings.append((time.perf_counter() - started) * 1000)
+    with open(path, 'rb') as f:
+        return f.read(), min(timings)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark write_md on a long single-speaker transcript")
+    parser.add_argument("--hours", type=float, default=3, help="Length of the synthetic lecture (default: 3)")
+    parser.add_argument("--sentence-words", type=int, default=40,
+                        help="Average sentence length in words (default: 40)")
+    parser.add_argument("--repeat", type=int, default=5, help="Renders per writer, best is reported (default: 5)")
+    args = parser.parse_args(argv)
+
+    words = make_lecture(args.hours, args.sentence_words)
+    print(f"📄 Synthetic lecture: {len(words)} words, 1 speaker, {milliseconds_to_hms(words[-1]['end'])}")
+
+    ok = True
+    with tempfile.TemporaryDirectory(prefix="transit_bench_") as work_dir:
+        new_path = os.path.join(work_dir, "new.md")
+        old_path = os.path.join(work_dir, "old.md")
+
+        new_bytes, new_ms = render(write_md, words, new_path, args.repeat)
+        old_bytes, old_ms = render(reference_write_md, words, old_path, args.repeat)
+        ok = new_bytes == old_bytes
+        print(f"   write_md      {new_ms:8.1f} ms")
+        print(f"   previous      {old_ms:8.1f} ms   {'✅ identical' if ok else '❌ output differs'}")
+
+        for index, case in enumerate(edge_cases(), 1):
+            if render(write_md, case, new_path)[0] != render(reference_write_md, case, old_path)[0]:
+                print(f"   ❌ edge case {index} differs")
+                ok = False
+
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
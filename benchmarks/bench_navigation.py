@@ -0,0 +1,97 @@
+"""
+Navigation Benchmark - Scaling of the navigation screenplay segmenter
+
+Times group_words_into_navigation_segments on synthetic transcripts from 1k to
+1M words and compares it with the previous window-by-window scan, which is
+kept here as a reference. The reference is only run up to --reference-max
+words because it grows with words x windows. On every size where both run,
+the segments must be identical.
+
+Usage:
+    python benchmarks/bench_navigation.py [--sizes 1000 10000 ...] [--reference-max N]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.transit.rendering import group_words_into_navigation_segments
+from benchmarks.synthetic import make_words
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_REFERENCE_MAX = 50_000
+
+def reference_navigation_segments(words, segment_duration_ms=45000):
+    """Previous implementation: scans every word for every window"""
+    if not words:
+        return []
+    segments = []
+    start_time = words[0]['start']
+    end_time = words[-1]['end']
+    current_time = start_time
+    while current_time < end_time:
+        segment_end = min(current_time + segment_duration_ms, end_time)
+        segment_words = [w for w in words if current_time <= w['start'] < segment_end]
+        if segment_words:
+            parts = []
+            current_speaker = None
+            current_speaker_text = []
+            for word in segment_words:
+                if word['speaker'] != current_speaker:
+                    if current_speaker is not None and current_speaker_text:
+                        parts.append(f"{current_speaker.upper()}: {' '.join(current_speaker_text)}")
+                    current_speaker = word['speaker']
+                    current_speaker_text = [word['text']]
+                else:
+                    current_speaker_text.append(word['text'])
+            if current_speaker is not None and current_speaker_text:
+                parts.append(f"{current_speaker.upper()}: {' '.join(current_speaker_text)}")
+            segments.append({
+                'start': current_time,
+                'end': segment_end,
+                'duration_seconds': (segment_end - current_time) / 1000,
+                'text': '\n\n'.join(parts),
+                'word_count': len(segment_words),
+                'speakers': list(set(w['speaker'] for w in segment_words))
+            })
+        current_time = segment_end
+    return segments
+
+def timed(function, words):
+    """Run a segmenter once and return (segments, elapsed ms)"""
+    started = time.perf_counter()
+    segments = function(words)
+    return segments, (time.perf_counter() - started) * 1000
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark navigation segmenter scaling")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Word counts to test")
+    parser.add_argument("--reference-max", type=int, default=DEFAULT_REFERENCE_MAX,
+                        help=f"Largest size to also run the old implementation on (default: {DEFAULT_REFERENCE_MAX})")
+    parser.add_argument("--speakers", type=int, default=3, help="Speakers in the synthetic transcript (default: 3)")
+    args = parser.parse_args(argv)
+
+    print(f"{'words':>10} {'windows':>8} {'new ms':>10} {'old ms':>10}  identical")
+    ok = True
+    for size in args.sizes:
+        words = make_words(size, speakers=args.speakers)
+        segments, new_ms = timed(group_words_into_navigation_segments, words)
+
+        old_column, identical = "-", "-"
+        if size <= args.reference_max:
+            reference, old_ms = timed(reference_navigation_segments, words)
+            matches = reference == segments
+            ok = ok and matches
+            old_column = f"{old_ms:.1f}"
+            identical = "✅" if matches else "❌"
+
+        print(f"{size:>10} {len(segments):>8} {new_ms:>10.1f} {old_column:>10}  {identical}")
+
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
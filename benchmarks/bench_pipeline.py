@@ -0,0 +1,278 @@
+"""
+Pipeline Benchmark - Time every offline stage of the batch pipeline
+
+Generates synthetic transcripts (1k to 1M words, 2 to 12 speakers by default)
+and synthetic media folders (hundreds of files), then times the stages of
+batch_process, label_speakers, organize_files and video_preprocessor that
+run without the network:
+
+    transcripts: segmentation, SRT / Markdown / navigation rendering, JSON
+                 write and load, sidecar write and load, render cache,
+                 speaker index, relabeling and saving the relabeled JSON
+    media:       discovery of unprocessed files and organizing outputs
+
+Each result is the best of --repeat runs (transcripts over 100k words are
+timed once). Results are written as JSON; pass an earlier results file with
+--compare to flag stages that got slower. Exits non-zero on a regression.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--sizes 1000 10000 ...] [--speakers 2 12]
+        [--files 500] [--repeat 3] [--output results.json]
+        [--compare baseline.json] [--tolerance 1.5]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import contextlib
+import subprocess
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.transit import rendering
+from src.transit.batch_process import find_unprocessed_mp3_files, organize_files_for_audio
+from src.transit.organize_files import organize_files_for_audio as organize_standalone
+from src.transit.rendering import group_words_into_segments, write_srt, write_md, write_navigation_screenplay
+from src.transit.label_speakers import find_latest_transcript
+from src.transit.transcript_sidecar import load_transcript, save_sidecar, save_transcript
+from src.transit.render_cache import (
+    get_render_cache,
+    get_render_cache_path,
+    build_speaker_index,
+    relabel_transcript
+)
+from src.transit.video_preprocessor import find_unprocessed_media_files
+from benchmarks.synthetic import make_transcript, make_media_dir
+
+RESULTS_VERSION = 1
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_SPEAKERS = [2, 12]
+DEFAULT_FILES = [500]
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 1.5
+
+# Transcripts above this size are timed once, whatever --repeat says
+REPEAT_LIMIT_WORDS = 100_000
+
+# Stages faster than this are too noisy to count as regressions
+MIN_COMPARE_SECONDS = 0.005
+
+def measure(function, repeat, setup=None):
+    """Best wall-clock time of `repeat` runs; setup() runs untimed before each"""
+    best = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            started = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def bench_transcript(size, speakers, repeat, workdir):
+    """Time the transcript stages for one synthetic transcript
+
+    Returns:
+        List of (module, stage, seconds)
+    """
+    transcript = make_transcript(size, speakers=speakers)
+    words = transcript['words']
+    workdir = tempfile.mkdtemp(prefix=f"{size}-{speakers}-", dir=workdir)
+    json_file = os.path.join(workdir, 'bench.json')
+    relabeled_json = os.path.join(workdir, 'bench new_transcript_aai.json')
+    srt_file = os.path.join(workdir, 'bench subtitle_aai.srt')
+    md_file = os.path.join(workdir, 'bench screenplay_aai.md')
+    navigation_file = os.path.join(workdir, 'bench screenplay_navigation.md')
+    labels = sorted({word['speaker'] for word in words})
+    mapping = {label: f"Speaker {index + 1}" for index, label in enumerate(labels)}
+    results = []
+
+    def run(module, stage, function, setup=None):
+        results.append((module, stage, measure(function, repeat, setup)))
+
+    def write_json():
+        with open(json_file, 'w') as f:
+            json.dump(transcript, f, indent=2)
+
+    # What batch_process does with a finished transcript
+    run('batch_process', 'segmentation', lambda: group_words_into_segments(words))
+    run('batch_process', 'render_srt', lambda: write_srt(words, srt_file))
+    run('batch_process', 'render_md', lambda: write_md(words, md_file))
+    run('batch_process', 'render_navigation', lambda: write_navigation_screenplay(words, navigation_file))
+    run('batch_process', 'json_write', write_json)
+    del transcript, words
+
+    # What label_speakers does to relabel it
+    loaded = {}
+
+    def load():
+        loaded['data'] = load_transcript(json_file)
+
+    def remove_render_cache():
+        if os.path.exists(get_render_cache_path(json_file)):
+            os.remove(get_render_cache_path(json_file))
+
+    run('label_speakers', 'json_load', load)
+    run('label_speakers', 'sidecar_write', lambda: save_sidecar(json_file, loaded['data']))
+    run('label_speakers', 'sidecar_load', load)
+    run('label_speakers', 'speaker_index', lambda: build_speaker_index(loaded['data']['words']))
+    run('label_speakers', 'render_cache_build', lambda: get_render_cache(json_file, loaded['data']['words']),
+        setup=remove_render_cache)
+    cache = get_render_cache(json_file, loaded['data']['words'])
+    run('label_speakers', 'relabel',
+        lambda: relabel_transcript(json_file, loaded['data']['words'], mapping, srt_file, md_file, cache),
+        setup=load)
+    run('label_speakers', 'json_save', lambda: save_transcript(loaded['data'], relabeled_json))
+    loaded.clear()
+    shutil.rmtree(workdir)
+    return results
+
+@contextlib.contextmanager
+def working_directory(directory):
+    """Run the enclosed code with `directory` as the current folder"""
+    previous = os.getcwd()
+    os.chdir(directory)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+def bench_media(files, repeat, workdir):
+    """Time discovery and organizing on a synthetic media folder
+
+    Returns:
+        List of (module, stage, seconds)
+    """
+    media_dir = os.path.join(workdir, 'media')
+    layout = {}
+
+    def fresh_media_dir():
+        # Emptied rather than removed, since it is the current folder while timing
+        if os.path.exists(media_dir):
+            for entry in os.scandir(media_dir):
+                if entry.is_dir():
+                    shutil.rmtree(entry.path)
+                else:
+                    os.remove(entry.path)
+        layout.update(make_media_dir(media_dir, files))
+
+    fresh_media_dir()
+    results = []
+
+    def run(module, stage, function, setup=None):
+        with working_directory(media_dir):
+            results.append((module, stage, measure(function, repeat, setup)))
+
+    run('batch_process', 'discovery', lambda: find_unprocessed_mp3_files('.', settle_seconds=0))
+    run('video_preprocessor', 'discovery', lambda: find_unprocessed_media_files('.', verbose=False))
+    run('label_speakers', 'discovery', lambda: find_latest_transcript('.'))
+
+    def organize_pending_batch():
+        for media_file in layout['pending']:
+            organize_files_for_audio(os.path.basename(media_file))
+
+    def organize_pending_standalone():
+        for media_file in layout['pending']:
+            organize_standalone(os.path.basename(media_file))
+
+    run('batch_process', 'organize', organize_pending_batch, setup=fresh_media_dir)
+    run('organize_files', 'organize', organize_pending_standalone, setup=fresh_media_dir)
+    return results
+
+def get_git_commit():
+    """Current commit of the repository, or None outside a git checkout"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def result_key(result):
+    return (result['module'], result['stage'], result.get('words'), result.get('speakers'), result.get('files'))
+
+def compare_results(results, baseline_file, tolerance):
+    """Print timings against an earlier results file
+
+    Returns:
+        Number of stages more than `tolerance` times slower than the baseline
+    """
+    with open(baseline_file, 'r') as f:
+        baseline = {result_key(result): result['seconds'] for result in json.load(f)['results']}
+
+    print(f"\nCompared with {baseline_file} (tolerance {tolerance:g}x):")
+    regressions = 0
+    for result in results:
+        before = baseline.get(result_key(result))
+        if before is None:
+            continue
+        ratio = result['seconds'] / before if before else float('inf')
+        regressed = ratio > tolerance and result['seconds'] >= MIN_COMPARE_SECONDS
+        regressions += regressed
+        if regressed or ratio < 1 / tolerance:
+            size = f"{result['words']} words/{result['speakers']} speakers" if 'words' in result \
+                else f"{result['files']} files"
+            print(f"   {'❌' if regressed else '🚀'} {result['module']}.{result['stage']} ({size}): "
+                  f"{before * 1000:.1f} ms -> {result['seconds'] * 1000:.1f} ms ({ratio:.2f}x)")
+    print(f"{'❌' if regressions else '✅'} {regressions} regression(s)")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the offline stages of the batch pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Transcript word counts")
+    parser.add_argument("--speakers", type=int, nargs="+", default=DEFAULT_SPEAKERS, help="Speaker counts")
+    parser.add_argument("--files", type=int, nargs="+", default=DEFAULT_FILES, help="Media folder sizes")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"Runs per stage, best one counts (default: {DEFAULT_REPEAT})")
+    parser.add_argument("--output", default="bench_pipeline_results.json",
+                        help="Where to write the JSON results (default: bench_pipeline_results.json)")
+    parser.add_argument("--compare", default=None, help="Earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Slowdown factor counted as a regression (default: {DEFAULT_TOLERANCE:g})")
+    args = parser.parse_args(argv)
+    if args.repeat < 1 or args.tolerance <= 1:
+        parser.error("--repeat must be at least 1 and --tolerance greater than 1")
+
+    results = []
+    print(f"{'module':<20} {'stage':<20} {'input':>24} {'time':>12}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            repeat = args.repeat if size <= REPEAT_LIMIT_WORDS else 1
+            for speakers in args.speakers:
+                for module, stage, seconds in bench_transcript(size, speakers, repeat, workdir):
+                    results.append({'module': module, 'stage': stage, 'words': size, 'speakers': speakers,
+                                    'seconds': seconds})
+                    print(f"{module:<20} {stage:<20} {f'{size} w / {speakers} spk':>24} {seconds * 1000:>9.1f} ms")
+
+        for files in args.files:
+            for module, stage, seconds in bench_media(files, args.repeat, workdir):
+                results.append({'module': module, 'stage': stage, 'files': files, 'seconds': seconds})
+                print(f"{module:<20} {stage:<20} {f'{files} files':>24} {seconds * 1000:>9.1f} ms")
+
+    report = {
+        'version': RESULTS_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': get_git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': rendering.np is not None,
+        'config': {'sizes': args.sizes, 'speakers': args.speakers, 'files': args.files, 'repeat': args.repeat},
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📄 Results written to {args.output}")
+
+    if args.compare and compare_results(results, args.compare, args.tolerance):
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Rendering Benchmark - Time the shared renderer on the example podcast transcript
+
+Renders the example transcript to SRT, Markdown and the navigation screenplay
+several times, prints the timings, and checks that the SRT and Markdown output
+is byte-identical to the committed example files. Exits non-zero on a mismatch,
+so it doubles as a regression check for rendering changes.
+
+Usage:
+    python benchmarks/bench_rendering.py [--repeat N]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.transit.rendering import write_srt, write_md, write_navigation_screenplay
+
+EXAMPLE_DIR = os.path.join(REPO_ROOT, "workbench", "output", "EXAMPLE - AI Ethics Podcast")
+EXAMPLE_JSON = os.path.join(EXAMPLE_DIR, "The AI impact on Ethics new_transcript_aai.json")
+EXAMPLE_SRT = os.path.join(EXAMPLE_DIR, "The AI impact on Ethics subtitle_aai.srt")
+EXAMPLE_MD = os.path.join(EXAMPLE_DIR, "The AI impact on Ethics screenplay_aai.md")
+
+def time_renderer(render, words, output_file, repeat):
+    """Run a renderer `repeat` times and return the best and mean wall time in ms"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render(words, output_file)
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings), sum(timings) / len(timings)
+
+def files_match(produced, expected):
+    """Compare two files byte for byte"""
+    with open(produced, 'rb') as a, open(expected, 'rb') as b:
+        return a.read() == b.read()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark transcript rendering on the example podcast")
+    parser.add_argument("--repeat", type=int, default=20, help="Renders per output format (default: 20)")
+    args = parser.parse_args(argv)
+
+    with open(EXAMPLE_JSON, 'r') as f:
+        words = json.load(f)['words']
+    print(f"📄 Example transcript: {len(words)} words, {args.repeat} renders per format")
+
+    renderers = [
+        ("srt", write_srt, EXAMPLE_SRT),
+        ("md", write_md, EXAMPLE_MD),
+        ("navigation", write_navigation_screenplay, None),
+    ]
+
+    ok = True
+    with tempfile.TemporaryDirectory(prefix="transit_bench_") as work_dir:
+        for name, render, expected in renderers:
+            output_file = os.path.join(work_dir, f"example.{name}")
+            best_ms, mean_ms = time_renderer(render, words, output_file, args.repeat)
+            status = ""
+            if expected:
+                matches = files_match(output_file, expected)
+                ok = ok and matches
+                status = "  ✅ identical" if matches else "  ❌ differs from committed example"
+            print(f"   {name:<11} best {best_ms:8.2f} ms   mean {mean_ms:8.2f} ms{status}")
+
+    if not ok:
+        print("❌ Rendering output changed")
+        return 1
+    print("✅ Rendering output matches the committed example")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
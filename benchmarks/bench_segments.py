@@ -0,0 +1,80 @@
+"""
+Segment Benchmark - Word-by-word versus vectorized subtitle segmentation
+
+Times segment_start_indices_python and segment_start_indices_numpy on
+synthetic transcripts, both as a list of word dicts and as a WordStore, and
+checks that every variant finds the same segment starts, also after a rename
+that gives two speakers the same label. Needs NumPy.
+
+Usage:
+    python benchmarks/bench_segments.py [--sizes 10000 100000 ...]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.transit import rendering
+from src.transit.word_store import WordStore
+from benchmarks.synthetic import make_words
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+def timed(function, words):
+    """Run a segmenter once and return (starts, elapsed ms)"""
+    started = time.perf_counter()
+    starts = function(words)
+    return starts, (time.perf_counter() - started) * 1000
+
+def check_merging_rename(words):
+    """Rename the first two speakers to one label and compare all variants
+
+    Returns:
+        True if list and WordStore, Python and NumPy all agree
+    """
+    labels = sorted({word['speaker'] for word in words})
+    mapping = {label: "Host" for label in labels[:2]}
+    renamed = [dict(word, speaker=mapping.get(word['speaker'], word['speaker'])) for word in words]
+    store = WordStore.from_words(words)
+    store.rename_speakers(mapping)
+    expected = rendering.segment_start_indices_python(renamed)
+    return all(function(variant) == expected
+               for function in (rendering.segment_start_indices_python, rendering.segment_start_indices_numpy)
+               for variant in (renamed, store))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark subtitle segment detection")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Word counts to test")
+    parser.add_argument("--speakers", type=int, default=4, help="Speakers in the synthetic transcript (default: 4)")
+    args = parser.parse_args(argv)
+
+    if rendering.np is None:
+        print("❌ NumPy is not installed; only the pure-Python path is available")
+        return 1
+
+    variants = [
+        ("python/list", rendering.segment_start_indices_python, False),
+        ("numpy/list", rendering.segment_start_indices_numpy, False),
+        ("python/store", rendering.segment_start_indices_python, True),
+        ("numpy/store", rendering.segment_start_indices_numpy, True),
+    ]
+    print(f"{'words':>10} {'segments':>9} " + " ".join(f"{name:>13}" for name, _, _ in variants) + "  identical")
+
+    ok = True
+    for size in args.sizes:
+        words = make_words(size, speakers=args.speakers)
+        store = WordStore.from_words(words)
+        results = [timed(function, store if use_store else words) for _, function, use_store in variants]
+        identical = all(starts == results[0][0] for starts, _ in results) and check_merging_rename(words)
+        ok = ok and identical
+        timings = " ".join(f"{elapsed:>10.1f} ms" for _, elapsed in results)
+        print(f"{size:>10} {len(results[0][0]):>9} {timings}  {'✅' if identical else '❌'}")
+
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Synthetic Transcripts - Deterministic AssemblyAI-style word lists for benchmarks
+
+Generates word lists with realistic timing (short words, occasional pauses,
+sentence punctuation) and speaker turns, seeded so every run sees the same data.
+Also builds media folders in the states a batch run leaves files in.
+"""
+
+import os
+import json
+import random
+
+VOCABULARY = (
+    "the of and to in is that it for on with as was this be are by at from "
+    "about ethics model data people think really system question because "
+    "research language future important actually responsibility society "
+    "decision machine learning transparency fairness regulation"
+).split()
+
+def make_words(count, speakers=2, seed=0, mean_turn_words=60, sentence_words=14):
+    """Build a synthetic list of `count` word dicts
+
+    Args:
+        count: Number of words
+        speakers: Number of distinct speakers (1 gives a single-speaker monologue)
+        seed: Random seed
+        mean_turn_words: Average number of words before the speaker changes
+        sentence_words: Average sentence length in words
+
+    Returns:
+        List of word dicts with text, start, end, confidence and speaker
+    """
+    rng = random.Random(seed)
+    labels = [chr(ord('A') + i % 26) * (1 + i // 26) for i in range(speakers)]
+    words = []
+    time_ms = 0
+    speaker = 0
+    sentence_left = rng.randint(1, 2 * sentence_words)
+    turn_left = rng.randint(1, 2 * mean_turn_words)
+
+    for _ in range(count):
+        text = rng.choice(VOCABULARY)
+        sentence_left -= 1
+        turn_left -= 1
+        if sentence_left <= 0 or (turn_left <= 0 and speakers > 1):
+            text += rng.choice('..?!')
+            sentence_left = rng.randint(1, 2 * sentence_words)
+
+        duration = rng.randint(120, 480)
+        words.append({
+            'text': text,
+            'start': time_ms,
+            'end': time_ms + duration,
+            'confidence': 0.9,
+            'speaker': labels[speaker]
+        })
+        time_ms += duration + rng.choice((0, 20, 40, 80, 150, 600))
+
+        if turn_left <= 0 and speakers > 1:
+            speaker = (speaker + rng.randint(1, speakers - 1)) % speakers
+            turn_left = rng.randint(1, 2 * mean_turn_words)
+            time_ms += rng.randint(200, 2500)
+
+    return words
+
+def make_transcript(count, speakers=2, seed=0):
+    """Build a transcript dict shaped like the JSON that batch_process writes"""
+    words = make_words(count, speakers=speakers, seed=seed)
+    return {
+        'id': f"synthetic-{count}-{speakers}-{seed}",
+        'text': ' '.join(word['text'] for word in words),
+        'words': words,
+        'status': 'completed',
+        'audio_url': f"synthetic-{count}.mp3",
+        'language_code': 'en',
+    }
+
+MEDIA_EXTENSIONS = ('.mp3', '.mp3', '.mp3', '.wav', '.m4a', '.mp4', '.mov')
+
+def make_media_dir(directory, files, seed=0, processed_share=0.5, pending_share=0.25, transcript_words=50):
+    """Fill a folder with media files in every state a batch run leaves behind
+
+    Files are laid out like a run in the current folder (no workbench):
+      processed - moved into <name>/ together with <name>.json
+      pending   - transcribed but not organized yet: <name>.json, the SRT and
+                  the screenplay next to the media file
+      new       - just the media file
+
+    Returns:
+        Dict with the media paths in each state ('processed', 'pending', 'new')
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    transcript = make_transcript(transcript_words, seed=seed)
+    layout = {'processed': [], 'pending': [], 'new': []}
+
+    for index in range(files):
+        base_name = f"episode-{index:05d}"
+        extension = rng.choice(MEDIA_EXTENSIONS)
+        roll = rng.random()
+        state = 'processed' if roll < processed_share else 'pending' if roll < processed_share + pending_share else 'new'
+        folder = os.path.join(directory, base_name) if state == 'processed' else directory
+        os.makedirs(folder, exist_ok=True)
+
+        media_file = os.path.join(folder, f"{base_name}{extension}")
+        with open(media_file, 'wb') as f:
+            f.write(b'\0' * rng.randint(512, 4096))
+        if state != 'new':
+            with open(os.path.join(folder, f"{base_name}.json"), 'w') as f:
+                json.dump(transcript, f)
+        if state == 'pending':
+            for suffix in (' subtitle_aai.srt', ' screenplay_aai.md'):
+                with open(os.path.join(folder, f"{base_name}{suffix}"), 'w') as f:
+                    f.write(transcript['text'])
+        layout[state].append(media_file)
+
+    return layout
@@ -0,0 +1,127 @@
+"""
+Async Client - asyncio transcription service for the AssemblyAI REST API
+
+The SDK's Transcriber uploads and then polls with blocking calls, which needs
+a thread per job in flight. This client runs upload, submit and poll as
+coroutines over one shared httpx connection pool instead, so a single event
+loop can keep hundreds of jobs in flight. Polling backs off geometrically
+while a job is queued or processing, so long jobs cost few requests.
+"""
+
+import asyncio
+
+import httpx
+
+API_BASE_URL = 'https://api.assemblyai.com'
+UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024
+DEFAULT_MAX_CONNECTIONS = 20
+
+# Adaptive polling: start fast for short jobs, back off for long ones
+POLL_INITIAL_SECONDS = 1.0
+POLL_MAX_SECONDS = 15.0
+POLL_BACKOFF = 1.5
+
+# Final job states reported by the API
+STATUS_COMPLETED = 'completed'
+STATUS_ERROR = 'error'
+
+async def iter_file_chunks(audio_file, chunk_size=UPLOAD_CHUNK_SIZE):
+    """Read a file in chunks without blocking the event loop"""
+    with open(audio_file, 'rb') as f:
+        while True:
+            chunk = await asyncio.to_thread(f.read, chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+def next_poll_interval(interval):
+    """Poll interval to use after `interval` seconds found the job unfinished"""
+    return min(interval * POLL_BACKOFF, POLL_MAX_SECONDS)
+
+class AsyncTranscriptionClient:
+    """Upload, submit and poll transcription jobs over one shared connection pool
+
+    Use as an async context manager:
+
+        async with AsyncTranscriptionClient(api_key) as client:
+            response = await client.transcribe("talk.mp3", settings)
+    """
+
+    def __init__(self, api_key, base_url=API_BASE_URL, max_connections=DEFAULT_MAX_CONNECTIONS):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.http = None
+
+    async def __aenter__(self):
+        self.http = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={'authorization': self.api_key},
+            limits=httpx.Limits(max_connections=self.max_connections,
+                                max_keepalive_connections=self.max_connections),
+            timeout=httpx.Timeout(60.0, connect=10.0)
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.http.aclose()
+
+    async def upload(self, audio_file):
+        """Upload a local audio file and return its upload URL"""
+        response = await self.http.post('/v2/upload', content=iter_file_chunks(audio_file))
+        response.raise_for_status()
+        return response.json()['upload_url']
+
+    async def submit(self, audio_url, settings):
+        """Submit a transcription job for an uploaded file and return the job response"""
+        response = await self.http.post('/v2/transcript', json=dict(settings, audio_url=audio_url))
+        response.raise_for_status()
+        return response.json()
+
+    async def get(self, job_id):
+        """Fetch the current state of a job"""
+        response = await self.http.get(f'/v2/transcript/{job_id}')
+        response.raise_for_status()
+        return response.json()
+
+    async def wait(self, job_id, interval=POLL_INITIAL_SECONDS):
+        """Poll a job until it completes or fails and return the final response"""
+        while True:
+            job = await self.get(job_id)
+            if job.get('status') in (STATUS_COMPLETED, STATUS_ERROR):
+                return job
+            await asyncio.sleep(interval)
+            interval = next_poll_interval(interval)
+
+    async def transcribe(self, audio_file, settings):
+        """Upload, submit and wait for one file"""
+        upload_url = await self.upload(audio_file)
+        job = await self.submit(upload_url, settings)
+        return await self.wait(job['id'])
+
+def transcript_data_from_response(response, audio_file):
+    """Convert a completed API response into the JSON structure written to disk
+
+    Produces the same layout as transcription_backends.transcript_data_from_sdk
+    does for SDK transcript objects.
+    """
+    transcript_data = {
+        'id': response.get('id', 'unknown'),
+        'text': response.get('text', ''),
+        'words': [],
+        'status': 'completed',
+        'audio_url': audio_file,
+        'language_code': response.get('language_code', 'en'),
+    }
+
+    # Add words with speaker labels
+    for word in response.get('words') or []:
+        transcript_data['words'].append({
+            'text': word['text'],
+            'start': word['start'],
+            'end': word['end'],
+            'confidence': word['confidence'],
+            'speaker': word.get('speaker', 'A')
+        })
+
+    return transcript_data
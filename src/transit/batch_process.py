@@ -1,250 +1,132 @@
 import assemblyai as aai
-import json
 import os
-import glob
 import time
 import shutil
 from pathlib import Path
-import copy
-import textwrap
-import subprocess
 import sys
+import argparse
+import hashlib
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+if not __package__:
+    # Run as a script (python /path/to/transit/src/transit/batch_process.py):
+    # make the package importable so the relative imports below resolve
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    __package__ = 'src.transit'
+
+from .rendering import (
+    milliseconds_to_hms,
+    group_words_into_segments,
+    write_srt,
+    write_md,
+    write_navigation_screenplay
+)
+from .transcript_reader import write_transcript
+from .transcript_sidecar import save_sidecar, SIDECAR_SUFFIX
+from .render_cache import RENDER_CACHE_SUFFIX, SPEAKER_MAPPING_SUFFIX
+from .output_manifest import (
+    make_manifest,
+    parse_artifacts,
+    write_compat_copy,
+    ARTIFACTS,
+    DEFAULT_ARTIFACTS,
+    DEFAULT_MANIFEST,
+    COMPAT_MODES,
+    DEFAULT_COMPAT_MODE
+)
+from .job_ledger import (
+    JobLedger,
+    compute_file_hash,
+    LEDGER_FILENAME,
+    STATE_SUBMITTED,
+    STATE_COMPLETED,
+    STATE_FAILED
+)
+from .transcript_cache import (
+    TranscriptCache,
+    make_cache_key,
+    CACHE_DIRNAME,
+    DEFAULT_MAX_CACHE_MB
+)
+from .chunked_transcription import (
+    needs_chunking,
+    transcribe_in_chunks,
+    DEFAULT_CHUNK_MINUTES,
+    DEFAULT_OVERLAP_SECONDS,
+    DEFAULT_SPLIT_OVER_MINUTES,
+    DEFAULT_CHUNK_WORKERS
+)
+from .video_preprocessor import (
+    check_ffmpeg,
+    extract_audio,
+    find_unprocessed_media_files,
+    get_media_duration_ms,
+    plan_extraction,
+    open_audio_stream,
+    EXTRACTION_PROFILES,
+    DEFAULT_PROFILE,
+    AUTO_PROFILE,
+    VIDEO_EXTENSIONS,
+    AUDIO_EXTENSIONS,
+    DEFAULT_WORKERS as DEFAULT_EXTRACT_WORKERS
+)
+from .input_watcher import open_watcher, DEFAULT_QUIET_SECONDS, DEFAULT_POLL_SECONDS
+from .media_inventory import build_inventory, find_transcript, mark_processed, unprocessed_media
+from .async_client import (
+    AsyncTranscriptionClient,
+    transcript_data_from_response,
+    API_BASE_URL,
+    DEFAULT_MAX_CONNECTIONS,
+    STATUS_ERROR
+)
+from .transcription_backends import (
+    make_backend,
+    wait_for_job,
+    RetryingBackend,
+    add_backend_arguments,
+    backend_from_arguments,
+    DEFAULT_BACKEND
+)
+from .job_scheduler import (
+    JobScheduler,
+    make_retry_policy,
+    classify_error,
+    DEFAULT_UPLOAD_RETRIES,
+    DEFAULT_POLL_RETRIES,
+    DEFAULT_REQUESTS_PER_SECOND
+)
 
 # Workbench configuration
 WORKBENCH_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'workbench')
 INPUT_DIR = os.path.join(WORKBENCH_DIR, 'input')
 OUTPUT_DIR = os.path.join(WORKBENCH_DIR, 'output')
 
-def seconds_to_hms(seconds):
-    hours = seconds // 3600
-    seconds %= 3600
-    minutes = seconds // 60
-    seconds %= 60
-    return f"{int(hours):02d}:{int(minutes):02d}:{int(seconds):02d}"
-
-def milliseconds_to_hms(milliseconds):
-    """Convert milliseconds to HH:MM:SS format"""
-    seconds = milliseconds / 1000
-    return seconds_to_hms(seconds)
-
-def milliseconds_to_srt_time(milliseconds):
-    """Convert milliseconds to SRT timestamp format (HH:MM:SS,mmm)"""
-    total_seconds = milliseconds / 1000
-    hours = int(total_seconds // 3600)
-    minutes = int((total_seconds % 3600) // 60)
-    seconds = int(total_seconds % 60)
-    ms = int(milliseconds % 1000)
-    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{ms:03d}"
-
-def group_words_into_segments(words, max_gap_ms=2000, max_words_per_segment=15):
-    """Group words into segments based on time gaps and word count"""
-    if not words:
-        return []
-    
-    segments = []
-    current_segment = {
-        'words': [words[0]],
-        'speaker': words[0]['speaker'],
-        'start': words[0]['start'], 
-        'end': words[0]['end']
-    }
-    
-    for word in words[1:]:
-        time_gap = word['start'] - current_segment['end']
-        speaker_changed = word['speaker'] != current_segment['speaker']
-        segment_too_long = len(current_segment['words']) >= max_words_per_segment
-        
-        if speaker_changed or time_gap > max_gap_ms or segment_too_long:
-            # Finalize current segment
-            current_segment['text'] = ' '.join([w['text'] for w in current_segment['words']])
-            segments.append(current_segment)
-            
-            # Start new segment
-            current_segment = {
-                'words': [word],
-                'speaker': word['speaker'],
-                'start': word['start'],
-                'end': word['end']
-            }
-        else:
-            # Add word to current segment
-            current_segment['words'].append(word)
-            current_segment['end'] = word['end']
-    
-    # Add final segment
-    if current_segment['words']:
-        current_segment['text'] = ' '.join([w['text'] for w in current_segment['words']])
-        segments.append(current_segment)
-    
-    return segments
-
-def write_srt(words, file_name):
-    """Write SRT file from AssemblyAI words data"""
-    segments = group_words_into_segments(words)
-    
-    counter = 1
-    with open(file_name, 'w') as file:
-        for segment in segments:
-            start_time = milliseconds_to_srt_time(segment['start'])
-            end_time = milliseconds_to_srt_time(segment['end'])
-            speaker = segment['speaker'].strip()
-            text = segment['text']
-            
-            file.write(f"{counter}\n")
-            file.write(f"{start_time} --> {end_time}\n")
-            file.write(f"[{speaker.upper()}]\n")
-            for line in textwrap.wrap(text, 65):
-                file.write(f"{line}\n")
-            file.write("\n")
-            counter += 1
-
-def is_sentence_boundary(text):
-    """Check if text ends with sentence boundary punctuation"""
-    return text.strip().endswith(('.', '!', '?'))
-
-def write_md(words, file_name):
-    """Write natural speaker-turn Markdown file from AssemblyAI words data"""
-    if not words:
-        return
-    
-    with open(file_name, 'w') as file:
-        current_speaker = words[0]['speaker']
-        current_words = []
-        current_start = words[0]['start']
-        
-        for word in words:
-            # Check if speaker changed
-            if word['speaker'] != current_speaker:
-                # Write current speaker's turn
-                if current_words:
-                    speaker = current_speaker.strip()
-                    timecode = milliseconds_to_hms(current_start)
-                    text = ' '.join(current_words)
-                    file.write(f"{speaker.upper()} ({timecode}):\n{text}\n\n")
-                
-                # Start new speaker turn
-                current_speaker = word['speaker']
-                current_words = [word['text']]
-                current_start = word['start']
-            else:
-                # Same speaker - check if we need to break long monologue
-                current_words.append(word['text'])
-                
-                # Check if current monologue exceeds 45 seconds
-                current_duration = (word['end'] - current_start) / 1000  # Convert to seconds
-                if current_duration > 45:
-                    # Look for sentence boundary to break
-                    current_text = ' '.join(current_words)
-                    if is_sentence_boundary(current_text):
-                        # Write current segment
-                        speaker = current_speaker.strip()
-                        timecode = milliseconds_to_hms(current_start)
-                        file.write(f"{speaker.upper()} ({timecode}):\n{current_text}\n\n")
-                        
-                        # Start new segment for same speaker
-                        current_words = []
-                        current_start = word['end']  # Start from end of last word
-        
-        # Write final speaker turn
-        if current_words:
-            speaker = current_speaker.strip()
-            timecode = milliseconds_to_hms(current_start)
-            text = ' '.join(current_words)
-            file.write(f"{speaker.upper()} ({timecode}):\n{text}\n\n")
-
-def group_words_into_navigation_segments(words, segment_duration_ms=45000):
-    """
-    Group words into fixed-duration segments for navigation purposes
-    
-    Args:
-        words: List of word objects with start, end, text, speaker
-        segment_duration_ms: Duration of each segment in milliseconds (default: 45 seconds)
-    
-    Returns:
-        List of segments with consistent duration for easy navigation
-    """
-    if not words:
-        return []
-    
-    segments = []
-    
-    # Get the total duration
-    start_time = words[0]['start']
-    end_time = words[-1]['end']
-    total_duration = end_time - start_time
-    
-    # Create segments at fixed intervals
-    current_time = start_time
+# Transcription settings (also part of the transcript cache key)
+TRANSCRIPTION_SETTINGS = {
+    'speaker_labels': True,
+    'format_text': True,
+    'punctuate': True,
+    'speech_model': 'best',
+    'language_detection': True,
+}
+
+class KeyedLocks:
+    """One lock per key (such as a cache key), created on first use"""
     
-    while current_time < end_time:
-        segment_end = min(current_time + segment_duration_ms, end_time)
-        
-        # Find words in this time range
-        segment_words = []
-        for word in words:
-            if word['start'] >= current_time and word['start'] < segment_end:
-                segment_words.append(word)
-        
-        if segment_words:
-            # Build segment text with speaker changes indicated
-            segment_text_parts = []
-            current_speaker = None
-            current_speaker_text = []
-            
-            for word in segment_words:
-                if word['speaker'] != current_speaker:
-                    # Speaker changed, save previous speaker's text
-                    if current_speaker is not None and current_speaker_text:
-                        speaker_line = f"{current_speaker.upper()}: {' '.join(current_speaker_text)}"
-                        segment_text_parts.append(speaker_line)
-                    
-                    # Start new speaker
-                    current_speaker = word['speaker']
-                    current_speaker_text = [word['text']]
-                else:
-                    current_speaker_text.append(word['text'])
-            
-            # Add final speaker's text
-            if current_speaker is not None and current_speaker_text:
-                speaker_line = f"{current_speaker.upper()}: {' '.join(current_speaker_text)}"
-                segment_text_parts.append(speaker_line)
-            
-            segment = {
-                'start': current_time,
-                'end': segment_end,
-                'duration_seconds': (segment_end - current_time) / 1000,
-                'text': '\n\n'.join(segment_text_parts),
-                'word_count': len(segment_words),
-                'speakers': list(set(word['speaker'] for word in segment_words))
-            }
-            
-            segments.append(segment)
-        
-        current_time = segment_end
+    def __init__(self, factory=threading.Lock):
+        self.factory = factory
+        self.locks = {}
+        self.guard = threading.Lock()
     
-    return segments
+    def __call__(self, key):
+        with self.guard:
+            return self.locks.setdefault(key, self.factory())
 
-def write_navigation_screenplay(words, file_name, segment_duration_seconds=45):
-    """Write navigation-friendly screenplay with fixed-duration segments"""
-    segment_duration_ms = segment_duration_seconds * 1000
-    segments = group_words_into_navigation_segments(words, segment_duration_ms)
-    
-    with open(file_name, 'w') as file:
-        file.write(f"# Navigation Screenplay ({segment_duration_seconds}s segments)\n\n")
-        file.write(f"Total segments: {len(segments)}\n")
-        file.write(f"Total duration: {milliseconds_to_hms(words[-1]['end'] - words[0]['start']) if words else '0:00:00'}\n\n")
-        file.write("---\n\n")
-        
-        for i, segment in enumerate(segments, 1):
-            start_time = milliseconds_to_hms(segment['start'])
-            end_time = milliseconds_to_hms(segment['end'])
-            duration = f"{segment['duration_seconds']:.1f}s"
-            speakers = ', '.join(segment['speakers'])
-            
-            file.write(f"## Segment {i} ({start_time} - {end_time}) [{duration}]\n")
-            file.write(f"**Speakers:** {speakers} | **Words:** {segment['word_count']}\n\n")
-            file.write(f"{segment['text']}\n\n")
-            file.write("---\n\n")
+# Files with the same content are transcribed one at a time, so the second
+# one finds the first one's transcript in the cache instead of uploading again
+CONTENT_LOCKS = KeyedLocks()
 
 def setup_api_key():
     """Setup AssemblyAI API key from environment or user input"""
@@ -274,18 +156,24 @@ def organize_files_for_audio(audio_file, use_workbench=False):
     # Get directory where files are currently located
     file_dir = os.path.dirname(audio_file) or "."
     
-    # Find all related files
-    patterns = [
-        f"{base_name}.mp3",
+    # Find all related files (including the audio file itself, whatever its format)
+    patterns = [os.path.basename(audio_file)]
+    patterns += [f"{base_name}{ext}" for ext in AUDIO_EXTENSIONS]
+    patterns += [
         f"{base_name}.mp4", 
         f"{base_name}.json",
         f"{base_name} new_transcript_aai.json",
+        f"{base_name}{SIDECAR_SUFFIX}",
+        f"{base_name} new_transcript_aai{SIDECAR_SUFFIX}",
+        f"{base_name}{RENDER_CACHE_SUFFIX}",
+        f"{base_name}{SPEAKER_MAPPING_SUFFIX}",
         f"{base_name} subtitle_aai.srt",
-        f"{base_name} screenplay_aai.md"
+        f"{base_name} screenplay_aai.md",
+        f"{base_name} screenplay_navigation.md"
     ]
     
     related_files = []
-    for pattern in patterns:
+    for pattern in dict.fromkeys(patterns):
         file_path = os.path.join(file_dir, pattern)
         if os.path.exists(file_path):
             related_files.append(file_path)
@@ -320,8 +208,20 @@ def organize_files_for_audio(audio_file, use_workbench=False):
     print(f"   ✅ Organized {moved_count} files into {folder_name}/")
     return True
 
-def find_unprocessed_mp3_files(search_dir=None):
-    """Find MP3 files that haven't been processed yet"""
+def get_output_dir(search_dir):
+    """Folder that processed files are organized into for a search directory (None: the search directory)"""
+    return OUTPUT_DIR if search_dir == INPUT_DIR else None
+
+def take_inventory(search_dir):
+    """List a search directory and its output folder once, indexing media files and transcripts"""
+    return build_inventory(search_dir, get_output_dir(search_dir), VIDEO_EXTENSIONS + AUDIO_EXTENSIONS)
+
+def find_unprocessed_mp3_files(search_dir=None, settle_seconds=DEFAULT_QUIET_SECONDS):
+    """Find MP3 files that haven't been processed yet
+    
+    Files modified within the last `settle_seconds` are skipped as probably
+    still being written.
+    """
     if search_dir is None:
         # Default to workbench input if it exists, otherwise current directory
         if os.path.exists(INPUT_DIR):
@@ -329,41 +229,169 @@ def find_unprocessed_mp3_files(search_dir=None):
         else:
             search_dir = "."
     
-    # Search for MP3 files in the specified directory
-    search_pattern = os.path.join(search_dir, "*.mp3")
-    mp3_files = glob.glob(search_pattern)
+    inventory = take_inventory(search_dir)
     unprocessed = []
+    now = time.time()
     
-    for mp3_file in mp3_files:
-        # Skip files that are still being written (check if file size is stable)
-        try:
-            size1 = os.path.getsize(mp3_file)
-            time.sleep(0.1)  # Wait 100ms
-            size2 = os.path.getsize(mp3_file)
-            if size1 != size2:
-                print(f"⏳ Skipping {mp3_file} - file is still being written")
-                continue
-        except OSError:
-            # File might have been moved/deleted
+    for media in unprocessed_media(inventory, ['.mp3']):
+        if now - media['mtime'] < settle_seconds:
+            print(f"⏳ Skipping {media['path']} - file is still being written")
             continue
-            
-        base_name = get_base_filename(mp3_file)
-        # Check in output directory if using workbench
-        if search_dir == INPUT_DIR:
-            output_folder = os.path.join(OUTPUT_DIR, base_name)
-            json_file = os.path.join(output_folder, f"{base_name}.json")
-        else:
-            # Original behavior for current directory
-            json_file = f"{base_name}.json"
-        
-        # Check if JSON already exists
-        if not os.path.exists(json_file):
-            unprocessed.append(mp3_file)
+        unprocessed.append(media['path'])
     
     return unprocessed
 
-def transcribe_and_process(audio_file):
-    """Complete pipeline: transcribe + process"""
+def get_ledger_path(backend_name=DEFAULT_BACKEND):
+    """Get the job ledger location (workbench if available, otherwise current directory)
+
+    Jobs of other backends than AssemblyAI get a ledger of their own, so they
+    are never resumed against the real service.
+    """
+    filename = LEDGER_FILENAME
+    if backend_name != DEFAULT_BACKEND:
+        base, ext = os.path.splitext(LEDGER_FILENAME)
+        filename = f"{base}.{backend_name}{ext}"
+    if os.path.exists(WORKBENCH_DIR):
+        return os.path.join(WORKBENCH_DIR, filename)
+    return filename
+
+def get_cache_dir():
+    """Get the transcript cache location (workbench if available, otherwise current directory)"""
+    if os.path.exists(WORKBENCH_DIR):
+        return os.path.join(WORKBENCH_DIR, CACHE_DIRNAME)
+    return f".transit_{CACHE_DIRNAME}"
+
+def submit_transcription(audio_file, content_hash, ledger=None, open_stream=None, backend=None):
+    """Submit a transcription job and return its job ID
+
+    If the ledger already holds an in-flight job for the same audio content,
+    that job is resumed instead of uploading the file again.
+
+    Args:
+        open_stream: Optional function returning an AudioStream; when given, the
+            streamed audio is uploaded instead of reading `audio_file` from disk
+        backend: Transcription backend (default: AssemblyAI)
+    """
+    if ledger is not None:
+        entry = ledger.get(content_hash)
+        if entry and entry['state'] == STATE_SUBMITTED:
+            print(f"♻️  Resuming in-flight job {entry['job_id']} (no re-upload)")
+            return entry['job_id']
+    
+    backend = backend or make_backend()
+    job_id = backend.submit(audio_file, TRANSCRIPTION_SETTINGS, open_stream)
+    
+    if ledger is not None:
+        ledger.record_submitted(audio_file, content_hash, job_id)
+    print(f"🆔 Submitted job: {job_id}")
+    return job_id
+
+def collect_transcription(job_id, backend=None):
+    """Poll a submitted job until it finishes and return the final job state"""
+    print(f"⏳ Waiting for job {job_id}...")
+    return wait_for_job(backend or make_backend(), job_id)
+
+def has_in_flight_job(ledger, content_hash):
+    """Check if the ledger holds a job for this content that a run would resume"""
+    if ledger is None:
+        return False
+    entry = ledger.get(content_hash)
+    return bool(entry) and entry['state'] == STATE_SUBMITTED
+
+def abandon_job(ledger, content_hash, job_id, error, resumed):
+    """Handle a job that can no longer be collected because of `error`
+
+    Transient failures are raised again and leave the job in the ledger, so
+    the next run resumes it. Anything else (expired or unknown job ID, ...)
+    marks the job failed, so it is never resumed again.
+
+    Returns:
+        True if the job was resumed from the ledger and the file should be
+        submitted again; otherwise `error` is raised
+    """
+    retryable, _ = classify_error(error)
+    if retryable or ledger is None:
+        raise error
+    message = str(error).splitlines()[0] if str(error) else type(error).__name__
+    ledger.update_state(content_hash, STATE_FAILED, error=message)
+    if not resumed:
+        raise error
+    print(f"⚠️  Could not resume job {job_id}: {message} - submitting the file again")
+    return True
+
+def transcribe_audio_file(audio_file, content_hash, ledger=None, open_stream=None, backend=None):
+    """Submit and collect a transcription, returning transcript data or None on failure"""
+    backend = backend or make_backend()
+    resumed = has_in_flight_job(ledger, content_hash)
+    job_id = submit_transcription(audio_file, content_hash, ledger, open_stream, backend)
+    try:
+        job = collect_transcription(job_id, backend)
+    except Exception as e:
+        abandon_job(ledger, content_hash, job_id, e, resumed)
+        # The ledger entry is failed now, so this uploads the file again
+        job_id = submit_transcription(audio_file, content_hash, ledger, open_stream, backend)
+        job = collect_transcription(job_id, backend)
+    
+    if job['status'] == STATUS_ERROR:
+        print(f"❌ Transcription error: {job['error']}")
+        if ledger is not None:
+            ledger.update_state(content_hash, STATE_FAILED, error=str(job['error']))
+        return None
+    
+    return backend.result(job_id, audio_file)
+
+def transcribe_with_chunking(audio_file, content_hash, ledger=None, chunking=None, backend=None):
+    """Transcribe a file, splitting it into parallel chunks when it is too large or too long
+
+    Args:
+        chunking: Dict with chunk_minutes, overlap_seconds, split_over_minutes
+            and workers, or None to always transcribe as a single job
+        backend: Transcription backend (default: AssemblyAI)
+    """
+    duration_ms = get_chunking_duration(audio_file, chunking)
+    if duration_ms is not None:
+        print(f"📏 Recording is {milliseconds_to_hms(duration_ms)} long - using chunked transcription")
+        
+        def transcribe_chunk(chunk_file):
+            return transcribe_audio_file(chunk_file, compute_file_hash(chunk_file), ledger, backend=backend)
+        
+        return transcribe_in_chunks(
+            audio_file,
+            transcribe_chunk,
+            duration_ms,
+            chunk_minutes=chunking['chunk_minutes'],
+            overlap_seconds=chunking['overlap_seconds'],
+            workers=chunking['workers']
+        )
+    
+    return transcribe_audio_file(audio_file, content_hash, ledger, backend=backend)
+
+def get_chunking_duration(audio_file, chunking):
+    """Return the duration of a recording that should be transcribed in chunks, or None"""
+    if chunking is None or not check_ffmpeg():
+        return None
+    try:
+        duration_ms = get_media_duration_ms(audio_file)
+    except Exception as e:
+        print(f"⚠️  Could not determine duration, transcribing as one job: {e}")
+        return None
+    if needs_chunking(audio_file, duration_ms, chunking['split_over_minutes']):
+        return duration_ms
+    return None
+
+def is_streamed(audio_file, stream):
+    """Check if a file is uploaded through an ffmpeg stream instead of read from disk"""
+    return stream is not None and Path(audio_file).suffix.lower() in VIDEO_EXTENSIONS
+
+def get_output_paths(audio_file):
+    """Output locations for a media file
+    
+    In workbench mode files are saved next to the input first and organized
+    into the output folder afterwards.
+    
+    Returns:
+        Dict with use_workbench and the json, srt, md and navigation file paths
+    """
     base_name = get_base_filename(audio_file)
     
     # Detect if we're using workbench mode
@@ -377,10 +405,36 @@ def transcribe_and_process(audio_file):
         output_dir = "."
     
     # Generate filenames with base name prepended
-    json_file = os.path.join(output_dir, f"{base_name}.json")  # Main transcript
-    processed_json = os.path.join(output_dir, f"{base_name} new_transcript_aai.json")  # Processed version
-    srt_file = os.path.join(output_dir, f"{base_name} subtitle_aai.srt")
-    md_file = os.path.join(output_dir, f"{base_name} screenplay_aai.md")
+    return {
+        'use_workbench': use_workbench,
+        'output_dir': output_dir,
+        'json': os.path.join(output_dir, f"{base_name}.json"),  # Main transcript
+        'srt': os.path.join(output_dir, f"{base_name} subtitle_aai.srt"),
+        'md': os.path.join(output_dir, f"{base_name} screenplay_aai.md"),
+        'navigation': os.path.join(output_dir, f"{base_name} screenplay_navigation.md")
+    }
+
+def get_cache_settings(backend=None):
+    """Settings that identify a transcript in the cache
+
+    Transcripts from other backends than AssemblyAI (such as the mock engine)
+    are cached apart from the real ones.
+    """
+    if backend is None or backend.name == DEFAULT_BACKEND:
+        return TRANSCRIPTION_SETTINGS
+    return dict(TRANSCRIPTION_SETTINGS, backend=backend.name)
+
+def transcribe_and_process(audio_file, ledger=None, cache=None, chunking=None, stream=None,
+                           outputs=DEFAULT_MANIFEST, backend=None):
+    """Complete pipeline: transcribe (or load from cache), then process
+
+    Args:
+        stream: Dict with profile, threads and keep_audio to upload video files
+            as an ffmpeg audio stream, or None to only process audio files from disk
+        outputs: Output manifest from make_manifest() selecting the artifacts to write
+        backend: Transcription backend (default: AssemblyAI)
+    """
+    paths = get_output_paths(audio_file)
     
     print(f"\n{'='*60}")
     print(f"Processing: {audio_file}")
@@ -390,129 +444,568 @@ def transcribe_and_process(audio_file):
     print("🎯 Starting transcription...")
     start_time = time.time()
     
-    transcriber = aai.Transcriber()
-    config = aai.TranscriptionConfig(
-        speaker_labels=True,
-        format_text=True,
-        punctuate=True,
-        speech_model=aai.SpeechModel.best,
-        language_detection=True,
-    )
-    
     try:
-        transcript = transcriber.transcribe(audio_file, config=config)
+        content_hash = compute_file_hash(audio_file)
+        open_stream = None
+        if is_streamed(audio_file, stream):
+            # The uploaded audio depends on the video bytes and the extraction profile
+            content_hash = hashlib.sha256(f"{content_hash}:{stream['profile']}".encode('utf-8')).hexdigest()
+            keep_dir = paths['output_dir'] if stream['keep_audio'] else None
+            
+            def open_stream():
+                return open_audio_stream(audio_file, stream['profile'], stream['threads'], keep_dir)
+        cache_key = make_cache_key(content_hash, get_cache_settings(backend))
         
-        # Check for errors more robustly
-        error_msg = getattr(transcript, 'error', None)
-        if error_msg:
-            print(f"❌ Transcription error: {error_msg}")
-            return False
+        # Held from the cache and ledger lookup until the transcript is cached
+        content_lock = CONTENT_LOCKS(cache_key)
+        if content_lock.locked():
+            print("⏳ A file with the same audio is being transcribed - waiting to reuse its transcript")
+        with content_lock:
+            transcript_data = cache.get(cache_key) if cache is not None else None
+            if transcript_data is not None:
+                print(f"💾 Cache hit - reusing transcript {transcript_data.get('id', 'unknown')} (no upload)")
+                transcript_data['audio_url'] = audio_file
+            else:
+                if open_stream is not None:
+                    transcript_data = transcribe_audio_file(audio_file, content_hash, ledger, open_stream, backend)
+                else:
+                    transcript_data = transcribe_with_chunking(audio_file, content_hash, ledger, chunking, backend)
+                if transcript_data is None:
+                    return False
+                if cache is not None:
+                    cache.put(cache_key, transcript_data)
         
-        # Also check status if available
-        status = getattr(transcript, 'status', None)
-        if status and status.lower() in ['error', 'failed']:
-            print(f"❌ Transcription failed with status: {status}")
-            return False
-            
-        # Build transcript data - use getattr for optional attributes
-        transcript_data = {
-            'id': getattr(transcript, 'id', 'unknown'),
-            'text': getattr(transcript, 'text', ''),
-            'words': [],
-            'status': 'completed',
-            'audio_url': audio_file,
-            'language_code': getattr(transcript, 'language_code', 'en'),
-        }
+        return save_and_render(audio_file, transcript_data, content_hash, start_time, ledger, outputs)
         
-        # Add words with speaker labels
-        if hasattr(transcript, 'words') and transcript.words:
-            for word in transcript.words:
-                word_data = {
-                    'text': word.text,
-                    'start': word.start,
-                    'end': word.end,
-                    'confidence': word.confidence,
-                    'speaker': word.speaker if hasattr(word, 'speaker') else 'A'
-                }
-                transcript_data['words'].append(word_data)
+    except Exception as e:
+        # In-flight jobs stay in the ledger as submitted so the next run can resume them
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def save_and_render(audio_file, transcript_data, content_hash, start_time, ledger=None, outputs=DEFAULT_MANIFEST):
+    """Write the JSON files and rendered outputs of a finished transcript, then organize them
+    
+    Returns:
+        True once everything is written
+    """
+    paths = get_output_paths(audio_file)
+    json_file = paths['json']
+    artifacts = outputs['artifacts']
+    
+    # Save main JSON (replaced as a whole, so a hardlinked compatibility copy is never written through)
+    write_transcript(transcript_data, json_file)
         
-        # Save main JSON
-        with open(json_file, 'w') as f:
-            json.dump(transcript_data, f, indent=2)
-            
-        # Save processed version (copy for compatibility)
-        with open(processed_json, 'w') as f:
-            json.dump(transcript_data, f, indent=2)
-            
-        elapsed = time.time() - start_time
-        print(f"✅ Transcription completed in {elapsed:.1f}s")
-        print(f"📄 Saved: {json_file}")
-        print(f"📄 Saved: {processed_json}")
+    # Save processed version (copy for compatibility), unless the manifest defers it
+    compat_file, compat_mode = write_compat_copy(json_file, transcript_data, outputs['compat_mode'])
+    
+    if 'sidecar' in artifacts:
+        save_sidecar(json_file, transcript_data)
+        if compat_file:
+            save_sidecar(compat_file, transcript_data)
+    
+    if ledger is not None:
+        ledger.update_state(content_hash, STATE_COMPLETED)
         
-        # Step 2: Process into SRT and MD
-        print("🔄 Generating output files...")
-        words = transcript_data['words']
+    elapsed = time.time() - start_time
+    print(f"✅ Transcription completed in {elapsed:.1f}s")
+    print(f"📄 Saved: {json_file}")
+    if compat_file:
+        print(f"📄 Saved: {compat_file} ({compat_mode})")
+    
+    # Step 2: Process into SRT and MD
+    print("🔄 Generating output files...")
+    words = transcript_data['words']
+    
+    if words:
+        segments = group_words_into_segments(words)
+        unique_speakers = len(set(word['speaker'] for word in words))
         
-        if words:
-            segments = group_words_into_segments(words)
-            unique_speakers = len(set(word['speaker'] for word in words))
-            
-            write_srt(words, srt_file)
-            write_md(words, md_file)
-            
-            print(f"📝 Generated: {srt_file}")
-            print(f"📝 Generated: {md_file}")
-            
-            print(f"👥 Detected {unique_speakers} speakers, {len(segments)} fine segments (SRT), natural speaker turns (MD)")
+        if 'srt' in artifacts:
+            write_srt(words, paths['srt'])
+            print(f"📝 Generated: {paths['srt']}")
+        if 'md' in artifacts:
+            write_md(words, paths['md'])
+            print(f"📝 Generated: {paths['md']}")
+        if 'navigation' in artifacts:
+            write_navigation_screenplay(words, paths['navigation'])
+            print(f"📝 Generated: {paths['navigation']}")
+        
+        print(f"👥 Detected {unique_speakers} speakers, {len(segments)} fine segments (SRT), natural speaker turns (MD)")
+    else:
+        print("⚠️  No words with speaker data found")
+    
+    # Step 3: Organize files into folder
+    print("🗂️  Organizing files...")
+    organize_files_for_audio(audio_file, use_workbench=paths['use_workbench'])
+        
+    return True
+
+def report_in_flight_jobs(ledger):
+    """Print jobs left in flight by a previous run"""
+    in_flight = ledger.in_flight()
+    if not in_flight:
+        return
+    
+    print(f"♻️  Found {len(in_flight)} in-flight job(s) from a previous run:")
+    for entry in in_flight:
+        if os.path.exists(entry['input_file']):
+            print(f"   • {entry['input_file']} (job {entry['job_id']}) - will resume polling")
         else:
-            print("⚠️  No words with speaker data found")
+            print(f"   • {entry['input_file']} (job {entry['job_id']}) - input file missing, cannot resume")
+
+def find_videos_to_extract(search_dir, audio_files, profile=DEFAULT_PROFILE, inventory=None):
+    """Find videos in a directory that still need their audio extracted
+
+    Videos are skipped when already transcribed, or when an audio file or
+    another video with the same base name is already queued (e.g. previously
+    extracted audio, or talk.mp4 next to talk.mkv).
+
+    Returns:
+        List of extraction plans (see video_preprocessor.plan_extraction)
+    """
+    queued_names = {get_base_filename(audio_file) for audio_file in audio_files}
+    queued_videos = {}
+    tasks = []
+    for file_info in find_unprocessed_media_files(search_dir, get_output_dir(search_dir), verbose=False,
+                                                  inventory=inventory):
+        if not file_info['is_video']:
+            continue
+        base_name = get_base_filename(file_info['path'])
+        if base_name in queued_videos:
+            # Both videos would be extracted into the same audio file at once
+            print(f"⚠️  Skipping {file_info['path']} - {queued_videos[base_name]} has the same base name")
+            continue
+        if base_name in queued_names:
+            continue
+        tasks.append(plan_extraction(file_info['path'], search_dir, profile))
+        queued_names.add(base_name)
+        queued_videos[base_name] = file_info['path']
+    return tasks
+
+def process_audio_files(audio_files, jobs=1, extraction_tasks=None,
+                        extract_workers=DEFAULT_EXTRACT_WORKERS, ffmpeg_threads=None, **options):
+    """Transcribe and process files as a streaming extraction/transcription pipeline
+
+    Audio files are queued for transcription immediately. Videos in
+    `extraction_tasks` (extraction plans) are extracted by a separate
+    ffmpeg pool, and each audio file joins the transcription queue as soon as it is
+    written, so the network-bound and CPU-bound stages overlap. Up to `jobs`
+    transcriptions run at once; files sharing a base name would write the same
+    output files, so they never run at the same time, and files with the same
+    audio are transcribed one after the other to share one job. Extra keyword options
+    (ledger, cache, chunking, stream) are passed on to transcribe_and_process.
+
+    Returns:
+        Tuple of (successful, failed) counts, where failed includes failed extractions
+    """
+    extraction_tasks = extraction_tasks or []
+    base_name_locks = {}
+    locks_guard = threading.Lock()
+    
+    def process_file(audio_file):
+        with locks_guard:
+            lock = base_name_locks.setdefault(get_base_filename(audio_file), threading.Lock())
+        with lock:
+            return transcribe_and_process(audio_file, **options)
+    
+    if jobs > 1:
+        print(f"⚡ Running up to {jobs} transcriptions concurrently")
+    
+    failed_extractions = 0
+    with ThreadPoolExecutor(max_workers=jobs) as transcription_pool:
+        transcription_futures = [transcription_pool.submit(process_file, audio_file)
+                                 for audio_file in audio_files]
         
-        # Step 3: Organize files into folder
-        print("🗂️  Organizing files...")
-        organize_files_for_audio(audio_file, use_workbench=use_workbench)
-            
-        return True
+        if extraction_tasks:
+            workers = max(1, min(extract_workers, len(extraction_tasks)))
+            print(f"🎬 Extracting audio from {len(extraction_tasks)} video(s) with {workers} ffmpeg worker(s)")
+            with ThreadPoolExecutor(max_workers=workers) as extraction_pool:
+                extraction_futures = {
+                    extraction_pool.submit(extract_audio, task['input'], task['output'], ffmpeg_threads,
+                                           task['profile'], task['duration_ms']): task['output']
+                    for task in extraction_tasks
+                }
+                for future in as_completed(extraction_futures):
+                    output_file = extraction_futures[future]
+                    if future.result():
+                        print(f"📄 Queued extracted audio for transcription: {output_file}")
+                        transcription_futures.append(transcription_pool.submit(process_file, output_file))
+                    else:
+                        failed_extractions += 1
+        
+        results = [future.result() for future in transcription_futures]
+    
+    successful = sum(1 for ok in results if ok)
+    failed = len(results) - successful + failed_extractions
+    return successful, failed
+
+async def submit_transcription_async(scheduler, audio_file, content_hash, ledger=None):
+    """Upload a file and submit its transcription job on the event loop, returning the job ID"""
+    name = os.path.basename(audio_file)
+    print(f"📤 Uploading {name}...")
+    job = await scheduler.upload_and_submit(audio_file, TRANSCRIPTION_SETTINGS, name)
+    if job.get('error'):
+        raise RuntimeError(f"Submission failed: {job['error']}")
+    job_id = job['id']
+    if ledger is not None:
+        ledger.record_submitted(audio_file, content_hash, job_id)
+    print(f"🆔 Submitted job: {job_id} ({name})")
+    return job_id
+
+async def transcribe_audio_file_async(scheduler, audio_file, content_hash, ledger=None):
+    """Submit and collect a transcription on the event loop, returning transcript data or None on failure
+
+    Like transcribe_audio_file, an in-flight job found in the ledger is
+    resumed instead of uploading the file again. Transient request failures
+    are retried by the scheduler.
+    """
+    name = os.path.basename(audio_file)
+    resumed = has_in_flight_job(ledger, content_hash)
+    if resumed:
+        job_id = ledger.get(content_hash)['job_id']
+        print(f"♻️  Resuming in-flight job {job_id} for {name} (no re-upload)")
+    else:
+        job_id = await submit_transcription_async(scheduler, audio_file, content_hash, ledger)
+    
+    try:
+        response = await scheduler.wait(job_id, name)
+    except Exception as e:
+        abandon_job(ledger, content_hash, job_id, e, resumed)
+        job_id = await submit_transcription_async(scheduler, audio_file, content_hash, ledger)
+        response = await scheduler.wait(job_id, name)
+    if response.get('status') == STATUS_ERROR:
+        error_msg = response.get('error') or STATUS_ERROR
+        print(f"❌ Transcription error ({name}): {error_msg}")
+        if ledger is not None:
+            ledger.update_state(content_hash, STATE_FAILED, error=str(error_msg))
+        return None
+    
+    return transcript_data_from_response(response, audio_file)
+
+async def transcribe_and_process_async(scheduler, audio_file, ledger=None, cache=None, chunking=None, stream=None,
+                                       outputs=DEFAULT_MANIFEST, backend=None, content_locks=None):
+    """Complete pipeline for one file on the event loop (see transcribe_and_process)
+
+    Uploading and polling run as coroutines. Hashing, cache access and
+    rendering run in worker threads. Streamed videos and recordings that need
+    chunking are handed to the threaded pipeline as a whole.
+
+    Args:
+        content_locks: KeyedLocks of asyncio locks shared by all files of the
+            run, so files with the same audio are not uploaded twice
+    """
+    content_locks = content_locks or KeyedLocks(asyncio.Lock)
+    if is_streamed(audio_file, stream) or await asyncio.to_thread(get_chunking_duration, audio_file, chunking):
+        return await asyncio.to_thread(transcribe_and_process, audio_file, ledger, cache, chunking, stream, outputs,
+                                       backend)
+    
+    print(f"🎯 Starting transcription: {audio_file}")
+    start_time = time.time()
+    
+    try:
+        content_hash = await asyncio.to_thread(compute_file_hash, audio_file)
+        cache_key = make_cache_key(content_hash, TRANSCRIPTION_SETTINGS)
+        
+        # Held from the cache and ledger lookup until the transcript is cached
+        content_lock = content_locks(cache_key)
+        if content_lock.locked():
+            print(f"⏳ A file with the same audio as {audio_file} is being transcribed - waiting to reuse it")
+        async with content_lock:
+            transcript_data = await asyncio.to_thread(cache.get, cache_key) if cache is not None else None
+            if transcript_data is not None:
+                print(f"💾 Cache hit - reusing transcript {transcript_data.get('id', 'unknown')} (no upload)")
+                transcript_data['audio_url'] = audio_file
+            else:
+                transcript_data = await transcribe_audio_file_async(scheduler, audio_file, content_hash, ledger)
+                if transcript_data is None:
+                    return False
+                if cache is not None:
+                    await asyncio.to_thread(cache.put, cache_key, transcript_data)
         
+        return await asyncio.to_thread(save_and_render, audio_file, transcript_data, content_hash, start_time,
+                                       ledger, outputs)
+    
     except Exception as e:
-        print(f"❌ Error: {str(e)}")
+        # In-flight jobs stay in the ledger as submitted so the next run can resume them
+        print(f"❌ Error ({audio_file}): {str(e)}")
         return False
 
-def run_video_preprocessor(specific_files=None):
-    """Run video preprocessor to handle large video files"""
-    preprocessor_path = os.path.join(os.path.dirname(__file__), 'video_preprocessor.py')
-    if os.path.exists(preprocessor_path):
-        print("🎬 Running video preprocessor...")
+def process_audio_files_async(audio_files, concurrency, extraction_tasks=None,
+                              extract_workers=DEFAULT_EXTRACT_WORKERS, ffmpeg_threads=None, retries=None,
+                              **options):
+    """Transcribe and process files with up to `concurrency` jobs in flight on one event loop
+
+    Works like process_audio_files, but every job in flight is a coroutine
+    sharing one HTTP connection pool instead of a thread blocked on the SDK.
+
+    Args:
+        retries: Dict with upload_retries, poll_retries and requests_per_second
+            for the job scheduler, or None for the defaults
+
+    Returns:
+        Tuple of (successful, failed) counts, where failed includes failed extractions
+    """
+    return asyncio.run(run_async_pipeline(audio_files, concurrency, extraction_tasks or [],
+                                          extract_workers, ffmpeg_threads, retries, options))
+
+async def run_async_pipeline(audio_files, concurrency, extraction_tasks, extract_workers, ffmpeg_threads, retries,
+                             options):
+    """Event loop side of process_audio_files_async"""
+    loop = asyncio.get_running_loop()
+    base_name_locks = {}
+    content_locks = KeyedLocks(asyncio.Lock)
+    base_url = getattr(aai.settings, 'base_url', None) or API_BASE_URL
+    retries = retries or {'upload_retries': DEFAULT_UPLOAD_RETRIES, 'poll_retries': DEFAULT_POLL_RETRIES,
+                          'requests_per_second': DEFAULT_REQUESTS_PER_SECOND}
+    
+    async with AsyncTranscriptionClient(os.environ['ASSEMBLYAI_API_KEY'], base_url,
+                                        max_connections=min(concurrency, DEFAULT_MAX_CONNECTIONS)) as client:
+        scheduler = JobScheduler(
+            client,
+            concurrency,
+            requests_per_second=retries['requests_per_second'],
+            upload_policy=make_retry_policy(retries['upload_retries']),
+            poll_policy=make_retry_policy(retries['poll_retries'])
+        )
+        
+        async def process_file(audio_file):
+            # Files sharing a base name write the same outputs, so they never overlap
+            lock = base_name_locks.setdefault(get_base_filename(audio_file), asyncio.Lock())
+            async with lock, scheduler.slots:
+                return await transcribe_and_process_async(scheduler, audio_file, content_locks=content_locks,
+                                                          **options)
+        
+        print(f"⚡ Running up to {concurrency} transcriptions on one event loop")
+        transcription_tasks = [asyncio.create_task(process_file(audio_file)) for audio_file in audio_files]
+        
+        failed_extractions = 0
+        if extraction_tasks:
+            workers = max(1, min(extract_workers, len(extraction_tasks)))
+            print(f"🎬 Extracting audio from {len(extraction_tasks)} video(s) with {workers} ffmpeg worker(s)")
+            with ThreadPoolExecutor(max_workers=workers) as extraction_pool:
+                
+                async def extract(task):
+                    ok = await loop.run_in_executor(extraction_pool, extract_audio, task['input'], task['output'],
+                                                    ffmpeg_threads, task['profile'], task['duration_ms'])
+                    return task['output'], ok
+                
+                for extraction in asyncio.as_completed([extract(task) for task in extraction_tasks]):
+                    output_file, ok = await extraction
+                    if ok:
+                        print(f"📄 Queued extracted audio for transcription: {output_file}")
+                        transcription_tasks.append(asyncio.create_task(process_file(output_file)))
+                    else:
+                        failed_extractions += 1
+        
+        results = await asyncio.gather(*transcription_tasks)
+    
+    if any(scheduler.retries.values()):
+        print(f"🔁 Retried {scheduler.retries['upload']} upload and {scheduler.retries['poll']} poll request(s)")
+    successful = sum(1 for ok in results if ok)
+    failed = len(results) - successful + failed_extractions
+    return successful, failed
+
+def watch_and_process(watcher, search_dir, inventory=None, jobs=1, extract_workers=DEFAULT_EXTRACT_WORKERS,
+                      ffmpeg_threads=None, profile=DEFAULT_PROFILE, ffmpeg_available=True,
+                      poll_seconds=DEFAULT_POLL_SECONDS, **options):
+    """Process media files as they arrive in a watched folder, until interrupted
+
+    Each finished file reported by `watcher` goes straight into the pipeline:
+    audio is queued for transcription, videos are extracted first (or
+    streamed, if options['stream'] is set). Files whose base name is already
+    queued or transcribed are skipped, which also covers the audio files that
+    extraction writes into the watched folder. Transcripts are looked up in
+    `inventory` (taken once if not given), and finished files are added to it.
+
+    Returns:
+        Tuple of (successful, failed) counts
+    """
+    stream = options.get('stream')
+    if inventory is None:
+        inventory = take_inventory(search_dir)
+    claimed = set()
+    claims_guard = threading.Lock()
+    counts = {'successful': 0, 'failed': 0}
+    
+    transcription_pool = ThreadPoolExecutor(max_workers=jobs)
+    extraction_pool = ThreadPoolExecutor(max_workers=extract_workers)
+    
+    def finish(media_file, ok):
+        with claims_guard:
+            claimed.discard(get_base_filename(media_file))
+            if ok:
+                mark_processed(inventory, media_file)
+            counts['successful' if ok else 'failed'] += 1
+    
+    def transcribe(audio_file):
+        ok = False
         try:
-            # Save current directory
-            original_dir = os.getcwd()
-            
-            # Change to INPUT_DIR if in workbench mode and no specific files
-            if not specific_files and os.path.exists(INPUT_DIR):
-                os.chdir(INPUT_DIR)
-            
-            cmd = ['python3', preprocessor_path]
-            if specific_files:
-                cmd.extend(specific_files)
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            # Restore original directory
-            os.chdir(original_dir)
-            
-            if result.stdout:
-                print(result.stdout)
-            if result.returncode != 0 and result.stderr:
-                print(f"⚠️  Preprocessor warning: {result.stderr}")
+            ok = transcribe_and_process(audio_file, **options)
+        finally:
+            finish(audio_file, ok)
+    
+    def extract(video_file):
+        try:
+            task = plan_extraction(video_file, search_dir, profile)
+            ok = extract_audio(task['input'], task['output'], ffmpeg_threads, task['profile'], task['duration_ms'])
         except Exception as e:
-            print(f"⚠️  Could not run video preprocessor: {e}")
-            # Make sure to restore directory on error
-            if 'original_dir' in locals():
-                os.chdir(original_dir)
-    else:
-        print("ℹ️  Video preprocessor not found, skipping video preprocessing")
+            print(f"❌ Error extracting {video_file}: {e}")
+            ok = False
+        if ok:
+            print(f"📄 Queued extracted audio for transcription: {task['output']}")
+            transcription_pool.submit(transcribe, task['output'])
+        else:
+            finish(video_file, False)
+    
+    def dispatch(media_file):
+        base_name = get_base_filename(media_file)
+        is_video = Path(media_file).suffix.lower() in VIDEO_EXTENSIONS
+        with claims_guard:
+            if base_name in claimed or find_transcript(inventory, media_file):
+                return
+            if is_video and stream is None and not ffmpeg_available:
+                print(f"⚠️  FFmpeg not found - skipping video {media_file}")
+                return
+            claimed.add(base_name)
+        
+        print(f"📥 New file: {media_file}")
+        if is_video and stream is None:
+            extraction_pool.submit(extract, media_file)
+        else:
+            transcription_pool.submit(transcribe, media_file)
+    
+    print(f"\n👀 Watching {search_dir} for new media files ({watcher.kind}) - press Ctrl+C to stop")
+    try:
+        while True:
+            for media_file in watcher.wait(poll_seconds):
+                dispatch(media_file)
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping watch mode - waiting for running jobs to finish...")
+    finally:
+        watcher.close()
+        # Queued but not started files are picked up again by the next run
+        extraction_pool.shutdown(wait=True, cancel_futures=True)
+        transcription_pool.shutdown(wait=True, cancel_futures=True)
+    
+    return counts['successful'], counts['failed']
+
+def parse_arguments(argv):
+    """Parse command line arguments for batch processing"""
+    parser = argparse.ArgumentParser(
+        description="Transcribe and process all unprocessed media files"
+    )
+    parser.add_argument('files', nargs='*',
+                        help="Specific media files to process (default: all unprocessed files)")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="Number of files to transcribe concurrently (default: 1)")
+    parser.add_argument('--async-jobs', type=int, default=None, metavar='N',
+                        help="Keep up to N transcriptions in flight on one asyncio event loop instead of "
+                             "one thread per job (suits hundreds of files)")
+    parser.add_argument('--upload-retries', type=int, default=DEFAULT_UPLOAD_RETRIES,
+                        help=f"Retries per file for transient upload/submit failures "
+                             f"(default: {DEFAULT_UPLOAD_RETRIES})")
+    parser.add_argument('--poll-retries', type=int, default=DEFAULT_POLL_RETRIES,
+                        help=f"Retries per file for transient failures while polling "
+                             f"(default: {DEFAULT_POLL_RETRIES})")
+    parser.add_argument('--rate-limit', type=float, default=DEFAULT_REQUESTS_PER_SECOND,
+                        help=f"Maximum API requests per second with --async-jobs, 0 for no limit "
+                             f"(default: {DEFAULT_REQUESTS_PER_SECOND:g})")
+    parser.add_argument('--api-base-url', default=None,
+                        help="Send API requests to another server, such as the fake server "
+                             "(python -m src.transit.fake_server)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Do not read or write the local transcript cache")
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_MAX_CACHE_MB,
+                        help=f"Maximum transcript cache size in MB (default: {DEFAULT_MAX_CACHE_MB})")
+    parser.add_argument('--no-chunking', action='store_true',
+                        help="Never split long or oversized recordings into chunks")
+    parser.add_argument('--split-over-minutes', type=float, default=DEFAULT_SPLIT_OVER_MINUTES,
+                        help=f"Split recordings longer than this (default: {DEFAULT_SPLIT_OVER_MINUTES}); oversized files are always split")
+    parser.add_argument('--chunk-minutes', type=float, default=DEFAULT_CHUNK_MINUTES,
+                        help=f"Target chunk length in minutes (default: {DEFAULT_CHUNK_MINUTES})")
+    parser.add_argument('--chunk-overlap', type=float, default=DEFAULT_OVERLAP_SECONDS,
+                        help=f"Overlap between chunks in seconds (default: {DEFAULT_OVERLAP_SECONDS})")
+    parser.add_argument('--chunk-workers', type=int, default=DEFAULT_CHUNK_WORKERS,
+                        help=f"Chunks transcribed in parallel per recording (default: {DEFAULT_CHUNK_WORKERS})")
+    parser.add_argument('--extract-workers', type=int, default=DEFAULT_EXTRACT_WORKERS,
+                        help=f"Number of videos extracted at the same time (default: {DEFAULT_EXTRACT_WORKERS})")
+    parser.add_argument('--ffmpeg-threads', type=int, default=None,
+                        help="Limit ffmpeg to this many threads per extraction")
+    parser.add_argument('--stream-upload', action='store_true',
+                        help="Pipe audio from videos straight into the upload instead of writing a local file first")
+    parser.add_argument('--keep-audio', action='store_true',
+                        help="With --stream-upload, also save the extracted audio into the output folder")
+    parser.add_argument('--outputs', type=parse_artifacts, default=list(DEFAULT_ARTIFACTS),
+                        help=f"Comma-separated artifacts to write besides the main JSON, from: {', '.join(ARTIFACTS)} "
+                             f"(default: {','.join(DEFAULT_ARTIFACTS)})")
+    parser.add_argument('--compat-json', choices=COMPAT_MODES, default=DEFAULT_COMPAT_MODE,
+                        help="How to produce the 'new_transcript_aai.json' copy: write it again, copy, hardlink "
+                             f"or reflink the main JSON, or 'lazy' to skip it (default: {DEFAULT_COMPAT_MODE})")
+    parser.add_argument('--sidecar', action='store_true',
+                        help="Also write a compact binary copy of each transcript for fast relabeling and re-rendering "
+                             "(same as adding 'sidecar' to --outputs)")
+    parser.add_argument('--navigation', action='store_true',
+                        help="Also write a navigation screenplay with fixed 45-second segments "
+                             "(same as adding 'navigation' to --outputs)")
+    parser.add_argument('--profile', choices=list(EXTRACTION_PROFILES) + [AUTO_PROFILE], default=DEFAULT_PROFILE,
+                        help=f"Audio extraction profile for videos (default: {DEFAULT_PROFILE}); "
+                             "'auto' inspects each video with ffprobe")
+    parser.add_argument('--watch', action='store_true',
+                        help="Keep running and process new media files as soon as they finish arriving")
+    parser.add_argument('--quiet-seconds', type=float, default=DEFAULT_QUIET_SECONDS,
+                        help="Without inotify, treat a file as complete once its size and modification time "
+                             f"have not changed for this long (default: {DEFAULT_QUIET_SECONDS})")
+    parser.add_argument('--poll-interval', type=float, default=DEFAULT_POLL_SECONDS,
+                        help=f"Seconds between checks in watch mode (default: {DEFAULT_POLL_SECONDS})")
+    parser.add_argument('--no-inotify', action='store_true',
+                        help="In watch mode, poll the folder even where inotify is available")
+    add_backend_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.async_jobs is not None:
+        if args.async_jobs < 1:
+            parser.error("--async-jobs must be at least 1")
+        if args.jobs > 1:
+            parser.error("use either --jobs or --async-jobs, not both")
+        if args.watch:
+            parser.error("--watch runs jobs in threads; use --jobs instead of --async-jobs")
+        if args.backend != DEFAULT_BACKEND:
+            parser.error("--async-jobs talks to the AssemblyAI API; to test it offline, use --api-base-url "
+                         "with the fake server (python -m src.transit.fake_server)")
+    if args.upload_retries < 0 or args.poll_retries < 0 or args.rate_limit < 0:
+        parser.error("--upload-retries, --poll-retries and --rate-limit must be non-negative")
+    if args.extract_workers < 1:
+        parser.error("--extract-workers must be at least 1")
+    if args.ffmpeg_threads is not None and args.ffmpeg_threads < 1:
+        parser.error("--ffmpeg-threads must be at least 1")
+    if args.keep_audio and not args.stream_upload:
+        parser.error("--keep-audio requires --stream-upload")
+    if args.chunk_minutes <= 0 or args.chunk_overlap < 0 or args.chunk_workers < 1:
+        parser.error("--chunk-minutes and --chunk-workers must be positive, --chunk-overlap non-negative")
+    if args.chunk_overlap * 2 >= args.chunk_minutes * 60:
+        parser.error("--chunk-overlap must be less than half of --chunk-minutes")
+    if args.watch and args.files:
+        parser.error("--watch watches the input folder and cannot be combined with specific files")
+    if args.quiet_seconds < 0 or args.poll_interval <= 0:
+        parser.error("--quiet-seconds must be non-negative and --poll-interval positive")
+    artifacts = set(args.outputs)
+    if args.sidecar:
+        artifacts.add('sidecar')
+    if args.navigation:
+        artifacts.add('navigation')
+    try:
+        args.manifest = make_manifest(artifacts, args.compat_json)
+    except ValueError as e:
+        parser.error(str(e))
+    args.engine = RetryingBackend(backend_from_arguments(parser, args),
+                                  upload_policy=make_retry_policy(args.upload_retries),
+                                  poll_policy=make_retry_policy(args.poll_retries))
+    return args
 
 def main():
     """Batch process all unprocessed MP3 files"""
-    import sys
+    args = parse_arguments(sys.argv[1:])
     
     print("🚀 AssemblyAI Batch Processing Pipeline")
     print("=" * 50)
@@ -522,94 +1015,165 @@ def main():
         print(f"📂 Using workbench mode: {WORKBENCH_DIR}")
         print(f"   Input: {INPUT_DIR}")
         print(f"   Output: {OUTPUT_DIR}")
-        # Brief pause to allow file system sync
-        time.sleep(0.5)
     else:
         print("📂 Using current directory mode")
     
+    # Setup API key first so transcription can start while videos are extracting
+    if args.backend == DEFAULT_BACKEND:
+        try:
+            setup_api_key()
+            print("✅ API key configured")
+            if args.api_base_url:
+                aai.settings.base_url = args.api_base_url.rstrip('/')
+                print(f"🧪 Using API at {aai.settings.base_url}")
+        except Exception as e:
+            print(f"❌ API key setup failed: {e}")
+            return
+    else:
+        print(f"🧪 Using the {args.backend} transcription backend (no API calls)")
+    
+    # Load the job ledger so interrupted jobs are resumed instead of re-uploaded
+    ledger = JobLedger(get_ledger_path(args.backend))
+    report_in_flight_jobs(ledger)
+    cache = None if args.no_cache else TranscriptCache(get_cache_dir(), args.cache_max_mb)
+    chunking = None if args.no_chunking else {
+        'chunk_minutes': args.chunk_minutes,
+        'overlap_seconds': args.chunk_overlap,
+        'split_over_minutes': args.split_over_minutes,
+        'workers': args.chunk_workers
+    }
+    
+    # Without ffmpeg, videos are only reported (the default profile needs no ffprobe)
+    ffmpeg_available = check_ffmpeg()
+    profile = args.profile if ffmpeg_available else DEFAULT_PROFILE
+    
     # Check if specific files were provided
-    specific_files = sys.argv[1:] if len(sys.argv) > 1 else None
-    video_files = []
-    audio_files = []
+    specific_files = args.files or None
+    search_dir = INPUT_DIR if os.path.exists(INPUT_DIR) else "."
+    unprocessed = []
+    extraction_tasks = []
+    
+    # Start watching before the first scan so files arriving during it are not missed
+    watcher = None
+    if args.watch:
+        watcher = open_watcher(search_dir, VIDEO_EXTENSIONS + AUDIO_EXTENSIONS,
+                               args.quiet_seconds, use_inotify=not args.no_inotify)
     
     if specific_files:
+        # Specific files are processed in the current directory
+        inventory = take_inventory(".")
+        
         # Separate video and audio files
+        video_files = []
         for file in specific_files:
             if os.path.exists(file):
                 ext = Path(file).suffix.lower()
-                if ext in ['.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv', '.wmv', '.m4v']:
+                if ext in VIDEO_EXTENSIONS:
                     video_files.append(file)
                 elif ext in ['.mp3', '.wav', '.m4a']:
-                    audio_files.append(file)
+                    if not find_transcript(inventory, file):
+                        unprocessed.append(file)
                 else:
                     print(f"⚠️  Unsupported file type: {file}")
             else:
                 print(f"❌ File not found: {file}")
-    
-    # Run video preprocessor for video files
-    if video_files:
-        run_video_preprocessor(video_files)
-        print("")  # Add spacing
         
-        # After video preprocessing, add the extracted MP3 files to audio_files
+        # Extracted audio is written to the current directory
         for video_file in video_files:
-            base_name = get_base_filename(video_file)
-            mp3_file = f"{base_name}.mp3"
-            if os.path.exists(mp3_file) and mp3_file not in audio_files:
-                audio_files.append(mp3_file)
-                print(f"📄 Added extracted audio: {mp3_file}")
-    elif not specific_files:
-        # Run video preprocessor in batch mode
-        run_video_preprocessor()
-        print("")  # Add spacing
-    
-    # Setup API key
-    try:
-        setup_api_key()
-        print("✅ API key configured")
-    except Exception as e:
-        print(f"❌ API key setup failed: {e}")
-        return
-    
-    # Find unprocessed files
-    if specific_files and audio_files:
-        # Process specific audio files
-        unprocessed = []
-        for audio_file in audio_files:
-            base_name = get_base_filename(audio_file)
-            json_file = f"{base_name}.json"
-            if not os.path.exists(json_file):
-                unprocessed.append(audio_file)
+            task = plan_extraction(video_file, ".", profile)
+            if os.path.exists(task['output']):
+                if task['output'] not in unprocessed:
+                    unprocessed.append(task['output'])
+                    print(f"📄 Added extracted audio: {task['output']}")
+            else:
+                extraction_tasks.append(task)
     else:
-        # Find all unprocessed audio files (not just MP3s)
-        unprocessed = []
-        for ext in ['.mp3', '.wav', '.m4a', '.aac', '.flac', '.ogg']:
-            pattern = os.path.join(INPUT_DIR if os.path.exists(INPUT_DIR) else ".", f"*{ext}")
-            for audio_file in glob.glob(pattern):
-                base_name = get_base_filename(audio_file)
-                # Check in OUTPUT_DIR for the JSON file
-                json_path = os.path.join(OUTPUT_DIR, f"{base_name}.json") if os.path.exists(OUTPUT_DIR) else f"{base_name}.json"
-                if not os.path.exists(json_path):
-                    unprocessed.append(audio_file)
-    
-    if not unprocessed:
-        print("✨ No unprocessed audio files found")
-        print("All files appear to be already processed")
-        return
+        # One listing of the input and output folders finds all unprocessed
+        # audio files (not just MP3s) and videos
+        inventory = take_inventory(search_dir)
+        unprocessed = [media['path'] for media in unprocessed_media(inventory, AUDIO_EXTENSIONS)]
+        
+        # Videos are extracted alongside transcription
+        extraction_tasks = find_videos_to_extract(search_dir, unprocessed, profile, inventory)
     
-    print(f"📁 Found {len(unprocessed)} unprocessed audio files:")
-    for file in unprocessed:
-        print(f"   • {file}")
+    if extraction_tasks and not ffmpeg_available:
+        print(f"❌ FFmpeg not found - skipping {len(extraction_tasks)} video file(s)")
+        print("   Install ffmpeg to process video files (see README)")
+        extraction_tasks = []
     
-    # Process each file
-    successful = 0
-    failed = 0
+    # In streaming mode videos go straight to transcription; ffmpeg runs during the upload
+    stream = None
+    if args.stream_upload:
+        stream = {'profile': profile, 'threads': args.ffmpeg_threads, 'keep_audio': args.keep_audio}
+        unprocessed.extend(task['input'] for task in extraction_tasks)
+        extraction_tasks = []
     
-    for audio_file in unprocessed:
-        if transcribe_and_process(audio_file):
-            successful += 1
+    successful = failed = 0
+    if not unprocessed and not extraction_tasks:
+        print("✨ No unprocessed audio files found")
+        print("All files appear to be already processed")
+        if watcher is None:
+            return
+    else:
+        print(f"📁 Found {len(unprocessed)} unprocessed audio files:")
+        for file in unprocessed:
+            print(f"   • {file}")
+        if extraction_tasks:
+            print(f"🎬 Found {len(extraction_tasks)} video files to extract:")
+            for task in extraction_tasks:
+                print(f"   • {task['input']} ({task['profile']})")
+        
+        # Process each file
+        if args.async_jobs is not None:
+            successful, failed = process_audio_files_async(
+                unprocessed,
+                args.async_jobs,
+                extraction_tasks=extraction_tasks,
+                extract_workers=args.extract_workers,
+                ffmpeg_threads=args.ffmpeg_threads,
+                ledger=ledger,
+                cache=cache,
+                chunking=chunking,
+                stream=stream,
+                outputs=args.manifest,
+                backend=args.engine,
+                retries={'upload_retries': args.upload_retries, 'poll_retries': args.poll_retries,
+                         'requests_per_second': args.rate_limit}
+            )
         else:
-            failed += 1
+            successful, failed = process_audio_files(
+                unprocessed,
+                jobs=args.jobs,
+                extraction_tasks=extraction_tasks,
+                extract_workers=args.extract_workers,
+                ffmpeg_threads=args.ffmpeg_threads,
+                ledger=ledger,
+                cache=cache,
+                chunking=chunking,
+                stream=stream,
+                outputs=args.manifest,
+                backend=args.engine
+            )
+    
+    if watcher is not None:
+        watched_successful, watched_failed = watch_and_process(
+            watcher,
+            search_dir,
+            jobs=args.jobs,
+            extract_workers=args.extract_workers,
+            ffmpeg_threads=args.ffmpeg_threads,
+            profile=profile,
+            ffmpeg_available=ffmpeg_available,
+            poll_seconds=args.poll_interval,
+            ledger=ledger,
+            cache=cache,
+            chunking=chunking,
+            stream=stream,
+            outputs=args.manifest,
+            backend=args.engine
+        )
+        successful += watched_successful
+        failed += watched_failed
     
     # Summary
     print(f"\n{'='*50}")
@@ -618,6 +1182,8 @@ def main():
     print(f"✅ Successful: {successful}")
     print(f"❌ Failed: {failed}")
     print(f"📂 Total processed: {successful + failed}")
+    if any(args.engine.retries.values()):
+        print(f"🔁 Retried {args.engine.retries['upload']} upload and {args.engine.retries['poll']} poll request(s)")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,287 @@
+"""
+Chunked Transcription - Split long recordings at silences and merge the results
+
+Very long or oversized recordings are cut into overlapping chunks at silence
+points, the chunks are transcribed in parallel, and the per-chunk word lists are
+stitched back together: timestamps are shifted by the chunk offset, words in the
+overlap are deduplicated, and speaker labels are reconciled across chunks by
+matching the words both chunks heard in their shared overlap.
+"""
+
+import os
+import re
+import shutil
+import tempfile
+import subprocess
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from .video_preprocessor import MAX_FILE_SIZE_BYTES
+
+# Default chunking parameters
+DEFAULT_CHUNK_MINUTES = 30
+DEFAULT_OVERLAP_SECONDS = 15
+DEFAULT_SPLIT_OVER_MINUTES = 120
+DEFAULT_CHUNK_WORKERS = 4
+
+# Silence detection parameters
+SILENCE_NOISE_DB = -35
+SILENCE_MIN_SECONDS = 0.5
+
+# How far (as a fraction of the chunk length) a cut may move to land on a silence
+CUT_SEARCH_FRACTION = 0.2
+
+# Maximum start time difference for two overlap words to count as the same word
+WORD_MATCH_TOLERANCE_MS = 500
+
+SILENCE_START_RE = re.compile(r'silence_start:\s*(-?[\d.]+)')
+SILENCE_END_RE = re.compile(r'silence_end:\s*(-?[\d.]+)')
+
+def detect_silences(audio_file, noise_db=SILENCE_NOISE_DB, min_silence_seconds=SILENCE_MIN_SECONDS):
+    """Detect silent stretches with ffmpeg's silencedetect filter
+
+    Returns:
+        List of (start_ms, end_ms) tuples
+    """
+    cmd = [
+        'ffmpeg',
+        '-i', audio_file,
+        '-af', f"silencedetect=noise={noise_db}dB:d={min_silence_seconds}",
+        '-f', 'null',
+        '-'
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Silence detection failed: {result.stderr.strip()[-500:]}")
+
+    silences = []
+    silence_start = None
+    for line in result.stderr.splitlines():
+        start_match = SILENCE_START_RE.search(line)
+        if start_match:
+            silence_start = max(0, int(float(start_match.group(1)) * 1000))
+            continue
+        end_match = SILENCE_END_RE.search(line)
+        if end_match and silence_start is not None:
+            silences.append((silence_start, int(float(end_match.group(1)) * 1000)))
+            silence_start = None
+    return silences
+
+def needs_chunking(audio_file, duration_ms, split_over_minutes=DEFAULT_SPLIT_OVER_MINUTES):
+    """Check if a recording is too large to upload or too long to transcribe as one job"""
+    if os.path.getsize(audio_file) > MAX_FILE_SIZE_BYTES:
+        return True
+    return duration_ms > split_over_minutes * 60 * 1000
+
+def plan_chunks(duration_ms, silences, chunk_ms, overlap_ms):
+    """Choose cut points at silences and build overlapping chunk ranges
+
+    Each chunk covers [start, end) of the original audio, which includes
+    `overlap_ms` on either side of its cut points. Words are only kept from
+    the chunk that owns them, i.e. whose [keep_start, keep_end) range contains
+    the word's start time.
+
+    All boundaries are whole milliseconds, so word times shifted by a chunk's
+    start stay integers however the lengths were given.
+    """
+    duration_ms = int(duration_ms)
+    chunk_ms = int(chunk_ms)
+    overlap_ms = int(overlap_ms)
+    if duration_ms <= chunk_ms:
+        return [{'index': 0, 'start': 0, 'end': duration_ms,
+                 'keep_start': 0, 'keep_end': duration_ms}]
+
+    silence_midpoints = [(start + end) // 2 for start, end in silences]
+    search_window = int(chunk_ms * CUT_SEARCH_FRACTION)
+
+    cuts = []
+    previous_cut = 0
+    while duration_ms - previous_cut > chunk_ms:
+        target = previous_cut + chunk_ms
+        candidates = [m for m in silence_midpoints
+                      if abs(m - target) <= search_window and previous_cut + overlap_ms < m < duration_ms]
+        cut = min(candidates, key=lambda m: abs(m - target)) if candidates else target
+        cuts.append(cut)
+        previous_cut = cut
+
+    boundaries = [0] + cuts + [duration_ms]
+    chunks = []
+    for index in range(len(boundaries) - 1):
+        keep_start = boundaries[index]
+        keep_end = boundaries[index + 1]
+        chunks.append({
+            'index': index,
+            'start': max(0, keep_start - overlap_ms),
+            'end': min(duration_ms, keep_end + overlap_ms),
+            'keep_start': keep_start,
+            'keep_end': keep_end
+        })
+    return chunks
+
+def cut_chunk(audio_file, chunk, output_file):
+    """Cut one chunk out of the source audio with ffmpeg"""
+    cmd = [
+        'ffmpeg',
+        '-ss', f"{chunk['start'] / 1000:.3f}",
+        '-i', audio_file,
+        '-t', f"{(chunk['end'] - chunk['start']) / 1000:.3f}",
+        '-vn',
+        '-acodec', 'mp3',
+        '-ab', '128k',
+        '-y',
+        output_file
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Could not cut chunk {chunk['index']}: {result.stderr.strip()[-500:]}")
+
+def speaker_label(index):
+    """Generate speaker labels in AssemblyAI style: A..Z, AA, AB, ..."""
+    label = ''
+    index += 1
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        label = chr(ord('A') + remainder) + label
+    return label
+
+def normalize_word(text):
+    """Normalize word text for matching across chunks"""
+    return re.sub(r'[^\w]', '', text).lower()
+
+def reconcile_speakers(previous_words, chunk_words, used_labels):
+    """Map a chunk's local speaker labels onto the global labels
+
+    Words both chunks transcribed in their shared overlap vote for a mapping
+    from local to global label; pairs are assigned greedily by vote count.
+    Local speakers that cannot be matched get a fresh global label.
+    """
+    votes = Counter()
+    if previous_words and chunk_words:
+        overlap_start = chunk_words[0]['start']
+        candidates = [w for w in previous_words if w['start'] >= overlap_start - WORD_MATCH_TOLERANCE_MS]
+        position = 0
+        for word in chunk_words:
+            if not candidates or word['start'] > candidates[-1]['end'] + WORD_MATCH_TOLERANCE_MS:
+                break
+            # Advance past previous-chunk words that are too early to match
+            while position < len(candidates) and candidates[position]['start'] < word['start'] - WORD_MATCH_TOLERANCE_MS:
+                position += 1
+            text = normalize_word(word['text'])
+            for candidate in candidates[position:]:
+                if candidate['start'] > word['start'] + WORD_MATCH_TOLERANCE_MS:
+                    break
+                if normalize_word(candidate['text']) == text:
+                    votes[(word['speaker'], candidate['speaker'])] += 1
+                    break
+
+    mapping = {}
+    assigned_globals = set()
+    for (local_label, global_label), count in votes.most_common():
+        if local_label in mapping or global_label in assigned_globals:
+            continue
+        mapping[local_label] = global_label
+        assigned_globals.add(global_label)
+
+    for word in chunk_words:
+        local_label = word['speaker']
+        if local_label not in mapping:
+            index = 0
+            while speaker_label(index) in used_labels:
+                index += 1
+            mapping[local_label] = speaker_label(index)
+            used_labels.add(mapping[local_label])
+    return mapping
+
+def merge_chunk_transcripts(chunks, chunk_transcripts, audio_file):
+    """Stitch per-chunk transcripts back into one transcript
+
+    Args:
+        chunks: Chunk plans from plan_chunks()
+        chunk_transcripts: Transcript data dicts, one per chunk, with chunk-relative times
+        audio_file: Original audio file (recorded as audio_url)
+
+    Returns:
+        Transcript data dict in the usual shape, with times relative to the original audio
+    """
+    merged_words = []
+    used_labels = set()
+    previous_words = []
+
+    for chunk, transcript_data in zip(chunks, chunk_transcripts):
+        offset = chunk['start']
+        chunk_words = []
+        for word in transcript_data.get('words', []):
+            shifted = dict(word)
+            shifted['start'] = word['start'] + offset
+            shifted['end'] = word['end'] + offset
+            chunk_words.append(shifted)
+
+        if chunk['index'] == 0:
+            mapping = {w['speaker']: w['speaker'] for w in chunk_words}
+            used_labels.update(mapping.values())
+        else:
+            mapping = reconcile_speakers(previous_words, chunk_words, used_labels)
+
+        for word in chunk_words:
+            word['speaker'] = mapping[word['speaker']]
+
+        # Keep only the words this chunk owns; the rest belong to a neighbour
+        merged_words.extend(w for w in chunk_words
+                            if chunk['keep_start'] <= w['start'] < chunk['keep_end'])
+        previous_words = chunk_words
+
+    first = chunk_transcripts[0] if chunk_transcripts else {}
+    return {
+        'id': '+'.join(str(t.get('id', 'unknown')) for t in chunk_transcripts),
+        'text': ' '.join(w['text'] for w in merged_words),
+        'words': merged_words,
+        'status': 'completed',
+        'audio_url': audio_file,
+        'language_code': first.get('language_code', 'en'),
+    }
+
+def transcribe_in_chunks(audio_file, transcribe_chunk, duration_ms,
+                         chunk_minutes=DEFAULT_CHUNK_MINUTES,
+                         overlap_seconds=DEFAULT_OVERLAP_SECONDS,
+                         workers=DEFAULT_CHUNK_WORKERS):
+    """Split a recording into chunks, transcribe them in parallel and merge the results
+
+    Args:
+        audio_file: Path to the audio file
+        transcribe_chunk: Function taking a chunk path and returning transcript data (or None on failure)
+        duration_ms: Duration of the recording
+        chunk_minutes: Target chunk length
+        overlap_seconds: Audio shared between neighbouring chunks
+        workers: Number of chunks transcribed at once
+
+    Returns:
+        Merged transcript data, or None if any chunk failed
+    """
+    print("🔇 Detecting silences for chunk boundaries...")
+    silences = detect_silences(audio_file)
+    chunks = plan_chunks(duration_ms, silences, chunk_minutes * 60 * 1000, overlap_seconds * 1000)
+    print(f"✂️  Splitting into {len(chunks)} chunks (~{chunk_minutes} min, {overlap_seconds}s overlap)")
+
+    work_dir = tempfile.mkdtemp(prefix='transit_chunks_')
+    try:
+        chunk_files = []
+        for chunk in chunks:
+            chunk_file = os.path.join(work_dir, f"chunk_{chunk['index']:03d}.mp3")
+            cut_chunk(audio_file, chunk, chunk_file)
+            chunk_files.append(chunk_file)
+
+        print(f"⚡ Transcribing {len(chunks)} chunks with up to {workers} in parallel")
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            chunk_transcripts = list(executor.map(transcribe_chunk, chunk_files))
+
+        failed = [chunk['index'] for chunk, t in zip(chunks, chunk_transcripts) if t is None]
+        if failed:
+            print(f"❌ {len(failed)} chunk(s) failed to transcribe: {failed}")
+            return None
+
+        transcript_data = merge_chunk_transcripts(chunks, chunk_transcripts, audio_file)
+        speakers = sorted(set(w['speaker'] for w in transcript_data['words']))
+        print(f"🧵 Merged {len(chunks)} chunks: {len(transcript_data['words'])} words, speakers {', '.join(speakers)}")
+        return transcript_data
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,234 @@
+"""
+Fake Server - Local stand-in for the transcription API, for offline testing
+
+Serves the endpoints the async client uses (upload, submit and poll) and
+returns a transcript made up by the mock engine (transcription_backends)
+once a job has been "processing" for a while. It can also misbehave on
+purpose, so retries and rate limiting can be exercised without an API key
+or network:
+    --error-rate       answer a share of requests with 500/503
+    --drop-rate        close a share of connections without answering
+    --rate-limit       answer 429 with Retry-After above this many requests/second
+    --job-error-rate   let a share of jobs end with status "error"
+
+Usage:
+    python -m src.transit.fake_server --port 8765 --error-rate 0.1 --rate-limit 20
+    ASSEMBLYAI_API_KEY=test python -m src.transit.batch_process --async-jobs 50 \\
+        --api-base-url http://127.0.0.1:8765
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import itertools
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from .transcription_backends import mock_words, MOCK_BYTES_PER_SECOND, MOCK_MIN_DURATION_MS
+
+DEFAULT_PORT = 8765
+DEFAULT_PROCESSING_SECONDS = 3.0
+
+class FakeTranscriptionServer(ThreadingHTTPServer):
+    """HTTP server holding the uploads, jobs and failure settings"""
+
+    daemon_threads = True
+
+    def __init__(self, address, processing_seconds=DEFAULT_PROCESSING_SECONDS, error_rate=0.0, drop_rate=0.0,
+                 rate_limit=None, job_error_rate=0.0, seed=0):
+        super().__init__(address, FakeRequestHandler)
+        self.processing_seconds = processing_seconds
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.rate_limit = rate_limit
+        self.job_error_rate = job_error_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.uploads = {}
+        self.jobs = {}
+        self.stats = {'requests': 0, 'uploads': 0, 'submits': 0, 'polls': 0,
+                      'errors': 0, 'drops': 0, 'throttled': 0}
+        self.tokens = rate_limit or 0
+        self.updated = time.monotonic()
+
+    def roll(self, rate):
+        with self.lock:
+            return self.rng.random() < rate
+
+    def allow_request(self):
+        """Token bucket for --rate-limit; False when the request should get a 429"""
+        if not self.rate_limit:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate_limit, self.tokens + (now - self.updated) * self.rate_limit)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+class FakeRequestHandler(BaseHTTPRequestHandler):
+    """Handle one request to the fake API"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, data, headers=None):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self):
+        """Read the request body, plain or chunked"""
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            parts = []
+            while True:
+                size = int(self.rfile.readline().split(b';')[0].strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return b''.join(parts)
+                parts.append(self.rfile.read(size))
+                self.rfile.readline()
+        return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+    def misbehave(self):
+        """Inject the configured failures; True if the request was answered (or dropped) already"""
+        server = self.server
+        server.count('requests')
+        if not self.headers.get('Authorization'):
+            self.send_json(401, {'error': 'Authentication error, API token missing/invalid'})
+            return True
+        if server.roll(server.drop_rate):
+            server.count('drops')
+            self.close_connection = True
+            return True
+        if not server.allow_request():
+            server.count('throttled')
+            self.send_json(429, {'error': 'Too many requests'}, {'Retry-After': '1'})
+            return True
+        if server.roll(server.error_rate):
+            server.count('errors')
+            status = 503 if server.roll(0.5) else 500
+            self.send_json(status, {'error': 'Temporarily unavailable'})
+            return True
+        return False
+
+    def do_POST(self):
+        server = self.server
+        body = self.read_body()
+        if self.misbehave():
+            return
+
+        if self.path == '/v2/upload':
+            server.count('uploads')
+            upload_id = next(server.ids)
+            with server.lock:
+                server.uploads[upload_id] = len(body)
+            self.send_json(200, {'upload_url': f"https://fake.upload/{upload_id}"})
+        elif self.path == '/v2/transcript':
+            server.count('submits')
+            try:
+                request = json.loads(body)
+                upload_size = server.uploads[int(request['audio_url'].rsplit('/', 1)[1])]
+            except (ValueError, KeyError):
+                self.send_json(400, {'error': 'Invalid audio_url'})
+                return
+            job_id = f"fake-{next(server.ids)}"
+            with server.lock:
+                server.jobs[job_id] = {'submitted': time.monotonic(), 'size': upload_size,
+                                       'failed': server.rng.random() < server.job_error_rate}
+            self.send_json(200, {'id': job_id, 'status': 'queued'})
+        else:
+            self.send_json(404, {'error': 'Not found'})
+
+    def do_GET(self):
+        server = self.server
+        if self.misbehave():
+            return
+
+        job_id = self.path.rsplit('/', 1)[-1]
+        job = server.jobs.get(job_id) if self.path.startswith('/v2/transcript/') else None
+        if job is None:
+            self.send_json(404, {'error': 'Transcript not found'})
+            return
+
+        server.count('polls')
+        if time.monotonic() - job['submitted'] < server.processing_seconds:
+            self.send_json(200, {'id': job_id, 'status': 'processing'})
+        elif job['failed']:
+            self.send_json(200, {'id': job_id, 'status': 'error', 'error': 'Fake transcription failure'})
+        else:
+            duration_ms = max(MOCK_MIN_DURATION_MS, job['size'] * 1000 // MOCK_BYTES_PER_SECOND)
+            words = mock_words(job_id, duration_ms)
+            self.send_json(200, {'id': job_id, 'status': 'completed', 'language_code': 'en',
+                                 'text': ' '.join(word['text'] for word in words), 'words': words})
+
+def start_server(host='127.0.0.1', port=0, **options):
+    """Start a fake server in a background thread (port 0 picks a free port)
+
+    Returns:
+        The server; its URL is f"http://{host}:{server.server_port}"
+    """
+    server = FakeTranscriptionServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def parse_arguments(argv):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Run a fake transcription API for offline testing")
+    parser.add_argument('--host', default='127.0.0.1', help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument('--processing-seconds', type=float, default=DEFAULT_PROCESSING_SECONDS,
+                        help=f"How long each job stays processing (default: {DEFAULT_PROCESSING_SECONDS})")
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help="Share of requests answered with 500/503 (default: 0)")
+    parser.add_argument('--drop-rate', type=float, default=0.0,
+                        help="Share of connections closed without an answer (default: 0)")
+    parser.add_argument('--rate-limit', type=float, default=None,
+                        help="Requests per second before answering 429 with Retry-After (default: no limit)")
+    parser.add_argument('--job-error-rate', type=float, default=0.0,
+                        help="Share of jobs that end with status error (default: 0)")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed for injected failures (default: 0)")
+    args = parser.parse_args(argv)
+    for name in ('error_rate', 'drop_rate', 'job_error_rate'):
+        if not 0 <= getattr(args, name) <= 1:
+            parser.error(f"--{name.replace('_', '-')} must be between 0 and 1")
+    return args
+
+def main():
+    args = parse_arguments(sys.argv[1:])
+    server = FakeTranscriptionServer(
+        (args.host, args.port),
+        processing_seconds=args.processing_seconds,
+        error_rate=args.error_rate,
+        drop_rate=args.drop_rate,
+        rate_limit=args.rate_limit,
+        job_error_rate=args.job_error_rate,
+        seed=args.seed
+    )
+    print(f"🧪 Fake transcription API listening on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n📊 {json.dumps(server.stats)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Input Watcher - Notice media files as soon as they finish arriving in a folder
+
+On Linux the folder is watched with inotify: a file is ready when the process
+writing it closes it, or when it is moved into the folder in one piece. Where
+inotify is not available, the folder is polled instead, and a file is ready
+once its size and modification time have stayed the same for a quiet window.
+
+Either way, only the watched folder itself is looked at; nothing is rescanned
+recursively.
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+
+DEFAULT_QUIET_SECONDS = 2.0
+DEFAULT_POLL_SECONDS = 1.0
+
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# wd, mask, cookie, name length; the name follows, padded with NUL bytes
+EVENT_HEADER = struct.Struct('iIII')
+READ_SIZE = 64 * 1024
+
+def is_candidate(name, extensions):
+    """Check if a file name has one of the extensions and is not a hidden temp file"""
+    return not name.startswith('.') and os.path.splitext(name)[1].lower() in extensions
+
+def list_candidates(directory, extensions):
+    """Paths and (size, mtime) of all candidate files directly inside a directory"""
+    candidates = {}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not is_candidate(entry.name, extensions):
+                    continue
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        candidates[entry.path] = (stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    # Removed between listing and stat
+                    continue
+    except OSError:
+        pass
+    return candidates
+
+class InotifyWatcher:
+    """Report files that were closed after writing or moved into a directory"""
+
+    kind = 'inotify'
+
+    def __init__(self, directory, extensions, libc, fd):
+        self.directory = directory
+        self.extensions = extensions
+        self.libc = libc
+        self.fd = fd
+
+    @classmethod
+    def open(cls, directory, extensions):
+        """Start watching a directory, or return None if inotify is unavailable"""
+        if not sys.platform.startswith('linux'):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            os.close(fd)
+            return None
+        return cls(directory, extensions, libc, fd)
+
+    def wait(self, timeout):
+        """Wait up to `timeout` seconds and return the paths of files that became ready"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, READ_SIZE)
+        except OSError as e:
+            if e.errno in (errno.EAGAIN, errno.EINTR):
+                return []
+            raise
+
+        ready = []
+        position = 0
+        while position + EVENT_HEADER.size <= len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, position)
+            name = data[position + EVENT_HEADER.size:position + EVENT_HEADER.size + length].rstrip(b'\0')
+            position += EVENT_HEADER.size + length
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; fall back to everything currently in the folder
+                ready.extend(list_candidates(self.directory, self.extensions))
+            elif mask & IN_IGNORED:
+                raise OSError(f"Watched folder is gone: {self.directory}")
+            elif name and is_candidate(os.fsdecode(name), self.extensions):
+                ready.append(os.path.join(self.directory, os.fsdecode(name)))
+        return list(dict.fromkeys(ready))
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Report files whose size and modification time stopped changing"""
+
+    kind = 'polling'
+
+    def __init__(self, directory, extensions, quiet_seconds=DEFAULT_QUIET_SECONDS):
+        self.directory = directory
+        self.extensions = extensions
+        self.quiet_seconds = quiet_seconds
+        # path -> (signature, time the signature was first seen)
+        self.pending = {}
+        # path -> signature it was reported with
+        self.reported = {}
+
+    def wait(self, timeout):
+        """Sleep `timeout` seconds, then return the paths of files that became ready"""
+        time.sleep(timeout)
+        now = time.monotonic()
+        candidates = list_candidates(self.directory, self.extensions)
+
+        ready = []
+        for path, signature in candidates.items():
+            if self.reported.get(path) == signature:
+                continue
+            seen = self.pending.get(path)
+            if seen is None or seen[0] != signature:
+                self.pending[path] = (signature, now)
+            elif now - seen[1] >= self.quiet_seconds:
+                del self.pending[path]
+                self.reported[path] = signature
+                ready.append(path)
+
+        # Forget files that were moved away, so a new file with the same name counts
+        for path in [path for path in self.reported if path not in candidates]:
+            del self.reported[path]
+        for path in [path for path in self.pending if path not in candidates]:
+            del self.pending[path]
+        return ready
+
+    def close(self):
+        pass
+
+def open_watcher(directory, extensions, quiet_seconds=DEFAULT_QUIET_SECONDS, use_inotify=True):
+    """Watch a directory for finished files with the given extensions
+
+    Uses inotify when available (and use_inotify is set), otherwise polling
+    with a quiet window of `quiet_seconds`.
+    """
+    extensions = {ext.lower() for ext in extensions}
+    watcher = InotifyWatcher.open(directory, extensions) if use_inotify else None
+    return watcher or PollingWatcher(directory, extensions, quiet_seconds)
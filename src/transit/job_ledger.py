@@ -0,0 +1,101 @@
+"""
+Job Ledger - Persistent record of submitted transcription jobs
+
+Maps every submitted input file to its content hash, remote job ID and state,
+so an interrupted batch run can resume polling jobs that are still in flight
+instead of uploading (and paying for) the same audio again.
+"""
+
+import json
+import os
+import hashlib
+import threading
+import time
+
+LEDGER_FILENAME = 'jobs_ledger.json'
+
+# Job states
+STATE_SUBMITTED = 'submitted'
+STATE_COMPLETED = 'completed'
+STATE_FAILED = 'failed'
+
+def compute_file_hash(filepath, chunk_size=1024 * 1024):
+    """Compute the SHA-256 hash of a file, reading it in chunks"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class JobLedger:
+    """On-disk ledger of transcription jobs keyed by audio content hash
+
+    Every change is written to disk immediately (via a temporary file and an
+    atomic rename), so the ledger survives the process being killed at any point.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self):
+        """Load ledger entries from disk"""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            return data.get('jobs', {})
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not read job ledger {self.path}: {e}")
+            return {}
+
+    def _save(self):
+        """Write ledger entries to disk atomically"""
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({'jobs': self._entries}, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def get(self, content_hash):
+        """Get the ledger entry for a content hash, or None"""
+        with self._lock:
+            entry = self._entries.get(content_hash)
+            return dict(entry) if entry else None
+
+    def in_flight(self):
+        """List entries for jobs that were submitted but not yet collected"""
+        with self._lock:
+            return [dict(entry) for entry in self._entries.values()
+                    if entry['state'] == STATE_SUBMITTED]
+
+    def record_submitted(self, input_file, content_hash, job_id):
+        """Record a newly submitted job"""
+        now = time.time()
+        with self._lock:
+            self._entries[content_hash] = {
+                'input_file': os.path.abspath(input_file),
+                'content_hash': content_hash,
+                'job_id': job_id,
+                'state': STATE_SUBMITTED,
+                'submitted_at': now,
+                'updated_at': now,
+                'error': None
+            }
+            self._save()
+
+    def update_state(self, content_hash, state, error=None):
+        """Update the state of an existing job"""
+        with self._lock:
+            entry = self._entries.get(content_hash)
+            if entry is None:
+                return
+            entry['state'] = state
+            entry['error'] = error
+            entry['updated_at'] = time.time()
+            self._save()
@@ -0,0 +1,258 @@
+"""
+Job Scheduler - Retries, backoff and rate limiting for transcription jobs
+
+Transient failures (dropped connections, timeouts, 429 and 5xx responses)
+are retried with jittered exponential backoff instead of failing the file.
+A Retry-After header on the response is honored, and a 429 holds back every
+request, not just the one that was refused.
+
+Submitting a job is not idempotent: if the response to a submit is lost,
+the job may exist anyway, and sending the request again would create (and
+bill) a second one. So a failed submit is only retried when the server
+answered with a retryable status, or when the request was never sent.
+
+Uploading (upload and submit) and polling have separate retry budgets per
+job, so a flaky upload cannot use up the retries a long job needs while it
+is being polled. All requests pass through one rate limiter, and at most
+`concurrency` jobs are in flight at once, however many files are queued.
+"""
+
+import time
+import random
+import asyncio
+import email.utils
+
+import httpx
+
+from .async_client import next_poll_interval, POLL_INITIAL_SECONDS, STATUS_COMPLETED, STATUS_ERROR
+
+DEFAULT_UPLOAD_RETRIES = 5
+DEFAULT_POLL_RETRIES = 10
+DEFAULT_BACKOFF_SECONDS = 1.0
+DEFAULT_MAX_BACKOFF_SECONDS = 60.0
+
+# Requests per second across all jobs (0 or None for no limit)
+DEFAULT_REQUESTS_PER_SECOND = 20.0
+
+# Responses worth retrying; anything else (bad key, bad request, ...) fails at once
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+STATUS_TOO_MANY_REQUESTS = 429
+
+# Failures that happen before a request reaches the server
+UNSENT_REQUEST_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+def make_retry_policy(retries, base_seconds=DEFAULT_BACKOFF_SECONDS, max_seconds=DEFAULT_MAX_BACKOFF_SECONDS):
+    """Build a retry policy
+
+    Args:
+        retries: Number of retries allowed (0 to fail on the first error)
+        base_seconds: Backoff cap for the first retry, doubled for each further one
+        max_seconds: Largest backoff cap
+
+    Returns:
+        Dict with retries, base_seconds and max_seconds
+    """
+    return {'retries': retries, 'base_seconds': base_seconds, 'max_seconds': max_seconds}
+
+def backoff_delay(attempt, policy, rng=random):
+    """Jittered exponential backoff ("full jitter") before retry number `attempt` + 1
+
+    The delay is drawn uniformly between 0 and base_seconds * 2^attempt
+    (capped at max_seconds), so many jobs failing at once do not retry in
+    lockstep.
+    """
+    return rng.uniform(0, min(policy['max_seconds'], policy['base_seconds'] * 2 ** attempt))
+
+def parse_retry_after(value):
+    """Seconds to wait according to a Retry-After header (delay or HTTP date), or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+def classify_error(error, idempotent=True):
+    """Decide whether a failed request is worth retrying
+
+    Args:
+        error: The exception the request raised
+        idempotent: False for requests that must not be sent twice (submitting
+            a job); those are only retried after a retryable status response
+            or a failure before the request was sent
+
+    Returns:
+        Tuple of (retryable, seconds requested by Retry-After or None)
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        response = error.response
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            return True, parse_retry_after(response.headers.get('retry-after'))
+        return False, None
+    # AssemblyAI SDK errors carry the status code of the failed response
+    status_code = getattr(error, 'status_code', None)
+    if isinstance(status_code, int):
+        return status_code in RETRYABLE_STATUS_CODES, None
+    # Connection errors, dropped connections and timeouts
+    if idempotent:
+        return isinstance(error, httpx.TransportError), None
+    return isinstance(error, UNSENT_REQUEST_ERRORS), None
+
+def describe_error(error):
+    """Short description of a failed request for progress output"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"HTTP {error.response.status_code}"
+    return type(error).__name__
+
+class RetryBudget:
+    """Retries left for one phase (upload or poll) of one job"""
+
+    def __init__(self, phase, policy):
+        self.phase = phase
+        self.policy = policy
+        self.used = 0
+        # Consecutive failures, which set the backoff; reset by a success
+        self.streak = 0
+
+    def exhausted(self):
+        return self.used >= self.policy['retries']
+
+    def next_delay(self, retry_after=None):
+        """Take one retry from the budget and return how long to wait before it
+
+        A Retry-After delay is waited out in full, with the jittered backoff
+        on top so the refused requests do not all return at the same moment.
+        """
+        delay = backoff_delay(self.streak, self.policy)
+        self.used += 1
+        self.streak += 1
+        return delay if retry_after is None else retry_after + delay
+
+    def succeeded(self):
+        self.streak = 0
+
+def report_retry(error, budget, label, delay):
+    """Print that a failed request will be retried"""
+    retries_left = budget.policy['retries'] - budget.used
+    print(f"🔁 {describe_error(error)} during {budget.phase} of {label} - "
+          f"retrying in {delay:.1f}s ({retries_left} {budget.phase} retries left)")
+
+def call_with_retries(budget, label, func, *args, idempotent=True):
+    """Call func(*args), retrying transient failures while the budget lasts
+
+    Blocking counterpart of JobScheduler.request for the threaded pipeline,
+    without the shared rate limiter.
+    """
+    while True:
+        try:
+            result = func(*args)
+        except Exception as e:
+            retryable, retry_after = classify_error(e, idempotent)
+            if not retryable or budget.exhausted():
+                raise
+            delay = budget.next_delay(retry_after)
+            report_retry(e, budget, label, delay)
+            time.sleep(delay)
+            continue
+        budget.succeeded()
+        return result
+
+class RateLimiter:
+    """Token bucket shared by all requests: `rate` per second, in bursts of up to `burst`
+
+    With no rate, requests are only held back while the server has asked
+    for a pause.
+    """
+
+    def __init__(self, rate=None, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1.0, rate or 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.held_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def hold(self, seconds):
+        """Let no request through for `seconds` (the server asked us to slow down)"""
+        self.held_until = max(self.held_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.held_until:
+                    await asyncio.sleep(self.held_until - now)
+                    continue
+                if not self.rate:
+                    return
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class JobScheduler:
+    """Run transcription jobs through an AsyncTranscriptionClient with retries and limits
+
+    Hold `scheduler.slots` while a job is in flight:
+
+        async with scheduler.slots:
+            job = await scheduler.upload_and_submit(audio_file, settings)
+            response = await scheduler.wait(job['id'])
+    """
+
+    def __init__(self, client, concurrency, requests_per_second=DEFAULT_REQUESTS_PER_SECOND,
+                 upload_policy=None, poll_policy=None):
+        self.client = client
+        self.slots = asyncio.Semaphore(concurrency)
+        self.limiter = RateLimiter(requests_per_second or None)
+        self.upload_policy = upload_policy or make_retry_policy(DEFAULT_UPLOAD_RETRIES)
+        self.poll_policy = poll_policy or make_retry_policy(DEFAULT_POLL_RETRIES)
+        # Retries made so far, per phase
+        self.retries = {'upload': 0, 'poll': 0}
+
+    async def request(self, budget, label, func, *args, idempotent=True):
+        """Send one API request, retrying transient failures while the budget lasts"""
+        while True:
+            await self.limiter.acquire()
+            try:
+                result = await func(*args)
+            except Exception as e:
+                retryable, retry_after = classify_error(e, idempotent)
+                if not retryable or budget.exhausted():
+                    raise
+                if retry_after is not None and e.response.status_code == STATUS_TOO_MANY_REQUESTS:
+                    self.limiter.hold(retry_after)
+                delay = budget.next_delay(retry_after)
+                self.retries[budget.phase] += 1
+                report_retry(e, budget, label, delay)
+                await asyncio.sleep(delay)
+                continue
+            budget.succeeded()
+            return result
+
+    async def upload_and_submit(self, audio_file, settings, label=None):
+        """Upload a file and submit its transcription job, sharing one upload budget"""
+        label = label or audio_file
+        budget = RetryBudget('upload', self.upload_policy)
+        upload_url = await self.request(budget, label, self.client.upload, audio_file)
+        return await self.request(budget, label, self.client.submit, upload_url, settings, idempotent=False)
+
+    async def wait(self, job_id, label=None):
+        """Poll a job until it completes or fails, with its own poll budget"""
+        label = label or job_id
+        budget = RetryBudget('poll', self.poll_policy)
+        interval = POLL_INITIAL_SECONDS
+        while True:
+            job = await self.request(budget, label, self.client.get, job_id)
+            if job.get('status') in (STATUS_COMPLETED, STATUS_ERROR):
+                return job
+            await asyncio.sleep(interval)
+            interval = next_poll_interval(interval)
@@ -8,55 +8,47 @@ lets you assign meaningful names to speakers (e.g., "John", "Sarah")
 instead of the default labels (A, B, C, D).
 """
 
-import json
 import os
 import glob
-import copy
 import textwrap
 from pathlib import Path
 from datetime import datetime
 
-# Import shared functions from batch_process
+# Import shared functions
+from .rendering import milliseconds_to_hms
 from .batch_process import (
-    milliseconds_to_hms, 
-    milliseconds_to_srt_time,
-    group_words_into_segments,
-    write_srt,
-    write_md,
     WORKBENCH_DIR,
     OUTPUT_DIR
 )
+from .transcript_sidecar import load_transcript, save_transcript
+from .render_cache import (
+    build_speaker_index,
+    get_render_cache,
+    get_speaker_index,
+    load_speaker_mapping,
+    save_speaker_mapping,
+    relabel_transcript,
+    RENDER_CACHE_SUFFIX,
+    SPEAKER_MAPPING_SUFFIX
+)
 
-def get_speaker_preview(words, speaker_label, num_samples=3, words_per_sample=20):
-    """Get preview text samples for a specific speaker"""
-    speaker_words = [w for w in words if w.get('speaker') == speaker_label]
-    
-    if not speaker_words:
+def get_speaker_preview(words, speaker_stats):
+    """Get preview text samples for a speaker from its speaker index entry"""
+    samples = speaker_stats['samples']
+    if not samples or not samples[0]:
         return []
     
-    # Get evenly distributed samples
-    total_words = len(speaker_words)
-    if total_words <= words_per_sample:
+    if len(samples) == 1 and len(samples[0]) == speaker_stats['word_count']:
         # If we have few words, just return all of them
-        return [' '.join([w['text'] for w in speaker_words])]
-    
-    samples = []
-    sample_positions = []
-    
-    if num_samples == 1:
-        sample_positions = [0]
-    else:
-        # Calculate positions for even distribution
-        step = (total_words - words_per_sample) // (num_samples - 1)
-        sample_positions = [i * step for i in range(num_samples)]
+        return [' '.join([words[i]['text'] for i in samples[0]])]
     
-    for pos in sample_positions:
-        sample_words = speaker_words[pos:pos + words_per_sample]
-        sample_text = ' '.join([w['text'] for w in sample_words])
-        timestamp = milliseconds_to_hms(sample_words[0]['start'])
-        samples.append(f"[{timestamp}] {sample_text}...")
+    previews = []
+    for positions in samples:
+        sample_text = ' '.join([words[i]['text'] for i in positions])
+        timestamp = milliseconds_to_hms(words[positions[0]]['start'])
+        previews.append(f"[{timestamp}] {sample_text}...")
     
-    return samples
+    return previews
 
 def find_latest_transcript(search_dir=None):
     """Find the most recently modified transcript JSON file"""
@@ -67,19 +59,20 @@ def find_latest_transcript(search_dir=None):
         else:
             search_dir = "."
     
-    # Search for original transcript files (not processed versions)
+    # Search for original transcript files (not processed versions or caches)
     json_files = []
+    cache_suffixes = (RENDER_CACHE_SUFFIX, SPEAKER_MAPPING_SUFFIX)
     
     if search_dir == OUTPUT_DIR:
         # Search in all output subdirectories
         pattern = os.path.join(search_dir, "*", "*.json")
         all_json_files = glob.glob(pattern)
         # Filter out processed versions
-        json_files = [f for f in all_json_files if "new_transcript_aai" not in f]
+        json_files = [f for f in all_json_files if "new_transcript_aai" not in f and not f.endswith(cache_suffixes)]
     else:
         # Search in current directory
         all_json_files = glob.glob("*.json")
-        json_files = [f for f in all_json_files if "new_transcript_aai" not in f]
+        json_files = [f for f in all_json_files if "new_transcript_aai" not in f and not f.endswith(cache_suffixes)]
     
     if not json_files:
         return None
@@ -89,52 +82,46 @@ def find_latest_transcript(search_dir=None):
     
     return json_files[0]
 
-def display_speaker_stats(words):
-    """Display statistics about speakers in the transcript"""
-    speaker_stats = {}
-    
-    for word in words:
-        speaker = word.get('speaker', 'Unknown')
-        if speaker not in speaker_stats:
-            speaker_stats[speaker] = {
-                'word_count': 0,
-                'duration_ms': 0,
-                'first_timestamp': word['start'],
-                'last_timestamp': word['end']
-            }
-        
-        speaker_stats[speaker]['word_count'] += 1
-        speaker_stats[speaker]['last_timestamp'] = word['end']
+def display_speaker_stats(speaker_index):
+    """Display statistics about speakers in the transcript
     
+    Args:
+        speaker_index: Dict of speaker label -> stats, from build_speaker_index
+    """
     print("\n📊 SPEAKER STATISTICS")
     print("=" * 50)
     
-    for speaker, stats in sorted(speaker_stats.items()):
-        duration_ms = stats['last_timestamp'] - stats['first_timestamp']
-        duration_str = milliseconds_to_hms(duration_ms)
-        word_count = stats['word_count']
-        
+    for speaker, stats in sorted(speaker_index.items()):
         print(f"\nSpeaker {speaker}:")
-        print(f"  Words spoken: {word_count:,}")
-        print(f"  Speaking duration: {duration_str}")
-        print(f"  First appears: {milliseconds_to_hms(stats['first_timestamp'])}")
+        print(f"  Words spoken: {stats['word_count']:,}")
+        print(f"  Speaking time: {milliseconds_to_hms(stats['talk_ms'])}")
+        print(f"  First appears: {milliseconds_to_hms(stats['first_start'])}")
     
-    return speaker_stats
+    return speaker_index
 
-def interactive_speaker_rename(transcript_data):
-    """Interactively rename speakers in the transcript"""
+def interactive_speaker_rename(transcript_data, previous_mapping=None, speaker_index=None):
+    """Interactively choose new speaker names for the transcript
+    
+    Names chosen in an earlier run (`previous_mapping`) are offered as the
+    defaults. Statistics and previews come from `speaker_index`, which is
+    built from the words if not given. The words themselves are left unchanged.
+    """
     words = transcript_data.get('words', [])
     if not words:
         print("❌ No words found in transcript")
         return None
     
+    if speaker_index is None:
+        speaker_index = build_speaker_index(words)
+    
     # Display speaker statistics
-    speaker_stats = display_speaker_stats(words)
+    speaker_stats = display_speaker_stats(speaker_index)
     unique_speakers = sorted(speaker_stats.keys())
     
     print(f"\n👥 Found {len(unique_speakers)} speakers: {', '.join(unique_speakers)}")
     
     # Show preview for each speaker and ask for new name
+    previous_mapping = previous_mapping or {}
     speaker_mapping = {}
     
     print("\n🎤 SPEAKER IDENTIFICATION")
@@ -147,31 +134,24 @@ def interactive_speaker_rename(transcript_data):
         print(f"\n--- Speaker {speaker} ---")
         
         # Get and display preview samples
-        samples = get_speaker_preview(words, speaker, num_samples=3)
+        samples = get_speaker_preview(words, speaker_stats[speaker])
         for sample in samples:
             print(f"  {sample}")
         
         # Ask for new name
-        new_name = input(f"\nNew name for Speaker {speaker} (or Enter to keep '{speaker}'): ").strip()
+        default_name = previous_mapping.get(speaker, speaker)
+        new_name = input(f"\nNew name for Speaker {speaker} (or Enter to keep '{default_name}'): ").strip()
         
         if new_name:
             speaker_mapping[speaker] = new_name
             print(f"✅ Speaker {speaker} → {new_name}")
         else:
-            speaker_mapping[speaker] = speaker
-            print(f"✅ Keeping Speaker {speaker}")
-    
-    # Apply speaker mapping to create new transcript
-    new_data = copy.deepcopy(transcript_data)
+            speaker_mapping[speaker] = default_name
+            print(f"✅ Keeping Speaker {speaker}" if default_name == speaker else f"✅ Speaker {speaker} → {default_name}")
     
-    # Update words with new speaker names
-    for word in new_data.get('words', []):
-        old_speaker = word.get('speaker')
-        if old_speaker in speaker_mapping:
-            word['speaker'] = speaker_mapping[old_speaker]
-    
-    # Update the main text if needed (though this is usually just the raw text)
-    # The speaker labels are primarily in the words array
+    # The new transcript shares the words; they are renamed in place when the
+    # outputs are written, instead of deep-copying the whole transcript first
+    new_data = dict(transcript_data)
     
     return new_data, speaker_mapping
 
@@ -189,39 +169,43 @@ def process_transcript(json_file):
     
     # Load transcript data
     try:
-        with open(json_file, 'r') as f:
-            transcript_data = json.load(f)
+        transcript_data = load_transcript(json_file)
     except Exception as e:
         print(f"❌ Error reading file: {e}")
         return False
     
+    # Speaker statistics, previews and the cached segments all come from the
+    # render cache, which is built in a single pass on the first run
+    words = transcript_data.get('words') or []
+    cache = get_render_cache(json_file, words) if words else None
+    speaker_index = get_speaker_index(cache) if cache else None
+    
     # Interactive speaker renaming
-    result = interactive_speaker_rename(transcript_data)
+    result = interactive_speaker_rename(transcript_data, load_speaker_mapping(json_file), speaker_index)
     if result is None:
         return False
     
     new_data, speaker_mapping = result
+    save_speaker_mapping(json_file, speaker_mapping)
+    
+    # Generate SRT and MD files with new speaker names. Only the speaker
+    # headings change, so they are substituted into the cached segments of the
+    # original transcript; this also renames the words for the new JSON.
+    try:
+        relabel_transcript(json_file, new_data['words'], speaker_mapping, srt_file, md_file, cache)
+        print(f"📝 Generated: {srt_file}")
+        print(f"📝 Generated: {md_file}")
+    except Exception as e:
+        print(f"⚠️  Error generating output files: {e}")
     
     # Save the new transcript
     try:
-        with open(new_json_file, 'w') as f:
-            json.dump(new_data, f, indent=2)
+        save_transcript(new_data, new_json_file)
         print(f"\n✅ Saved relabeled transcript: {new_json_file}")
     except Exception as e:
         print(f"❌ Error saving new transcript: {e}")
         return False
     
-    # Generate SRT and MD files with new speaker names
-    words = new_data.get('words', [])
-    if words:
-        try:
-            write_srt(words, srt_file)
-            write_md(words, md_file)
-            print(f"📝 Generated: {srt_file}")
-            print(f"📝 Generated: {md_file}")
-        except Exception as e:
-            print(f"⚠️  Error generating output files: {e}")
-    
     # Show summary
     print("\n📊 RELABELING SUMMARY")
     print("=" * 50)
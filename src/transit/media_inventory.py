@@ -0,0 +1,95 @@
+"""
+Media Inventory - One-pass discovery of media files and their transcripts
+
+Deciding what still needs transcribing used to mean one glob per extension
+(in both cases) plus an existence check on a guessed JSON path for every
+file. The inventory instead lists the input folder and the output folder
+once each with os.scandir and builds an index of every transcript it finds,
+so the cost is one pass over the directory entries, however many there are.
+
+A media file `<name>.<ext>` counts as processed when there is a transcript
+for its base name in either place a run can leave it:
+    <output root>/<name>/<name>.json   (after organizing into a folder)
+    <folder>/<name>.json               (not organized yet)
+The output root is the workbench output folder in workbench mode and the
+input folder itself otherwise, matching organize_files_for_audio.
+"""
+
+import os
+
+def scan_folder(directory, extensions, media, transcripts):
+    """List one folder, collecting media files and the transcripts it contains
+
+    Args:
+        media: List that media file infos are appended to, or None to skip media
+        transcripts: Dict of base name -> transcript JSON path to fill in
+    """
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return
+
+    for entry in entries:
+        base_name, extension = os.path.splitext(entry.name)
+        extension = extension.lower()
+        try:
+            if entry.is_dir():
+                # An organized output folder holds <name>/<name>.json
+                json_file = os.path.join(entry.path, f"{entry.name}.json")
+                if os.path.isfile(json_file):
+                    transcripts.setdefault(entry.name, json_file)
+            elif extension == '.json':
+                transcripts.setdefault(base_name, entry.path)
+            elif media is not None and extension in extensions and entry.is_file():
+                stat = entry.stat()
+                media.append({
+                    'path': entry.path,
+                    'base_name': base_name,
+                    'extension': extension,
+                    'size': stat.st_size,
+                    'mtime': stat.st_mtime
+                })
+        except OSError:
+            # Removed while we were looking
+            continue
+
+def build_inventory(input_dir, output_dir=None, extensions=()):
+    """Take stock of the media files in a folder and of all existing transcripts
+
+    Args:
+        input_dir: Folder with media files
+        output_dir: Folder with one subfolder per processed file, or None when
+            transcripts are organized next to the media (the input folder)
+        extensions: Media extensions to collect (matched case-insensitively)
+
+    Returns:
+        Dict with 'input_dir', 'output_root', 'media' (file infos sorted by
+        path, each with path, base_name, extension, size and mtime) and
+        'transcripts' (base name -> transcript JSON path)
+    """
+    extensions = {ext.lower() for ext in extensions}
+    output_root = output_dir or input_dir
+    media = []
+    transcripts = {}
+    scan_folder(input_dir, extensions, media, transcripts)
+    if os.path.abspath(output_root) != os.path.abspath(input_dir):
+        scan_folder(output_root, extensions, None, transcripts)
+    media.sort(key=lambda file_info: file_info['path'])
+    return {'input_dir': input_dir, 'output_root': output_root, 'media': media, 'transcripts': transcripts}
+
+def find_transcript(inventory, media_file):
+    """Path of the transcript for a media file, or None if it is not processed yet"""
+    base_name = os.path.splitext(os.path.basename(media_file))[0]
+    return inventory['transcripts'].get(base_name)
+
+def mark_processed(inventory, media_file):
+    """Record that a media file now has an organized transcript"""
+    base_name = os.path.splitext(os.path.basename(media_file))[0]
+    inventory['transcripts'][base_name] = os.path.join(inventory['output_root'], base_name, f"{base_name}.json")
+
+def unprocessed_media(inventory, extensions=None):
+    """Media files of an inventory without a transcript, optionally limited to some extensions"""
+    extensions = {ext.lower() for ext in extensions} if extensions is not None else None
+    return [file_info for file_info in inventory['media']
+            if file_info['base_name'] not in inventory['transcripts']
+            and (extensions is None or file_info['extension'] in extensions)]
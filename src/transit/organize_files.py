@@ -14,6 +14,10 @@ def get_related_files(base_name):
         f"{base_name}.mp4", 
         f"{base_name}.json",
         f"{base_name} new_transcript_aai.json",
+        f"{base_name}.words.bin",
+        f"{base_name} new_transcript_aai.words.bin",
+        f"{base_name}.render.json",
+        f"{base_name}.speakers.json",
         f"{base_name} subtitle_aai.srt",
         f"{base_name} screenplay_aai.md",
         f"{base_name} screenplay_navigation.md"
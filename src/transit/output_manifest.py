@@ -0,0 +1,173 @@
+"""
+Output Manifest - Choose which artifacts a transcription run produces
+
+Every processed file always gets its main `<name>.json` transcript. The
+manifest selects everything else: the subtitle and screenplay renderings, the
+binary sidecar, and how the `<name> new_transcript_aai.json` compatibility copy
+is produced. By default that copy is serialized a second time, exactly as
+before. It can instead be copied, hardlinked or reflinked from the main JSON
+(no second encode), or left out and created later on demand ("lazy").
+
+Usage:
+    python -m src.transit.output_manifest materialize [directory]
+"""
+
+import os
+import sys
+import json
+import glob
+import shutil
+import argparse
+
+from .transcript_reader import iter_transcript_events
+
+# Artifacts that can be switched on or off, besides the main JSON
+ARTIFACTS = ('srt', 'md', 'navigation', 'sidecar')
+DEFAULT_ARTIFACTS = ('srt', 'md')
+
+# How the new_transcript_aai.json compatibility copy is produced
+COMPAT_MODES = ('write', 'copy', 'hardlink', 'reflink', 'lazy')
+DEFAULT_COMPAT_MODE = 'write'
+
+COMPAT_SUFFIX = ' new_transcript_aai.json'
+
+# Linux ioctl to share extents between two files (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+def make_manifest(artifacts=DEFAULT_ARTIFACTS, compat_mode=DEFAULT_COMPAT_MODE):
+    """Build an output manifest
+
+    Args:
+        artifacts: Names from ARTIFACTS to produce
+        compat_mode: One of COMPAT_MODES
+
+    Returns:
+        Dict with the set of artifacts and the compatibility copy mode
+    """
+    unknown = set(artifacts) - set(ARTIFACTS)
+    if unknown:
+        raise ValueError(f"Unknown output(s): {', '.join(sorted(unknown))} (choose from {', '.join(ARTIFACTS)})")
+    if compat_mode not in COMPAT_MODES:
+        raise ValueError(f"Unknown compatibility copy mode: {compat_mode}")
+    return {'artifacts': frozenset(artifacts), 'compat_mode': compat_mode}
+
+DEFAULT_MANIFEST = make_manifest()
+
+def parse_artifacts(text):
+    """Parse a comma-separated artifact list such as 'srt,md,sidecar'"""
+    return [name.strip() for name in text.split(',') if name.strip()]
+
+def get_compat_path(json_file):
+    """Path of the compatibility copy for a main transcript JSON"""
+    base, _ = os.path.splitext(json_file)
+    return f"{base}{COMPAT_SUFFIX}"
+
+def reflink(source, destination):
+    """Clone a file's data without copying it, where the filesystem supports it"""
+    import fcntl
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+def link_or_copy(source, destination, mode):
+    """Create `destination` from `source` as a hardlink, reflink or plain copy
+
+    Hardlinks and reflinks fall back to a plain copy when the filesystem or
+    platform does not support them.
+
+    Returns:
+        The mode that was actually used
+    """
+    if os.path.lexists(destination):
+        # Never write through an existing hardlink into the source
+        os.remove(destination)
+    try:
+        if mode == 'hardlink':
+            os.link(source, destination)
+            return mode
+        if mode == 'reflink':
+            reflink(source, destination)
+            return mode
+    except (OSError, ImportError):
+        if os.path.exists(destination):
+            os.remove(destination)
+    shutil.copyfile(source, destination)
+    return 'copy'
+
+def write_compat_copy(json_file, transcript_data, mode):
+    """Produce the new_transcript_aai.json copy of a freshly written main JSON
+
+    Returns:
+        (path of the copy, mode actually used), or (None, 'lazy') in lazy mode
+    """
+    compat_file = get_compat_path(json_file)
+    if mode == 'lazy':
+        return None, mode
+    if mode == 'write':
+        if os.path.lexists(compat_file):
+            os.remove(compat_file)
+        with open(compat_file, 'w') as f:
+            json.dump(transcript_data, f, indent=2)
+        return compat_file, mode
+    return compat_file, link_or_copy(json_file, compat_file, mode)
+
+def ensure_compat_copy(json_file, mode='hardlink'):
+    """Create the compatibility copy for a main JSON if it does not exist yet
+
+    Returns:
+        True if a copy was created
+    """
+    compat_file = get_compat_path(json_file)
+    if os.path.exists(compat_file):
+        return False
+    link_or_copy(json_file, compat_file, mode)
+    return True
+
+def is_transcript_json(json_file):
+    """Check whether a JSON file is a transcript (has a top-level words array)"""
+    try:
+        for kind, _, _ in iter_transcript_events(json_file):
+            if kind == 'words':
+                return True
+    except ValueError:
+        pass
+    return False
+
+def find_main_transcripts(directory):
+    """Find main transcript JSON files in a directory and its subfolders"""
+    candidates = glob.glob(os.path.join(directory, '*.json')) + glob.glob(os.path.join(directory, '*', '*.json'))
+    return sorted(f for f in candidates if not f.endswith(COMPAT_SUFFIX) and is_transcript_json(f))
+
+def materialize(directory, mode='hardlink'):
+    """Create missing compatibility copies for every transcript under a directory"""
+    created = 0
+    for json_file in find_main_transcripts(directory):
+        if ensure_compat_copy(json_file, mode):
+            created += 1
+            print(f"📄 Created: {get_compat_path(json_file)}")
+    print(f"✅ Created {created} compatibility cop{'y' if created == 1 else 'ies'}")
+    return created
+
+def parse_arguments(argv):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Manage optional Transit output artifacts")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    materialize_parser = subparsers.add_parser(
+        'materialize', help="Create new_transcript_aai.json copies skipped with --compat-json lazy")
+    materialize_parser.add_argument('directory', nargs='?', default=None,
+                                    help="Folder to scan, including one level of subfolders "
+                                         "(default: workbench/output if it exists, else the current folder)")
+    materialize_parser.add_argument('--mode', choices=['hardlink', 'reflink', 'copy'], default='hardlink',
+                                    help="How to create the copies (default: hardlink)")
+    return parser.parse_args(argv)
+
+def main():
+    args = parse_arguments(sys.argv[1:])
+    if args.command == 'materialize':
+        directory = args.directory
+        if directory is None:
+            from .batch_process import OUTPUT_DIR
+            directory = OUTPUT_DIR if os.path.exists(OUTPUT_DIR) else "."
+        materialize(directory, args.mode)
+
+if __name__ == "__main__":
+    main()
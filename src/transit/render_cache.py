@@ -0,0 +1,236 @@
+"""
+Render Cache - Speaker-independent SRT and Markdown structures for relabeling
+
+Renaming speakers changes nothing but the speaker headings in the subtitle
+and screenplay files. The segmentation, timings and wrapped text stay the
+same as long as no two speakers end up with the same name. The render cache
+stores those parts once, next to the transcript as `<name>.render.json`, with
+every segment pointing at a speaker code. Relabeling then only substitutes
+the new names into the cached segments, without re-segmenting any words.
+
+The cache also holds a per-speaker index (word count, talk time, first
+appearance and the positions of preview samples) collected in the same single
+pass, so label_speakers can show statistics and previews right away.
+
+The speaker names chosen for a transcript are kept in a small
+`<name>.speakers.json` mapping, keyed by the original labels.
+"""
+
+import os
+import json
+from array import array
+
+from .rendering import (
+    milliseconds_to_hms,
+    group_words_into_segments,
+    iter_md_turns,
+    speaker_heading,
+    srt_timing,
+    srt_body,
+    write_srt,
+    write_md
+)
+from .transcript_sidecar import json_signature
+from .word_store import rename_word_speakers, word_rows
+
+RENDER_CACHE_SUFFIX = '.render.json'
+SPEAKER_MAPPING_SUFFIX = '.speakers.json'
+RENDER_CACHE_VERSION = 2
+
+# Preview samples per speaker, and words per sample
+PREVIEW_SAMPLES = 3
+PREVIEW_SAMPLE_WORDS = 20
+
+def get_base_path(json_file):
+    """Transcript path without its .json extension"""
+    base, ext = os.path.splitext(json_file)
+    return base if ext.lower() == '.json' else json_file
+
+def get_render_cache_path(json_file):
+    """Path of the render cache belonging to a transcript JSON file"""
+    return f"{get_base_path(json_file)}{RENDER_CACHE_SUFFIX}"
+
+def get_speaker_mapping_path(json_file):
+    """Path of the speaker mapping belonging to a transcript JSON file"""
+    return f"{get_base_path(json_file)}{SPEAKER_MAPPING_SUFFIX}"
+
+def sample_positions(positions, num_samples=PREVIEW_SAMPLES, words_per_sample=PREVIEW_SAMPLE_WORDS):
+    """Pick evenly spread runs of a speaker's word positions for previews
+
+    A speaker with at most words_per_sample words gets one sample with all of
+    them.
+    """
+    total_words = len(positions)
+    if total_words <= words_per_sample:
+        return [positions.tolist()]
+    if num_samples == 1:
+        starts = [0]
+    else:
+        step = (total_words - words_per_sample) // (num_samples - 1)
+        starts = [i * step for i in range(num_samples)]
+    return [positions[start:start + words_per_sample].tolist() for start in starts]
+
+def build_speaker_index(words, num_samples=PREVIEW_SAMPLES, words_per_sample=PREVIEW_SAMPLE_WORDS):
+    """Collect per-speaker statistics and preview positions in one pass over the words
+
+    Talk time adds up the speaker's turns (first word start to last word end of
+    each run of consecutive words), so long silences and other speakers'
+    turns in between are not counted.
+
+    Returns:
+        Dict of speaker label -> {'word_count', 'talk_ms', 'first_start',
+        'samples'}, in order of first appearance. Each sample is a list of word
+        indices.
+    """
+    positions = {}
+    talk_ms = {}
+    first_starts = {}
+    run_speaker = no_speaker = object()
+    run_start = run_end = 0
+
+    for index, (_, start, end, speaker) in enumerate(word_rows(words)):
+        if speaker != run_speaker:
+            if run_speaker is not no_speaker:
+                talk_ms[run_speaker] += run_end - run_start
+            if speaker not in positions:
+                positions[speaker] = array('I')
+                talk_ms[speaker] = 0
+                first_starts[speaker] = start
+            run_speaker = speaker
+            run_start = start
+        positions[speaker].append(index)
+        run_end = end
+
+    if run_speaker is not no_speaker:
+        talk_ms[run_speaker] += run_end - run_start
+
+    return {speaker: {'word_count': len(speaker_positions),
+                      'talk_ms': talk_ms[speaker],
+                      'first_start': first_starts[speaker],
+                      'samples': sample_positions(speaker_positions, num_samples, words_per_sample)}
+            for speaker, speaker_positions in positions.items()}
+
+def build_render_cache(words):
+    """Segment a transcript once into its speaker-independent SRT and Markdown parts
+
+    Returns:
+        Dict with the original speaker labels, the speaker index (aligned with
+        the labels), SRT segments as [speaker code, timing line, wrapped text]
+        and Markdown turns as [speaker code, timecode, text]
+    """
+    speaker_index = build_speaker_index(words)
+    speakers = list(speaker_index)
+    codes = {label: code for code, label in enumerate(speakers)}
+
+    srt = [[codes[segment['speaker']], srt_timing(segment), srt_body(segment['text'])]
+           for segment in group_words_into_segments(words, include_words=False)]
+    md = [[codes[speaker], milliseconds_to_hms(start), text] for speaker, start, text in iter_md_turns(words)]
+
+    return {'version': RENDER_CACHE_VERSION, 'speakers': speakers,
+            'speaker_index': [speaker_index[label] for label in speakers], 'srt': srt, 'md': md}
+
+def get_speaker_index(cache):
+    """Speaker index of a render cache as a dict of speaker label -> stats"""
+    return dict(zip(cache['speakers'], cache['speaker_index']))
+
+def load_render_cache(json_file):
+    """Load the render cache of a transcript, or None if missing or out of date"""
+    try:
+        with open(get_render_cache_path(json_file), 'r') as f:
+            cache = json.load(f)
+        signature = list(json_signature(json_file))
+    except (OSError, ValueError):
+        return None
+    if cache.get('version') != RENDER_CACHE_VERSION or cache.get('signature') != signature:
+        return None
+    return cache
+
+def save_render_cache(json_file, cache):
+    """Write the render cache, stamped with the size and mtime of its JSON"""
+    cache = dict(cache, signature=list(json_signature(json_file)))
+    cache_path = get_render_cache_path(json_file)
+    temp_path = f"{cache_path}.tmp"
+    try:
+        with open(temp_path, 'w') as f:
+            json.dump(cache, f)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"⚠️  Could not write render cache for {json_file}: {e}")
+
+def get_render_cache(json_file, words):
+    """Load the render cache of a transcript, building and saving it if needed
+
+    `words` must be the words of `json_file` with their original labels.
+    """
+    cache = load_render_cache(json_file)
+    if cache is None:
+        cache = build_render_cache(words)
+        save_render_cache(json_file, cache)
+    return cache
+
+def is_relabel_safe(cache, mapping):
+    """Check that a mapping keeps every speaker distinct
+
+    Merging two speakers under one name joins their segments and turns, which
+    the cached structures cannot represent.
+    """
+    names = [mapping.get(label, label) for label in cache['speakers']]
+    return len(set(names)) == len(names)
+
+def render_cached_srt(cache, mapping):
+    """Render SRT text from a render cache with renamed speakers"""
+    headings = [speaker_heading(mapping.get(label, label)) for label in cache['speakers']]
+    return ''.join(f"{counter}\n{timing}\n[{headings[code]}]\n{body}\n"
+                   for counter, (code, timing, body) in enumerate(cache['srt'], 1))
+
+def render_cached_md(cache, mapping):
+    """Render screenplay Markdown from a render cache with renamed speakers"""
+    headings = [speaker_heading(mapping.get(label, label)) for label in cache['speakers']]
+    return ''.join(f"{headings[code]} ({timecode}):\n{text}\n\n" for code, timecode, text in cache['md'])
+
+def load_speaker_mapping(json_file):
+    """Load the speaker names chosen for a transcript ({} if none were saved)"""
+    try:
+        with open(get_speaker_mapping_path(json_file), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_speaker_mapping(json_file, mapping):
+    """Save the speaker names chosen for a transcript"""
+    with open(get_speaker_mapping_path(json_file), 'w') as f:
+        json.dump(mapping, f, indent=2)
+
+def relabel_transcript(json_file, words, mapping, srt_file=None, md_file=None, cache=None):
+    """Rename speakers in place and write SRT and/or Markdown with the new names
+
+    The outputs are rendered from the render cache of `json_file` when the
+    mapping keeps all speakers distinct, and from the renamed words otherwise.
+
+    Args:
+        json_file: Transcript the words were loaded from
+        words: Its words with their original labels (list or WordStore)
+        mapping: Dict of original label -> new name
+        cache: Render cache of `json_file`, if already loaded
+
+    Returns:
+        True if the outputs were rendered from the cache
+    """
+    if cache is None:
+        cache = get_render_cache(json_file, words)
+    rename_word_speakers(words, mapping)
+
+    if not is_relabel_safe(cache, mapping):
+        if srt_file:
+            write_srt(words, srt_file)
+        if md_file:
+            write_md(words, md_file)
+        return False
+
+    if srt_file:
+        with open(srt_file, 'w') as f:
+            f.write(render_cached_srt(cache, mapping))
+    if md_file:
+        with open(md_file, 'w') as f:
+            f.write(render_cached_md(cache, mapping))
+    return True
@@ -0,0 +1,378 @@
+"""
+Rendering - Shared transcript rendering for all Transit entry points
+
+Turns AssemblyAI word lists into SRT subtitles, natural speaker-turn
+screenplays and fixed-duration navigation screenplays. batch_process,
+transcribe_pipeline, processor_aai and label_speakers all render through
+this module, so there is a single code path to optimize and profile.
+
+Every renderer accepts either a list of word dicts or a columnar WordStore.
+"""
+
+import textwrap
+import itertools
+from operator import itemgetter
+from collections.abc import Sequence
+
+from .word_store import WordStore, word_rows
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; segmenting falls back to pure Python
+    np = None
+
+# SRT subtitle line width
+SRT_LINE_WIDTH = 65
+
+# Subtitle segments rendered per write when streaming words
+SRT_WRITE_BATCH = 1000
+
+def seconds_to_hms(seconds):
+    hours = seconds // 3600
+    seconds %= 3600
+    minutes = seconds // 60
+    seconds %= 60
+    return f"{int(hours):02d}:{int(minutes):02d}:{int(seconds):02d}"
+
+def milliseconds_to_hms(milliseconds):
+    """Convert milliseconds to HH:MM:SS format"""
+    seconds = milliseconds / 1000
+    return seconds_to_hms(seconds)
+
+def milliseconds_to_srt_time(milliseconds):
+    """Convert milliseconds to SRT timestamp format (HH:MM:SS,mmm)"""
+    total_seconds = milliseconds / 1000
+    hours = int(total_seconds // 3600)
+    minutes = int((total_seconds % 3600) // 60)
+    seconds = int(total_seconds % 60)
+    ms = int(milliseconds % 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{ms:03d}"
+
+def segment_start_indices_python(words, max_gap_ms=2000, max_words_per_segment=15):
+    """Find the index of the first word of every subtitle segment, one word at a time
+    
+    A new segment starts when the speaker changes, when the gap to the previous
+    word exceeds max_gap_ms, or when the current segment is full.
+    """
+    rows = word_rows(words)
+    _, _, current_end, current_speaker = next(rows)
+    starts = [0]
+    
+    for index, (_, start, end, speaker) in enumerate(rows, 1):
+        if (speaker != current_speaker or start - current_end > max_gap_ms
+                or index - starts[-1] >= max_words_per_segment):
+            starts.append(index)
+            current_speaker = speaker
+        current_end = end
+    
+    return starts
+
+def word_columns_numpy(words):
+    """Get start, end and speaker columns of a word list as NumPy arrays"""
+    if isinstance(words, WordStore):
+        starts, ends, codes = words.numpy_columns()
+        # Renaming can give two codes the same label, so compare one code per label
+        canonical = np.array(words.canonical_speaker_codes(), dtype=np.uint32)
+        return starts, ends, canonical[codes]
+    count = len(words)
+    starts = np.fromiter(map(itemgetter('start'), words), dtype=np.float64, count=count)
+    ends = np.fromiter(map(itemgetter('end'), words), dtype=np.float64, count=count)
+    speakers = np.array([word['speaker'] for word in words], dtype=object)
+    return starts, ends, speakers
+
+def segment_start_indices_numpy(words, max_gap_ms=2000, max_words_per_segment=15):
+    """Find the index of the first word of every subtitle segment with NumPy
+    
+    Speaker changes and long gaps are found for all words at once. Every run of
+    words between two such breaks is then cut every max_words_per_segment
+    words, which is where the word-by-word scan would start a new segment.
+    """
+    starts, ends, speakers = word_columns_numpy(words)
+    
+    hard_breaks = (speakers[1:] != speakers[:-1]) | (starts[1:] - ends[:-1] > max_gap_ms)
+    run_starts = np.concatenate(([0], np.flatnonzero(hard_breaks) + 1))
+    run_lengths = np.diff(np.append(run_starts, len(starts)))
+    
+    # Each run of n words gets (n - 1) // max_words_per_segment extra cuts
+    cut_counts = (run_lengths - 1) // max_words_per_segment
+    total_cuts = int(cut_counts.sum())
+    if total_cuts == 0:
+        return run_starts.tolist()
+    cut_runs = np.repeat(run_starts, cut_counts)
+    cut_numbers = np.arange(1, total_cuts + 1) - np.repeat(np.cumsum(cut_counts) - cut_counts, cut_counts)
+    cuts = cut_runs + cut_numbers * max_words_per_segment
+    
+    return np.sort(np.concatenate((run_starts, cuts))).tolist()
+
+def segment_start_indices(words, max_gap_ms=2000, max_words_per_segment=15):
+    """Find the index of the first word of every subtitle segment
+    
+    Uses the vectorized NumPy path when NumPy is installed, otherwise the
+    word-by-word scan. Both return the same indices.
+    """
+    if np is not None:
+        return segment_start_indices_numpy(words, max_gap_ms, max_words_per_segment)
+    return segment_start_indices_python(words, max_gap_ms, max_words_per_segment)
+
+def segment_text(words, first, last):
+    """Join the texts of words[first:last] into one line"""
+    if isinstance(words, WordStore):
+        return words.join_text(first, last)
+    return ' '.join([w['text'] for w in words[first:last]])
+
+def group_words_into_segments(words, max_gap_ms=2000, max_words_per_segment=15, include_words=True):
+    """Group words into segments based on time gaps and word count
+    
+    Set include_words=False to leave out each segment's word list when only
+    its speaker, times and text are needed.
+    """
+    if not words:
+        return []
+    
+    starts = segment_start_indices(words, max_gap_ms, max_words_per_segment)
+    
+    segments = []
+    for first, last in zip(starts, starts[1:] + [len(words)]):
+        first_word = words[first]
+        segment = {'words': words[first:last]} if include_words else {}
+        segment['speaker'] = first_word['speaker']
+        segment['start'] = first_word['start']
+        segment['end'] = words[last - 1]['end']
+        segment['text'] = segment_text(words, first, last)
+        segments.append(segment)
+    
+    return segments
+
+def iter_segments(words, max_gap_ms=2000, max_words_per_segment=15):
+    """Yield subtitle segments from any iterable of words, one at a time
+    
+    Splits exactly like group_words_into_segments, but only ever holds the
+    current segment, so words can come straight from a streaming reader.
+    Segments have speaker, start, end and text.
+    """
+    segment_texts = []
+    for text, start, end, speaker in word_rows(words):
+        if segment_texts and (speaker != current_speaker or start - current_end > max_gap_ms
+                              or len(segment_texts) >= max_words_per_segment):
+            yield {'speaker': current_speaker, 'start': current_start, 'end': current_end,
+                   'text': ' '.join(segment_texts)}
+            segment_texts = []
+        if not segment_texts:
+            current_speaker = speaker
+            current_start = start
+        segment_texts.append(text)
+        current_end = end
+    
+    if segment_texts:
+        yield {'speaker': current_speaker, 'start': current_start, 'end': current_end,
+               'text': ' '.join(segment_texts)}
+
+def speaker_heading(speaker):
+    """Speaker label as written in SRT and Markdown output"""
+    return speaker.strip().upper()
+
+def srt_timing(segment):
+    """SRT timing line of a subtitle segment"""
+    return f"{milliseconds_to_srt_time(segment['start'])} --> {milliseconds_to_srt_time(segment['end'])}"
+
+def srt_body(text):
+    """Wrap subtitle text into SRT lines, each ending in a newline"""
+    return ''.join(f"{line}\n" for line in textwrap.wrap(text, SRT_LINE_WIDTH))
+
+def render_srt(segments, first_counter=1):
+    """Render subtitle segments as SRT text"""
+    parts = []
+    for counter, segment in enumerate(segments, first_counter):
+        parts.append(f"{counter}\n{srt_timing(segment)}\n[{speaker_heading(segment['speaker'])}]\n")
+        parts.append(srt_body(segment['text']))
+        parts.append("\n")
+    return ''.join(parts)
+
+def write_srt(words, file_name):
+    """Write SRT file from AssemblyAI words data
+    
+    `words` is a list of word dicts, a WordStore, or any iterable of word
+    dicts; iterables are rendered in batches without being held in memory.
+    """
+    if not isinstance(words, Sequence):
+        with open(file_name, 'w') as file:
+            counter = 1
+            for batch in iter_batches(iter_segments(words), SRT_WRITE_BATCH):
+                file.write(render_srt(batch, counter))
+                counter += len(batch)
+        return
+    
+    segments = group_words_into_segments(words, include_words=False)
+    
+    with open(file_name, 'w') as file:
+        file.write(render_srt(segments))
+
+def iter_batches(items, size):
+    """Yield lists of up to `size` items from an iterable"""
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def is_sentence_boundary(text):
+    """Check if text ends with sentence boundary punctuation"""
+    return text.strip().endswith(('.', '!', '?'))
+
+def iter_md_turns(words):
+    """Yield the (speaker, start, text) turns of the natural screenplay
+    
+    A turn ends when the speaker changes, or at the first sentence end once a
+    monologue runs longer than 45 seconds. `words` may be any iterable of word
+    dicts (or a WordStore); only the current turn is held in memory.
+    """
+    rows = word_rows(words)
+    first_row = next(rows, None)
+    if first_row is None:
+        return
+    
+    _, current_start, _, current_speaker = first_row
+    current_words = []
+    # Last non-whitespace character of the current turn, tracked per word so
+    # long monologues are not re-joined on every word to find sentence ends
+    current_tail = ''
+    
+    for text, start, end, speaker in itertools.chain([first_row], rows):
+        # Check if speaker changed
+        if speaker != current_speaker:
+            # Emit current speaker's turn
+            if current_words:
+                yield current_speaker, current_start, ' '.join(current_words)
+            
+            # Start new speaker turn
+            current_speaker = speaker
+            current_words = [text]
+            current_start = start
+            current_tail = text.rstrip()[-1:]
+        else:
+            # Same speaker - check if we need to break long monologue
+            current_words.append(text)
+            current_tail = text.rstrip()[-1:] or current_tail
+            
+            # Check if current monologue exceeds 45 seconds
+            current_duration = (end - current_start) / 1000  # Convert to seconds
+            if current_duration > 45:
+                # Look for sentence boundary to break
+                if is_sentence_boundary(current_tail):
+                    yield current_speaker, current_start, ' '.join(current_words)
+                    
+                    # Start new segment for same speaker
+                    current_words = []
+                    current_tail = ''
+                    current_start = end  # Start from end of last word
+    
+    # Emit final speaker turn
+    if current_words:
+        yield current_speaker, current_start, ' '.join(current_words)
+
+def write_md(words, file_name):
+    """Write natural speaker-turn Markdown file from AssemblyAI words data
+    
+    `words` may be any iterable of word dicts (or a WordStore); only the
+    current speaker turn is held in memory.
+    """
+    turns = iter_md_turns(words)
+    first_turn = next(turns, None)
+    if first_turn is None:
+        return
+    
+    with open(file_name, 'w') as file:
+        for speaker, start, text in itertools.chain([first_turn], turns):
+            file.write(f"{speaker_heading(speaker)} ({milliseconds_to_hms(start)}):\n{text}\n\n")
+
+def group_words_into_navigation_segments(words, segment_duration_ms=45000):
+    """
+    Group words into fixed-duration segments for navigation purposes
+    
+    Args:
+        words: List of word objects with start, end, text, speaker
+        segment_duration_ms: Duration of each segment in milliseconds (default: 45 seconds)
+    
+    Returns:
+        List of segments with consistent duration for easy navigation
+    """
+    if not words:
+        return []
+    
+    segments = []
+    
+    # Get the total duration
+    start_time = words[0]['start']
+    end_time = words[-1]['end']
+    
+    # Bucket words by the fixed window their start time falls in, in one pass.
+    # Words keep their original order within a window.
+    windows = {}
+    for text, start, end, speaker in word_rows(words):
+        if start_time <= start < end_time:
+            index = (start - start_time) // segment_duration_ms
+            windows.setdefault(index, []).append((text, speaker))
+    
+    for index in sorted(windows):
+        segment_words = windows[index]
+        current_time = start_time + index * segment_duration_ms
+        segment_end = min(current_time + segment_duration_ms, end_time)
+        
+        # Build segment text with speaker changes indicated
+        segment_text_parts = []
+        current_speaker = None
+        current_speaker_text = []
+        
+        for text, speaker in segment_words:
+            if speaker != current_speaker:
+                # Speaker changed, save previous speaker's text
+                if current_speaker is not None and current_speaker_text:
+                    speaker_line = f"{current_speaker.upper()}: {' '.join(current_speaker_text)}"
+                    segment_text_parts.append(speaker_line)
+                
+                # Start new speaker
+                current_speaker = speaker
+                current_speaker_text = [text]
+            else:
+                current_speaker_text.append(text)
+        
+        # Add final speaker's text
+        if current_speaker is not None and current_speaker_text:
+            speaker_line = f"{current_speaker.upper()}: {' '.join(current_speaker_text)}"
+            segment_text_parts.append(speaker_line)
+        
+        segment = {
+            'start': current_time,
+            'end': segment_end,
+            'duration_seconds': (segment_end - current_time) / 1000,
+            'text': '\n\n'.join(segment_text_parts),
+            'word_count': len(segment_words),
+            'speakers': list(set(speaker for _, speaker in segment_words))
+        }
+        
+        segments.append(segment)
+    
+    return segments
+
+def write_navigation_screenplay(words, file_name, segment_duration_seconds=45):
+    """Write navigation-friendly screenplay with fixed-duration segments"""
+    segment_duration_ms = segment_duration_seconds * 1000
+    segments = group_words_into_navigation_segments(words, segment_duration_ms)
+    
+    with open(file_name, 'w') as file:
+        file.write(f"# Navigation Screenplay ({segment_duration_seconds}s segments)\n\n")
+        file.write(f"Total segments: {len(segments)}\n")
+        file.write(f"Total duration: {milliseconds_to_hms(words[-1]['end'] - words[0]['start']) if words else '0:00:00'}\n\n")
+        file.write("---\n\n")
+        
+        for i, segment in enumerate(segments, 1):
+            start_time = milliseconds_to_hms(segment['start'])
+            end_time = milliseconds_to_hms(segment['end'])
+            duration = f"{segment['duration_seconds']:.1f}s"
+            speakers = ', '.join(segment['speakers'])
+            
+            file.write(f"## Segment {i} ({start_time} - {end_time}) [{duration}]\n")
+            file.write(f"**Speakers:** {speakers} | **Words:** {segment['word_count']}\n\n")
+            file.write(f"{segment['text']}\n\n")
+            file.write("---\n\n")
@@ -1,233 +1,39 @@
 import assemblyai as aai
-import json
 import os
+import sys
 import glob
 import time
 import shutil
+import argparse
 from pathlib import Path
 
-# Import the processor functions - we'll define them here to avoid import issues
-import copy
-import textwrap
+from .rendering import (
+    milliseconds_to_hms,
+    group_words_into_segments,
+    write_srt,
+    write_md
+)
+from .transcript_sidecar import load_transcript, save_transcript, SIDECAR_SUFFIX
+from .render_cache import RENDER_CACHE_SUFFIX, SPEAKER_MAPPING_SUFFIX
+from .word_store import rename_word_speakers
+from .transcription_backends import (
+    make_backend,
+    wait_for_job,
+    RetryingBackend,
+    add_backend_arguments,
+    backend_from_arguments,
+    DEFAULT_BACKEND,
+    STATUS_ERROR
+)
 
-def seconds_to_hms(seconds):
-    hours = seconds // 3600
-    seconds %= 3600
-    minutes = seconds // 60
-    seconds %= 60
-    return f"{int(hours):02d}:{int(minutes):02d}:{int(seconds):02d}"
-
-def milliseconds_to_hms(milliseconds):
-    """Convert milliseconds to HH:MM:SS format"""
-    seconds = milliseconds / 1000
-    return seconds_to_hms(seconds)
-
-def milliseconds_to_srt_time(milliseconds):
-    """Convert milliseconds to SRT timestamp format (HH:MM:SS,mmm)"""
-    total_seconds = milliseconds / 1000
-    hours = int(total_seconds // 3600)
-    minutes = int((total_seconds % 3600) // 60)
-    seconds = int(total_seconds % 60)
-    ms = int(milliseconds % 1000)
-    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{ms:03d}"
-
-def group_words_into_segments(words, max_gap_ms=2000, max_words_per_segment=15):
-    """Group words into segments based on time gaps and word count"""
-    if not words:
-        return []
-    
-    segments = []
-    current_segment = {
-        'words': [words[0]],
-        'speaker': words[0]['speaker'],
-        'start': words[0]['start'], 
-        'end': words[0]['end']
-    }
-    
-    for word in words[1:]:
-        time_gap = word['start'] - current_segment['end']
-        speaker_changed = word['speaker'] != current_segment['speaker']
-        segment_too_long = len(current_segment['words']) >= max_words_per_segment
-        
-        if speaker_changed or time_gap > max_gap_ms or segment_too_long:
-            # Finalize current segment
-            current_segment['text'] = ' '.join([w['text'] for w in current_segment['words']])
-            segments.append(current_segment)
-            
-            # Start new segment
-            current_segment = {
-                'words': [word],
-                'speaker': word['speaker'],
-                'start': word['start'],
-                'end': word['end']
-            }
-        else:
-            # Add word to current segment
-            current_segment['words'].append(word)
-            current_segment['end'] = word['end']
-    
-    # Add final segment
-    if current_segment['words']:
-        current_segment['text'] = ' '.join([w['text'] for w in current_segment['words']])
-        segments.append(current_segment)
-    
-    return segments
-
-def write_srt(words, file_name):
-    """Write SRT file from AssemblyAI words data"""
-    segments = group_words_into_segments(words)
-    
-    counter = 1
-    with open(file_name, 'w') as file:
-        for segment in segments:
-            start_time = milliseconds_to_srt_time(segment['start'])
-            end_time = milliseconds_to_srt_time(segment['end'])
-            speaker = segment['speaker'].strip()
-            text = segment['text']
-            
-            file.write(f"{counter}\n")
-            file.write(f"{start_time} --> {end_time}\n")
-            file.write(f"[{speaker.upper()}]\n")
-            for line in textwrap.wrap(text, 65):
-                file.write(f"{line}\n")
-            file.write("\n")
-            counter += 1
-
-def is_sentence_boundary(text):
-    """Check if text ends with sentence boundary punctuation"""
-    return text.strip().endswith(('.', '!', '?'))
-
-def write_md(words, file_name):
-    """Write natural speaker-turn Markdown file from AssemblyAI words data"""
-    if not words:
-        return
-    
-    with open(file_name, 'w') as file:
-        current_speaker = words[0]['speaker']
-        current_words = []
-        current_start = words[0]['start']
-        
-        for word in words:
-            # Check if speaker changed
-            if word['speaker'] != current_speaker:
-                # Write current speaker's turn
-                if current_words:
-                    speaker = current_speaker.strip()
-                    timecode = milliseconds_to_hms(current_start)
-                    text = ' '.join(current_words)
-                    file.write(f"{speaker.upper()} ({timecode}):\n{text}\n\n")
-                
-                # Start new speaker turn
-                current_speaker = word['speaker']
-                current_words = [word['text']]
-                current_start = word['start']
-            else:
-                # Same speaker - check if we need to break long monologue
-                current_words.append(word['text'])
-                
-                # Check if current monologue exceeds 45 seconds
-                current_duration = (word['end'] - current_start) / 1000  # Convert to seconds
-                if current_duration > 45:
-                    # Look for sentence boundary to break
-                    current_text = ' '.join(current_words)
-                    if is_sentence_boundary(current_text):
-                        # Write current segment
-                        speaker = current_speaker.strip()
-                        timecode = milliseconds_to_hms(current_start)
-                        file.write(f"{speaker.upper()} ({timecode}):\n{current_text}\n\n")
-                        
-                        # Start new segment for same speaker
-                        current_words = []
-                        current_start = word['end']  # Start from end of last word
-        
-        # Write final speaker turn
-        if current_words:
-            speaker = current_speaker.strip()
-            timecode = milliseconds_to_hms(current_start)
-            text = ' '.join(current_words)
-            file.write(f"{speaker.upper()} ({timecode}):\n{text}\n\n")
-
-def group_words_into_navigation_segments(words, segment_duration_ms=45000):
-    """
-    Group words into fixed-duration segments for navigation purposes
-    """
-    if not words:
-        return []
-    
-    segments = []
-    start_time = words[0]['start']
-    end_time = words[-1]['end']
-    current_time = start_time
-    
-    while current_time < end_time:
-        segment_end = min(current_time + segment_duration_ms, end_time)
-        
-        # Find words in this time range
-        segment_words = []
-        for word in words:
-            if word['start'] >= current_time and word['start'] < segment_end:
-                segment_words.append(word)
-        
-        if segment_words:
-            # Build segment text with speaker changes indicated
-            segment_text_parts = []
-            current_speaker = None
-            current_speaker_text = []
-            
-            for word in segment_words:
-                if word['speaker'] != current_speaker:
-                    # Speaker changed, save previous speaker's text
-                    if current_speaker is not None and current_speaker_text:
-                        speaker_line = f"{current_speaker.upper()}: {' '.join(current_speaker_text)}"
-                        segment_text_parts.append(speaker_line)
-                    
-                    # Start new speaker
-                    current_speaker = word['speaker']
-                    current_speaker_text = [word['text']]
-                else:
-                    current_speaker_text.append(word['text'])
-            
-            # Add final speaker's text
-            if current_speaker is not None and current_speaker_text:
-                speaker_line = f"{current_speaker.upper()}: {' '.join(current_speaker_text)}"
-                segment_text_parts.append(speaker_line)
-            
-            segment = {
-                'start': current_time,
-                'end': segment_end,
-                'duration_seconds': (segment_end - current_time) / 1000,
-                'text': '\n\n'.join(segment_text_parts),
-                'word_count': len(segment_words),
-                'speakers': list(set(word['speaker'] for word in segment_words))
-            }
-            
-            segments.append(segment)
-        
-        current_time = segment_end
-    
-    return segments
-
-def write_navigation_screenplay(words, file_name, segment_duration_seconds=45):
-    """Write navigation-friendly screenplay with fixed-duration segments"""
-    segment_duration_ms = segment_duration_seconds * 1000
-    segments = group_words_into_navigation_segments(words, segment_duration_ms)
-    
-    with open(file_name, 'w') as file:
-        file.write(f"# Navigation Screenplay ({segment_duration_seconds}s segments)\n\n")
-        file.write(f"Total segments: {len(segments)}\n")
-        file.write(f"Total duration: {milliseconds_to_hms(words[-1]['end'] - words[0]['start']) if words else '0:00:00'}\n\n")
-        file.write("---\n\n")
-        
-        for i, segment in enumerate(segments, 1):
-            start_time = milliseconds_to_hms(segment['start'])
-            end_time = milliseconds_to_hms(segment['end'])
-            duration = f"{segment['duration_seconds']:.1f}s"
-            speakers = ', '.join(segment['speakers'])
-            
-            file.write(f"## Segment {i} ({start_time} - {end_time}) [{duration}]\n")
-            file.write(f"**Speakers:** {speakers} | **Words:** {segment['word_count']}\n\n")
-            file.write(f"{segment['text']}\n\n")
-            file.write("---\n\n")
+# Transcription with speaker labels and the best model
+TRANSCRIPTION_SETTINGS = {
+    'speaker_labels': True,
+    'format_text': True,
+    'punctuate': True,
+    'speech_model': 'best',
+    'language_detection': True,
+}
 
 def setup_api_key():
     """Setup AssemblyAI API key from environment or user input"""
@@ -255,6 +61,10 @@ def organize_files_for_audio(audio_file):
         f"{base_name}.mp4", 
         f"{base_name}.json",
         f"{base_name} new_transcript_aai.json",
+        f"{base_name}{SIDECAR_SUFFIX}",
+        f"{base_name} new_transcript_aai{SIDECAR_SUFFIX}",
+        f"{base_name}{RENDER_CACHE_SUFFIX}",
+        f"{base_name}{SPEAKER_MAPPING_SUFFIX}",
         f"{base_name} subtitle_aai.srt",
         f"{base_name} screenplay_aai.md"
     ]
@@ -306,57 +116,30 @@ def get_processed_files():
         processed.add(f"{base_name}.mp3")
     return processed
 
-def transcribe_audio(audio_file, output_json):
-    """Transcribe audio file using AssemblyAI"""
+def transcribe_audio(audio_file, output_json, backend=None):
+    """Transcribe audio file using AssemblyAI (or another transcription backend)"""
     print(f"Starting transcription of: {audio_file}")
     start_time = time.time()
     
-    # Create transcriber with speaker diarization
-    transcriber = aai.Transcriber()
-    
-    # Configure transcription with speaker labels and best model
-    config = aai.TranscriptionConfig(
-        speaker_labels=True,
-        format_text=True,
-        punctuate=True,
-        speech_model=aai.SpeechModel.best,
-        language_detection=True,
-    )
+    # Speaker diarization with the best model unless another backend was chosen;
+    # transient API failures are retried
+    backend = RetryingBackend(backend or make_backend())
     
     try:
-        # Submit audio for transcription
-        transcript = transcriber.transcribe(audio_file, config=config)
+        # Submit audio for transcription and wait for the result
+        job_id = backend.submit(audio_file, TRANSCRIPTION_SETTINGS)
+        job = wait_for_job(backend, job_id)
         
         # Check for errors
-        if transcript.error:
-            print(f"Transcription error: {transcript.error}")
+        if job['status'] == STATUS_ERROR:
+            print(f"Transcription error: {job['error']}")
             return False
             
-        # Save transcript data as JSON - use getattr for optional attributes
-        transcript_data = {
-            'id': getattr(transcript, 'id', 'unknown'),
-            'text': getattr(transcript, 'text', ''),
-            'words': [],
-            'status': 'completed',
-            'audio_url': audio_file,
-            'language_code': getattr(transcript, 'language_code', 'en'),
-        }
-        
-        # Add words with speaker labels if available
-        if hasattr(transcript, 'words') and transcript.words:
-            for word in transcript.words:
-                word_data = {
-                    'text': word.text,
-                    'start': word.start,
-                    'end': word.end,
-                    'confidence': word.confidence,
-                    'speaker': word.speaker if hasattr(word, 'speaker') else 'A'
-                }
-                transcript_data['words'].append(word_data)
+        # Transcript data with words and speaker labels
+        transcript_data = backend.result(job_id, audio_file)
         
         # Save JSON file
-        with open(output_json, 'w') as f:
-            json.dump(transcript_data, f, indent=2)
+        save_transcript(transcript_data, output_json)
             
         # Calculate processing time
         total_time = time.time() - start_time
@@ -377,7 +160,7 @@ def rename_speakers_interactive(words):
         return {}
     
     # Group words into segments for better speaker preview
-    segments = group_words_into_segments(words)
+    segments = group_words_into_segments(words, include_words=False)
     
     # Find unique speakers and show examples
     speaker_examples = {}
@@ -407,8 +190,7 @@ def process_transcript(json_file, base_name):
     print(f"Processing transcript: {json_file}")
     
     try:
-        with open(json_file, 'r') as f:
-            data = json.load(f)
+        data = load_transcript(json_file)
         
         words = data.get('words', [])
         if not words:
@@ -420,18 +202,14 @@ def process_transcript(json_file, base_name):
         
         # Apply speaker name changes
         if speaker_mapping:
-            for word in words:
-                if word['speaker'] in speaker_mapping:
-                    word['speaker'] = speaker_mapping[word['speaker']]
+            rename_word_speakers(words, speaker_mapping)
             
             # Save updated main JSON
-            with open(json_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            save_transcript(data, json_file)
             
             # Save processed version with new naming
             processed_json = f"{base_name} new_transcript_aai.json"
-            with open(processed_json, 'w') as f:
-                json.dump(data, f, indent=2)
+            save_transcript(data, processed_json)
             print(f"Updated speaker names in {json_file}")
             print(f"Saved processed version: {processed_json}")
         
@@ -454,16 +232,26 @@ def process_transcript(json_file, base_name):
         print(f"Error processing transcript: {str(e)}")
         return False
 
+def parse_arguments(argv):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Transcribe MP3 files in the current folder and label speakers")
+    add_backend_arguments(parser)
+    args = parser.parse_args(argv)
+    args.engine = backend_from_arguments(parser, args)
+    return args
+
 def main():
     """Main pipeline function"""
+    args = parse_arguments(sys.argv[1:])
     print("=== AssemblyAI Transcription & Processing Pipeline ===")
     
     # Setup API key
-    try:
-        setup_api_key()
-    except Exception as e:
-        print(f"API key setup failed: {e}")
-        return
+    if args.backend == DEFAULT_BACKEND:
+        try:
+            setup_api_key()
+        except Exception as e:
+            print(f"API key setup failed: {e}")
+            return
     
     # Find MP3 files
     mp3_files = find_mp3_files()
@@ -488,7 +276,7 @@ def main():
         print(f"{'='*50}")
         
         # Step 1: Transcribe audio
-        if transcribe_audio(mp3_file, json_file):
+        if transcribe_audio(mp3_file, json_file, args.engine):
             # Step 2: Process transcript (speaker renaming + output generation)
             process_transcript(json_file, base_name)
         else:
@@ -0,0 +1,87 @@
+"""
+Transcript Cache - Local content-addressed cache of finished transcripts
+
+Transcripts are stored under a key derived from the audio bytes and the
+transcription settings, so renamed or re-dropped recordings are served from
+disk instead of being uploaded and paid for again. The cache is size bounded:
+once it grows past its limit the least recently used transcripts are evicted.
+"""
+
+import json
+import os
+import hashlib
+import threading
+
+CACHE_DIRNAME = 'cache'
+DEFAULT_MAX_CACHE_MB = 1024
+
+def make_cache_key(content_hash, settings):
+    """Build a cache key from the audio content hash and transcription settings"""
+    settings_json = json.dumps(settings, sort_keys=True)
+    return hashlib.sha256(f"{content_hash}:{settings_json}".encode('utf-8')).hexdigest()
+
+class TranscriptCache:
+    """Size-bounded LRU cache of transcript JSON files in a directory"""
+
+    def __init__(self, directory, max_size_mb=DEFAULT_MAX_CACHE_MB):
+        self.directory = directory
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """Return the cached transcript data for a key, or None on a miss"""
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                transcript_data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Touch the entry so eviction treats it as recently used
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return transcript_data
+
+    def put(self, key, transcript_data):
+        """Store transcript data under a key and evict old entries if needed"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(transcript_data, f, separators=(',', ':'))
+        os.replace(temp_path, path)
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits its size limit"""
+        with self._lock:
+            entries = []
+            total_size = 0
+            try:
+                with os.scandir(self.directory) as it:
+                    for entry in it:
+                        if not entry.name.endswith('.json') or not entry.is_file():
+                            continue
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                        total_size += stat.st_size
+            except OSError:
+                return 0
+
+            removed = 0
+            entries.sort()
+            for mtime, size, path in entries:
+                if total_size <= self.max_size_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total_size -= size
+                    removed += 1
+                except OSError:
+                    pass
+            return removed
@@ -0,0 +1,193 @@
+"""
+Transcript Reader - Stream words out of transcript JSON files
+
+json.load builds the whole transcript tree at once, and a copy of it doubles
+that again. The reader here walks the top-level object incrementally and
+decodes the `words` array one word at a time, so a multi-hour transcript can
+be rendered or loaded into a compact WordStore without the full tree ever
+existing in memory. write_transcript streams a transcript back out in the
+same layout as json.dump(..., indent=2).
+"""
+
+import os
+import re
+import json
+
+from .word_store import WordStore
+from .rendering import write_srt, write_md
+
+READ_CHUNK_SIZE = 64 * 1024
+WRITE_BATCH_WORDS = 1000
+
+WHITESPACE_RE = re.compile(r'[ \t\n\r]*')
+NUMBER_CONTINUATION = '0123456789.eE+-'
+
+class JsonStream:
+    """Incremental JSON tokenizer over a text file, decoding one value at a time"""
+
+    def __init__(self, file, chunk_size=READ_CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self, size=None):
+        """Read more text, dropping what has already been consumed"""
+        data = self.file.read(size or self.chunk_size)
+        if not data:
+            self.eof = True
+            return
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it ('' at the end)"""
+        while True:
+            self.pos = WHITESPACE_RE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos:self.pos + 1]
+            self.fill()
+
+    def expect(self, characters):
+        """Consume the next non-whitespace character, which must be one of `characters`"""
+        char = self.peek()
+        if not char or char not in characters:
+            raise ValueError(f"Expected one of {characters!r} in transcript JSON, found {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next complete JSON value"""
+        self.peek()
+        read_size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number followed by the buffer end (or by what could be the
+                # rest of it, like '.' or 'e') may have been cut off by a read
+                if self.eof or end < len(self.buffer) and self.buffer[end] not in NUMBER_CONTINUATION:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Grow reads geometrically so one huge value is not re-scanned per chunk
+            self.fill(read_size)
+            read_size *= 2
+
+def iter_transcript_events(json_file, chunk_size=READ_CHUNK_SIZE):
+    """Walk a transcript JSON file in document order
+
+    Yields:
+        ('field', key, value) for every top-level field except `words`,
+        ('words', None, None) where the `words` array starts, then
+        ('word', None, word) for each word in it
+    """
+    with open(json_file, 'r') as f:
+        stream = JsonStream(f, chunk_size)
+        stream.expect('{')
+        if stream.peek() == '}':
+            return
+
+        while True:
+            key = stream.value()
+            stream.expect(':')
+            if key == 'words' and stream.peek() == '[':
+                stream.expect('[')
+                yield ('words', None, None)
+                if stream.peek() == ']':
+                    stream.expect(']')
+                else:
+                    while True:
+                        yield ('word', None, stream.value())
+                        if stream.expect(',]') == ']':
+                            break
+            else:
+                yield ('field', key, stream.value())
+
+            if stream.expect(',}') == '}':
+                return
+
+def iter_words(json_file, chunk_size=READ_CHUNK_SIZE):
+    """Yield the word dicts of a transcript JSON file one at a time"""
+    for kind, _, value in iter_transcript_events(json_file, chunk_size):
+        if kind == 'word':
+            yield value
+
+def read_transcript(json_file):
+    """Load a transcript with its words in a compact WordStore
+
+    Returns the same dict json.load would, except that `words` is a WordStore.
+    Words are decoded and stored one at a time, so the list of word dicts is
+    never built.
+    """
+    events = iter_transcript_events(json_file)
+    transcript_data = {}
+    for kind, key, value in events:
+        if kind == 'field':
+            transcript_data[key] = value
+        elif kind == 'words':
+            # The remaining word events go straight into the store
+            pending = []
+            store = WordStore.from_words(word_events(events, pending))
+            transcript_data['words'] = store
+            for _, key, value in pending:
+                transcript_data[key] = value
+    return transcript_data
+
+def word_events(events, pending):
+    """Yield word dicts from an event stream, collecting any later fields into `pending`"""
+    for event in events:
+        if event[0] == 'word':
+            yield event[2]
+        else:
+            pending.append(event)
+
+def indent_json(value, level):
+    """Serialize a value the way json.dump(indent=2) would at a nesting level"""
+    return json.dumps(value, indent=2).replace('\n', '\n' + '  ' * level)
+
+def write_transcript(transcript_data, file_name):
+    """Write transcript data as indented JSON, streaming the words array
+
+    Produces the same bytes as json.dump(transcript_data, f, indent=2) and
+    works whether `words` is a list of dicts or a WordStore. The file is
+    replaced atomically, so a hardlinked copy of it is never written through.
+    """
+    temp_path = f"{file_name}.tmp"
+    with open(temp_path, 'w') as f:
+        f.write('{')
+        for position, (key, value) in enumerate(transcript_data.items()):
+            f.write(',\n  ' if position else '\n  ')
+            f.write(f"{json.dumps(key)}: ")
+            if key == 'words' and isinstance(value, (list, WordStore)) and len(value):
+                write_words_array(f, value)
+            else:
+                f.write(indent_json([] if isinstance(value, WordStore) else value, 1))
+        f.write('\n}' if transcript_data else '}')
+    os.replace(temp_path, file_name)
+
+def write_words_array(f, words):
+    """Write a non-empty words array at the first nesting level, in batches"""
+    f.write('[')
+    batch = []
+    for index, word in enumerate(words):
+        batch.append(('\n    ' if index == 0 else ',\n    ') + indent_json(dict(word), 2))
+        if len(batch) >= WRITE_BATCH_WORDS:
+            f.write(''.join(batch))
+            batch = []
+    f.write(''.join(batch))
+    f.write('\n  ]')
+
+def render_transcript_file(json_file, srt_file=None, md_file=None):
+    """Render SRT and/or Markdown straight from a transcript JSON file
+
+    Each output streams the words from disk, so memory stays bounded by a
+    single subtitle segment or speaker turn regardless of transcript length.
+    """
+    if srt_file:
+        write_srt(iter_words(json_file), srt_file)
+    if md_file:
+        write_md(iter_words(json_file), md_file)
@@ -0,0 +1,151 @@
+"""
+Transcript Sidecar - Compact binary copy of a transcript JSON for fast reloads
+
+Next to `<name>.json` a `<name>.words.bin` file can hold the same transcript
+as a WordStore: a small header, the other top-level fields as JSON, and the
+word columns as 8-byte aligned raw arrays. Loading memory-maps the file and
+uses the columns in place, so relabeling or re-rendering a long transcript
+takes milliseconds instead of a full JSON parse.
+
+The header records the size and modification time of the JSON it was built
+from. When the JSON changes, the sidecar no longer matches and is ignored
+(and rewritten on the next save).
+"""
+
+import os
+import json
+import mmap
+import struct
+
+from .word_store import WordStore
+from .transcript_reader import read_transcript, write_transcript
+
+SIDECAR_SUFFIX = '.words.bin'
+SIDECAR_MAGIC = b'TRWS'
+SIDECAR_VERSION = 1
+
+# magic, version, JSON size, JSON mtime (ns), word count, text bytes, metadata bytes
+HEADER = struct.Struct('<4sIQqQQQ')
+
+def get_sidecar_path(json_file):
+    """Path of the sidecar belonging to a transcript JSON file"""
+    base, ext = os.path.splitext(json_file)
+    return f"{base if ext.lower() == '.json' else json_file}{SIDECAR_SUFFIX}"
+
+def json_signature(json_file):
+    """Size and modification time used to tell whether a JSON file changed"""
+    stat = os.stat(json_file)
+    return stat.st_size, stat.st_mtime_ns
+
+def padding(length):
+    """Bytes needed to pad a section to an 8-byte boundary"""
+    return -length % 8
+
+def write_sidecar(json_file, transcript_data):
+    """Write the sidecar for a transcript that has just been saved as JSON
+
+    Args:
+        json_file: The JSON file the sidecar belongs to (must already be written)
+        transcript_data: The same transcript data, with words as a list or WordStore
+    """
+    words = transcript_data.get('words') or []
+    store = words if isinstance(words, WordStore) else WordStore.from_words(words)
+    fields = [[key, None if key == 'words' else value] for key, value in transcript_data.items()]
+    metadata = json.dumps({
+        'fields': fields,
+        'speakers': store.speakers,
+        'extras': {str(index): extra for index, extra in store.extras.items()}
+    }).encode('utf-8')
+    text = store.text.encode('utf-8')
+
+    size, mtime_ns = json_signature(json_file)
+    header = HEADER.pack(SIDECAR_MAGIC, SIDECAR_VERSION, size, mtime_ns, len(store), len(text), len(metadata))
+
+    sidecar_path = get_sidecar_path(json_file)
+    temp_path = f"{sidecar_path}.tmp"
+    with open(temp_path, 'wb') as f:
+        for section in (header, metadata, text):
+            f.write(section)
+            f.write(b'\0' * padding(len(section)))
+        for column in (store.starts, store.ends, store.confidences, store.speaker_codes, store.offsets):
+            data = memoryview(column).cast('B')
+            f.write(data)
+            f.write(b'\0' * padding(len(data)))
+    os.replace(temp_path, sidecar_path)
+    return sidecar_path
+
+def load_sidecar(json_file):
+    """Load a transcript from its sidecar
+
+    Returns:
+        Transcript data with words as a memory-mapped WordStore, or None if there
+        is no sidecar or it is out of date with the JSON file
+    """
+    sidecar_path = get_sidecar_path(json_file)
+    try:
+        signature = json_signature(json_file)
+        with open(sidecar_path, 'rb') as f:
+            # Copy-on-write mapping: edits to the store never reach the file
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (OSError, ValueError):
+        return None
+
+    if len(mapping) < HEADER.size:
+        return None
+    magic, version, size, mtime_ns, count, text_length, metadata_length = HEADER.unpack_from(mapping)
+    if magic != SIDECAR_MAGIC or version != SIDECAR_VERSION or (size, mtime_ns) != signature:
+        return None
+
+    view = memoryview(mapping)
+    position = HEADER.size + padding(HEADER.size)
+
+    def section(length):
+        nonlocal position
+        data = view[position:position + length]
+        position += length + padding(length)
+        return data
+
+    metadata = json.loads(bytes(section(metadata_length)))
+    text = str(section(text_length), 'utf-8')
+    starts = section(8 * count).cast('q')
+    ends = section(8 * count).cast('q')
+    confidences = section(8 * count).cast('d')
+    speaker_codes = section(4 * count).cast('I')
+    offsets = section(8 * (count + 1)).cast('Q')
+
+    extras = {int(index): extra for index, extra in metadata['extras'].items()}
+    store = WordStore(starts, ends, confidences, speaker_codes, metadata['speakers'], text, offsets, extras)
+    return {key: store if key == 'words' else value for key, value in metadata['fields']}
+
+def load_transcript(json_file):
+    """Load a transcript, from its sidecar when that is up to date
+
+    Falls back to streaming the JSON. A stale sidecar is rebuilt so the next
+    load is fast again.
+    """
+    transcript_data = load_sidecar(json_file)
+    if transcript_data is not None:
+        return transcript_data
+
+    transcript_data = read_transcript(json_file)
+    if os.path.exists(get_sidecar_path(json_file)):
+        save_sidecar(json_file, transcript_data)
+    return transcript_data
+
+def save_sidecar(json_file, transcript_data):
+    """Write a sidecar, warning instead of failing since the JSON is authoritative"""
+    try:
+        write_sidecar(json_file, transcript_data)
+    except OSError as e:
+        print(f"⚠️  Could not write transcript sidecar for {json_file}: {e}")
+
+def save_transcript(transcript_data, json_file, sidecar=None):
+    """Write a transcript JSON file and keep its sidecar in step
+
+    Args:
+        sidecar: True to always write a sidecar, False to never write one, None
+            to refresh a sidecar only if the file already has one
+    """
+    write_transcript(transcript_data, json_file)
+    if sidecar or (sidecar is None and os.path.exists(get_sidecar_path(json_file))):
+        save_sidecar(json_file, transcript_data)
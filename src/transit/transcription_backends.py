@@ -0,0 +1,394 @@
+"""
+Transcription Backends - Pluggable engines behind the transcription pipeline
+
+A backend turns a media file into the transcript_data dict that is written
+to disk ('id', 'text', 'words', 'status', 'audio_url', 'language_code').
+Every backend offers the same three calls:
+    submit(audio_file, settings, open_stream=None) -> job ID
+    poll(job_id) -> {'status': 'queued'|'processing'|'completed'|'error', 'error': message or None}
+    result(job_id, audio_file) -> transcript_data of a completed job
+
+"assemblyai" is the real service. "mock" is a deterministic local engine:
+it makes up a realistic word and speaker stream whose length follows the
+file size, and completes after a configurable latency. It makes no network
+calls and needs no API key, so the batch pipeline can be load tested
+offline at any scale.
+
+RetryingBackend wraps either one so that transient failures (dropped
+connections, timeouts, 429 and 5xx responses) are retried with backoff.
+"""
+
+import os
+import time
+import random
+import hashlib
+import threading
+
+import assemblyai as aai
+
+from .async_client import next_poll_interval, POLL_INITIAL_SECONDS, STATUS_COMPLETED, STATUS_ERROR
+from .job_scheduler import (
+    RetryBudget,
+    make_retry_policy,
+    call_with_retries,
+    classify_error,
+    DEFAULT_UPLOAD_RETRIES,
+    DEFAULT_POLL_RETRIES
+)
+
+BACKENDS = ('assemblyai', 'mock')
+DEFAULT_BACKEND = 'assemblyai'
+
+# Job state reported by poll() while a job runs (besides STATUS_COMPLETED and STATUS_ERROR)
+STATUS_PROCESSING = 'processing'
+
+# Mock engine defaults
+DEFAULT_MOCK_LATENCY_SECONDS = 2.0
+MOCK_LATENCY_JITTER = 0.25
+MOCK_BYTES_PER_SECOND = 16000  # 128 kbps audio
+MOCK_MIN_DURATION_MS = 2000
+MOCK_WORDS_PER_MINUTE = 150
+MOCK_JOB_PREFIX = 'mock-'
+
+MOCK_VOCABULARY = (
+    "the of and to in is that it for on with as was this be are by at from we you they "
+    "about ethics model data people think really system question because so but what "
+    "research language future important actually responsibility society know right "
+    "decision machine learning transparency fairness regulation mean just like when"
+).split()
+MOCK_BACKCHANNELS = ('Yeah.', 'Right.', 'Mm-hmm.', 'Exactly.', 'Okay.', 'Sure.', 'Interesting.')
+
+def mock_words(seed, duration_ms, speakers=2, words_per_minute=MOCK_WORDS_PER_MINUTE):
+    """Make up a deterministic conversation lasting about `duration_ms`
+
+    Speakers take turns of varying length (some talk more than others), with
+    sentence punctuation, pauses between sentences and turns, and the odd
+    short backchannel ("Yeah.") from a listener.
+
+    Returns:
+        List of word dicts with text, start, end, confidence and speaker
+    """
+    rng = random.Random(seed)
+    labels = [chr(ord('A') + i % 26) * (1 + i // 26) for i in range(speakers)]
+    weights = [rng.uniform(0.5, 2.0) for _ in labels]
+    mean_word_ms = 60000 / words_per_minute
+    words = []
+    time_ms = rng.randint(200, 1500)
+    speaker = 0
+
+    def add_word(text, label):
+        nonlocal time_ms
+        duration = max(80, int(rng.gauss(mean_word_ms * 0.75, mean_word_ms * 0.2)))
+        words.append({
+            'text': text,
+            'start': time_ms,
+            'end': time_ms + duration,
+            'confidence': round(rng.betavariate(12, 1), 3),
+            'speaker': label
+        })
+        time_ms += duration
+
+    while time_ms < duration_ms:
+        sentence_left = rng.randint(4, 24)
+        new_sentence = True
+        for _ in range(max(1, int(rng.expovariate(1 / 45)))):
+            if time_ms >= duration_ms:
+                break
+            text = rng.choice(MOCK_VOCABULARY)
+            if new_sentence:
+                text = text.capitalize()
+                new_sentence = False
+            sentence_left -= 1
+            if sentence_left <= 0:
+                text += rng.choice('....?!')
+                sentence_left = rng.randint(4, 24)
+                new_sentence = True
+            elif rng.random() < 0.06:
+                text += ','
+            add_word(text, labels[speaker])
+            time_ms += rng.randint(250, 700) if new_sentence else rng.randint(0, int(mean_word_ms * 0.35))
+
+        # A turn always ends a sentence
+        if words[-1]['text'][-1] not in '.?!':
+            words[-1]['text'] = words[-1]['text'].rstrip(',') + '.'
+
+        if speakers > 1:
+            others = [i for i in range(speakers) if i != speaker]
+            listener = rng.choices(others, [weights[i] for i in others])[0]
+            time_ms += rng.randint(150, 1200)
+            if rng.random() < 0.2 and time_ms < duration_ms:
+                # A listener chimes in, then the speaker carries on
+                add_word(rng.choice(MOCK_BACKCHANNELS), labels[listener])
+                time_ms += rng.randint(150, 600)
+            else:
+                speaker = listener
+
+    return words
+
+def wait_for_job(backend, job_id):
+    """Poll a job until it completes or fails, backing off while it runs
+
+    Returns:
+        The final poll() result
+    """
+    interval = getattr(backend, 'poll_seconds', POLL_INITIAL_SECONDS)
+    while True:
+        job = backend.poll(job_id)
+        if job['status'] in (STATUS_COMPLETED, STATUS_ERROR):
+            return job
+        time.sleep(interval)
+        interval = next_poll_interval(interval)
+
+class AssemblyAIBackend:
+    """The AssemblyAI transcription service, through its SDK"""
+
+    name = 'assemblyai'
+    poll_seconds = POLL_INITIAL_SECONDS
+
+    def __init__(self):
+        # Completed transcripts fetched by poll(), handed out once by result()
+        self.transcripts = {}
+        self.lock = threading.Lock()
+
+    def submit(self, audio_file, settings, open_stream=None):
+        """Upload a file (or an AudioStream from open_stream()) and submit its job"""
+        settings = dict(settings)
+        settings['speech_model'] = getattr(aai.SpeechModel, settings['speech_model'])
+        config = aai.TranscriptionConfig(**settings)
+
+        transcriber = aai.Transcriber()
+        if open_stream is not None:
+            print("📤 Streaming upload...")
+            with open_stream() as stream:
+                upload_url = transcriber.upload_file(stream)
+            print(f"📤 Uploaded {stream.bytes_read / (1024 * 1024):.1f} MB without an intermediate file")
+        else:
+            print("📤 Uploading audio...")
+            with open(audio_file, 'rb') as f:
+                upload_url = transcriber.upload_file(f)
+
+        # Upload failures may be retried as they are; a submit that may have
+        # reached the service must not be, or the job could be created twice
+        print("📤 Submitting transcription job...")
+        try:
+            transcript = transcriber.submit(upload_url, config=config)
+        except Exception as e:
+            if classify_error(e, idempotent=False)[0]:
+                raise
+            raise RuntimeError(f"Submission failed: {e}") from e
+
+        error_msg = getattr(transcript, 'error', None)
+        if error_msg:
+            raise RuntimeError(f"Submission failed: {error_msg}")
+        return transcript.id
+
+    def fetch(self, job_id):
+        """Fetch the current state of a job with a single request
+
+        aai.Transcript.get_by_id waits for the job to finish, which would
+        leave polling, its backoff and its retries to the SDK.
+        """
+        return aai.api.get_transcript(aai.Client.get_default().http_client, job_id)
+
+    def poll(self, job_id):
+        transcript = self.fetch(job_id)
+        error_msg = getattr(transcript, 'error', None)
+        status = str(getattr(transcript, 'status', '') or '').lower()
+        status = status.rsplit('.', 1)[-1]  # TranscriptStatus.completed -> completed
+        if error_msg or status in ('error', 'failed'):
+            return {'status': STATUS_ERROR, 'error': str(error_msg or status)}
+        if status == STATUS_COMPLETED:
+            with self.lock:
+                self.transcripts[job_id] = transcript
+            return {'status': STATUS_COMPLETED, 'error': None}
+        return {'status': status or STATUS_PROCESSING, 'error': None}
+
+    def result(self, job_id, audio_file):
+        with self.lock:
+            transcript = self.transcripts.pop(job_id, None)
+        if transcript is None:
+            transcript = self.fetch(job_id)
+        return transcript_data_from_sdk(transcript, audio_file)
+
+class MockBackend:
+    """Deterministic offline engine with configurable latency
+
+    The same file (name and size) always gets the same transcript. The job
+    ID encodes everything needed to rebuild it, so a job left in flight can
+    be collected by a later run, like a real one.
+    """
+
+    name = 'mock'
+
+    def __init__(self, latency_seconds=DEFAULT_MOCK_LATENCY_SECONDS, speakers=None, seed=0, error_rate=0.0):
+        """
+        Args:
+            latency_seconds: Time from submit until a job completes (varied by
+                up to 25% per file)
+            speakers: Number of speakers in every transcript, or None to pick
+                2-4 per file
+            seed: Seed mixed into every file's transcript
+            error_rate: Share of jobs that end with an error
+        """
+        self.latency_seconds = latency_seconds
+        self.speakers = speakers
+        self.seed = seed
+        self.error_rate = error_rate
+        self.poll_seconds = min(POLL_INITIAL_SECONDS, max(0.01, latency_seconds / 4))
+        # job ID -> time.monotonic() at which it completes
+        self.ready_at = {}
+        self.lock = threading.Lock()
+
+    def submit(self, audio_file, settings, open_stream=None):
+        if open_stream is not None:
+            with open_stream() as stream:
+                for _ in stream:
+                    pass
+            size = stream.bytes_read
+        else:
+            size = os.path.getsize(audio_file)
+
+        name = os.path.basename(audio_file)
+        digest = hashlib.sha256(f"{self.seed}:{name}:{size}".encode('utf-8')).hexdigest()[:16]
+        rng = random.Random(digest)
+        duration_ms = max(MOCK_MIN_DURATION_MS, size * 1000 // MOCK_BYTES_PER_SECOND)
+        speakers = self.speakers or rng.randint(2, 4)
+        job_id = f"{MOCK_JOB_PREFIX}{digest}-{duration_ms}-{speakers}"
+
+        latency = self.latency_seconds * (1 + rng.uniform(-MOCK_LATENCY_JITTER, MOCK_LATENCY_JITTER))
+        with self.lock:
+            self.ready_at[job_id] = time.monotonic() + latency
+        print(f"🧪 Submitted mock job for {name} ({duration_ms / 60000:.1f} min, {speakers} speakers)")
+        return job_id
+
+    def poll(self, job_id):
+        with self.lock:
+            ready_at = self.ready_at.get(job_id, 0)
+        if time.monotonic() < ready_at:
+            return {'status': STATUS_PROCESSING, 'error': None}
+        digest = job_id[len(MOCK_JOB_PREFIX):].split('-')[0]
+        if random.Random(f"error:{digest}").random() < self.error_rate:
+            return {'status': STATUS_ERROR, 'error': "Mock transcription failure"}
+        return {'status': STATUS_COMPLETED, 'error': None}
+
+    def result(self, job_id, audio_file):
+        digest, duration_ms, speakers = job_id[len(MOCK_JOB_PREFIX):].split('-')
+        words = mock_words(digest, int(duration_ms), int(speakers))
+        return {
+            'id': job_id,
+            'text': ' '.join(word['text'] for word in words),
+            'words': words,
+            'status': 'completed',
+            'audio_url': audio_file,
+            'language_code': 'en',
+        }
+
+class RetryingBackend:
+    """Wrap a backend so transient submit and poll failures are retried with backoff
+
+    Like JobScheduler does for the asyncio client, every job gets one
+    retry budget for submitting (upload included) and one for polling and
+    fetching the result.
+    """
+
+    def __init__(self, backend, upload_policy=None, poll_policy=None):
+        self.backend = backend
+        self.name = backend.name
+        self.poll_seconds = getattr(backend, 'poll_seconds', POLL_INITIAL_SECONDS)
+        self.upload_policy = upload_policy or make_retry_policy(DEFAULT_UPLOAD_RETRIES)
+        self.poll_policy = poll_policy or make_retry_policy(DEFAULT_POLL_RETRIES)
+        # job ID -> poll budget, kept until the job is collected
+        self.poll_budgets = {}
+        # Retries made so far, per phase
+        self.retries = {'upload': 0, 'poll': 0}
+        self.lock = threading.Lock()
+
+    def call(self, budget, label, func, *args):
+        used = budget.used
+        try:
+            return call_with_retries(budget, label, func, *args)
+        finally:
+            with self.lock:
+                self.retries[budget.phase] += budget.used - used
+
+    def poll_budget(self, job_id):
+        with self.lock:
+            return self.poll_budgets.setdefault(job_id, RetryBudget('poll', self.poll_policy))
+
+    def submit(self, audio_file, settings, open_stream=None):
+        budget = RetryBudget('upload', self.upload_policy)
+        return self.call(budget, os.path.basename(audio_file), self.backend.submit, audio_file, settings, open_stream)
+
+    def poll(self, job_id):
+        try:
+            job = self.call(self.poll_budget(job_id), job_id, self.backend.poll, job_id)
+        except Exception:
+            self.poll_budgets.pop(job_id, None)
+            raise
+        if job['status'] == STATUS_ERROR:
+            self.poll_budgets.pop(job_id, None)
+        return job
+
+    def result(self, job_id, audio_file):
+        try:
+            return self.call(self.poll_budget(job_id), job_id, self.backend.result, job_id, audio_file)
+        finally:
+            self.poll_budgets.pop(job_id, None)
+
+def transcript_data_from_sdk(transcript, audio_file):
+    """Convert an AssemblyAI SDK transcript into the JSON structure written to disk"""
+    # Use getattr for optional attributes
+    transcript_data = {
+        'id': getattr(transcript, 'id', 'unknown'),
+        'text': getattr(transcript, 'text', ''),
+        'words': [],
+        'status': 'completed',
+        'audio_url': audio_file,
+        'language_code': getattr(transcript, 'language_code', 'en'),
+    }
+
+    # Add words with speaker labels
+    if hasattr(transcript, 'words') and transcript.words:
+        for word in transcript.words:
+            transcript_data['words'].append({
+                'text': word.text,
+                'start': word.start,
+                'end': word.end,
+                'confidence': word.confidence,
+                'speaker': word.speaker if hasattr(word, 'speaker') else 'A'
+            })
+
+    return transcript_data
+
+def make_backend(name=DEFAULT_BACKEND, **options):
+    """Create a backend by name; options go to the backend's constructor"""
+    if name == 'assemblyai':
+        return AssemblyAIBackend()
+    if name == 'mock':
+        return MockBackend(**options)
+    raise ValueError(f"Unknown backend: {name} (choose from {', '.join(BACKENDS)})")
+
+def add_backend_arguments(parser):
+    """Add --backend and the mock engine options to an argument parser"""
+    parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help=f"Transcription engine; 'mock' runs offline without an API key "
+                             f"(default: {DEFAULT_BACKEND})")
+    parser.add_argument('--mock-latency', type=float, default=DEFAULT_MOCK_LATENCY_SECONDS,
+                        help=f"Seconds until a mock job completes (default: {DEFAULT_MOCK_LATENCY_SECONDS:g})")
+    parser.add_argument('--mock-speakers', type=int, default=None,
+                        help="Speakers per mock transcript (default: 2-4, varying by file)")
+    parser.add_argument('--mock-error-rate', type=float, default=0.0,
+                        help="Share of mock jobs that fail (default: 0)")
+    parser.add_argument('--mock-seed', type=int, default=0,
+                        help="Seed for mock transcripts (default: 0)")
+
+def backend_from_arguments(parser, args):
+    """Create the backend selected on the command line, reporting bad options via parser.error"""
+    if args.mock_latency < 0 or not 0 <= args.mock_error_rate <= 1 or \
+            (args.mock_speakers is not None and args.mock_speakers < 1):
+        parser.error("--mock-latency must be non-negative, --mock-error-rate between 0 and 1 "
+                     "and --mock-speakers at least 1")
+    if args.backend == 'mock':
+        return make_backend('mock', latency_seconds=args.mock_latency, speakers=args.mock_speakers,
+                            seed=args.mock_seed, error_rate=args.mock_error_rate)
+    return make_backend(args.backend)
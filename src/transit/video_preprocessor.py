@@ -5,11 +5,16 @@ Handles large video files by extracting audio before transcription
 """
 
 import os
-import glob
+import json
 import subprocess
+import tempfile
 import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from .media_inventory import build_inventory, find_transcript
+
 # Maximum file size for AssemblyAI (490 MB)
 MAX_FILE_SIZE_MB = 490
 MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
@@ -18,6 +23,68 @@ MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
 VIDEO_EXTENSIONS = ['.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv', '.wmv', '.m4v']
 AUDIO_EXTENSIONS = ['.mp3', '.wav', '.m4a', '.aac', '.flac', '.ogg']
 
+# Number of ffmpeg extractions run at the same time
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+# Audio extraction profiles
+# The speech profiles produce much smaller uploads; speech recognition
+# does not benefit from more than 16 kHz mono.
+EXTRACTION_PROFILES = {
+    'standard': {
+        'extension': '.mp3',
+        'args': ['-acodec', 'mp3', '-ab', '192k', '-ar', '44100'],
+        'description': '192 kbps 44.1 kHz MP3 (previous default)'
+    },
+    'speech-mp3': {
+        'extension': '.mp3',
+        'args': ['-acodec', 'mp3', '-ab', '48k', '-ar', '16000', '-ac', '1'],
+        'description': '48 kbps 16 kHz mono MP3'
+    },
+    'speech-opus': {
+        'extension': '.ogg',
+        'args': ['-acodec', 'libopus', '-b:a', '24k', '-ar', '16000', '-ac', '1', '-application', 'voip'],
+        'description': '24 kbps 16 kHz mono Opus'
+    },
+    'speech-flac': {
+        'extension': '.flac',
+        'args': ['-acodec', 'flac', '-ar', '16000', '-ac', '1'],
+        'description': 'Lossless 16 kHz mono FLAC'
+    },
+    'copy': {
+        'extension': None,  # Depends on the source codec
+        'args': ['-acodec', 'copy'],
+        'description': 'Copy the audio stream without re-encoding'
+    }
+}
+DEFAULT_PROFILE = 'standard'
+AUTO_PROFILE = 'auto'
+AUTO_FALLBACK_PROFILE = 'speech-mp3'
+
+# Source audio codecs that can be stream-copied, and the container they are copied into
+COPY_CODEC_EXTENSIONS = {
+    'mp3': '.mp3',
+    'aac': '.m4a',
+    'opus': '.ogg',
+    'vorbis': '.ogg',
+    'flac': '.flac',
+    'pcm_s16le': '.wav'
+}
+
+# Formats ffmpeg can write to a pipe, by extraction output extension
+# (MP4/M4A needs a seekable output, so copied AAC is streamed as raw ADTS)
+STREAM_FORMATS = {
+    '.mp3': ('mp3', '.mp3'),
+    '.ogg': ('ogg', '.ogg'),
+    '.flac': ('flac', '.flac'),
+    '.m4a': ('adts', '.aac'),
+    '.wav': ('wav', '.wav')
+}
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Print extraction progress every this many percent (or minutes of media when the duration is unknown)
+PROGRESS_STEP_PERCENT = 10
+PROGRESS_STEP_UNKNOWN_MS = 10 * 60 * 1000
+
 def get_file_size_mb(filepath):
     """Get file size in MB"""
     size_bytes = os.path.getsize(filepath)
@@ -31,36 +98,170 @@ def check_ffmpeg():
     except (subprocess.CalledProcessError, FileNotFoundError):
         return False
 
-def extract_audio(input_file, output_file):
-    """Extract audio from video file using ffmpeg"""
+def get_media_duration_ms(media_file):
+    """Get the duration of a media file in milliseconds using ffprobe"""
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-show_entries', 'format=duration',
+        '-of', 'json',
+        media_file
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe failed: {result.stderr.strip()}")
+    duration = json.loads(result.stdout).get('format', {}).get('duration')
+    if duration is None:
+        raise RuntimeError(f"Could not determine duration of {media_file}")
+    return int(float(duration) * 1000)
+
+def probe_media(media_file):
+    """Inspect a media file with ffprobe
+
+    Returns:
+        Dict with duration_ms, has_video, audio_codec, channels and sample_rate
+        (None where unknown)
+    """
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-show_entries', 'format=duration:stream=codec_type,codec_name,channels,sample_rate',
+        '-of', 'json',
+        media_file
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe failed: {result.stderr.strip()}")
+    data = json.loads(result.stdout)
+    
+    streams = data.get('streams', [])
+    audio = next((st for st in streams if st.get('codec_type') == 'audio'), {})
+    duration = data.get('format', {}).get('duration')
+    return {
+        'duration_ms': int(float(duration) * 1000) if duration else None,
+        'has_video': any(st.get('codec_type') == 'video' for st in streams),
+        'audio_codec': audio.get('codec_name'),
+        'channels': audio.get('channels'),
+        'sample_rate': int(audio['sample_rate']) if audio.get('sample_rate') else None
+    }
+
+def plan_extraction(input_file, output_dir, profile=DEFAULT_PROFILE):
+    """Choose the extraction profile and output path for a media file
+
+    With the 'auto' profile the input is inspected with ffprobe: video files whose
+    audio codec is already accepted for transcription are stream-copied, anything
+    else is re-encoded with the speech profile.
+
+    Returns:
+        Dict with input, output, profile and duration_ms (None if not probed)
+    """
+    probe = None
+    profile_name = profile
+    
+    if profile in (AUTO_PROFILE, 'copy'):
+        try:
+            probe = probe_media(input_file)
+        except Exception as e:
+            print(f"⚠️  Could not inspect {input_file}: {e}")
+        
+        can_copy = probe is not None and probe['has_video'] and probe['audio_codec'] in COPY_CODEC_EXTENSIONS
+        if can_copy:
+            profile_name = 'copy'
+        else:
+            if profile == 'copy':
+                codec = probe['audio_codec'] if probe else 'unknown'
+                print(f"⚠️  Cannot stream-copy {codec} audio from {input_file}, using {AUTO_FALLBACK_PROFILE}")
+            profile_name = AUTO_FALLBACK_PROFILE
+    
+    if profile_name == 'copy':
+        extension = COPY_CODEC_EXTENSIONS[probe['audio_codec']]
+    else:
+        extension = EXTRACTION_PROFILES[profile_name]['extension']
+    
+    base_name = Path(input_file).stem
+    return {
+        'input': input_file,
+        'output': os.path.join(output_dir, f"{base_name}{extension}"),
+        'profile': profile_name,
+        'duration_ms': probe['duration_ms'] if probe else None
+    }
+
+def report_progress(progress_lines, input_file, duration_ms=None):
+    """Print live extraction progress from ffmpeg's -progress output"""
+    name = os.path.basename(input_file)
+    next_report = PROGRESS_STEP_PERCENT if duration_ms else PROGRESS_STEP_UNKNOWN_MS
+    
+    for line in progress_lines:
+        key, _, value = line.strip().partition('=')
+        # out_time_us (and the misnamed out_time_ms) are both in microseconds
+        if key not in ('out_time_us', 'out_time_ms') or not value.isdigit():
+            continue
+        position_ms = int(value) // 1000
+        
+        if duration_ms:
+            percent = min(100, position_ms * 100 // duration_ms)
+            if percent >= next_report and percent < 100:
+                print(f"   ⏳ {name}: {percent}% ({format_ms(position_ms)} / {format_ms(duration_ms)})")
+                next_report = (percent // PROGRESS_STEP_PERCENT + 1) * PROGRESS_STEP_PERCENT
+        elif position_ms >= next_report:
+            print(f"   ⏳ {name}: {format_ms(position_ms)} extracted")
+            next_report += PROGRESS_STEP_UNKNOWN_MS
+
+def format_ms(milliseconds):
+    """Format milliseconds as HH:MM:SS"""
+    seconds = int(milliseconds // 1000)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+def extract_audio(input_file, output_file, threads=None, profile=DEFAULT_PROFILE, duration_ms=None):
+    """Extract audio from video file using ffmpeg
+
+    Args:
+        threads: Optional ffmpeg -threads limit for this extraction
+        profile: Name of an entry in EXTRACTION_PROFILES (resolve 'auto' with plan_extraction first)
+        duration_ms: Input duration for progress reporting (probed if not given)
+    """
     try:
-        print(f"🎬 Extracting audio from: {input_file}")
+        print(f"🎬 Extracting audio from: {input_file} ({profile})")
         start_time = time.time()
         
         # Build ffmpeg command
         # -i: input file
         # -vn: no video
-        # -acodec: audio codec (mp3)
-        # -ab: audio bitrate (192k for good quality)
-        # -ar: audio sample rate (44100 Hz)
+        # profile args: audio codec, bitrate, sample rate and channels
+        # -threads: limit ffmpeg threads (when running several extractions at once)
+        # -progress: machine-readable progress on stdout for live reporting
         # -y: overwrite output file
         cmd = [
             'ffmpeg',
             '-i', input_file,
-            '-vn',  # No video
-            '-acodec', 'mp3',
-            '-ab', '192k',
-            '-ar', '44100',
+            '-vn'  # No video
+        ]
+        cmd.extend(EXTRACTION_PROFILES[profile]['args'])
+        if threads:
+            cmd.extend(['-threads', str(threads)])
+        cmd.extend([
+            '-progress', 'pipe:1',
+            '-nostats',
             '-y',  # Overwrite if exists
             output_file
-        ]
+        ])
         
-        # Run ffmpeg
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        if duration_ms is None:
+            try:
+                duration_ms = get_media_duration_ms(input_file)
+            except Exception:
+                duration_ms = None
         
-        if result.returncode != 0:
-            print(f"❌ FFmpeg error: {result.stderr}")
-            return False
+        # Run ffmpeg, streaming progress while it works
+        with tempfile.TemporaryFile(mode='w+') as stderr_file:
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, text=True)
+            report_progress(process.stdout, input_file, duration_ms)
+            returncode = process.wait()
+            
+            if returncode != 0:
+                stderr_file.seek(0)
+                print(f"❌ FFmpeg error: {stderr_file.read()}")
+                return False
         
         elapsed = time.time() - start_time
         output_size = get_file_size_mb(output_file)
@@ -74,51 +275,233 @@ def extract_audio(input_file, output_file):
         print(f"❌ Error extracting audio: {str(e)}")
         return False
 
-def find_unprocessed_media_files():
-    """Find all media files that need processing"""
-    unprocessed = []
+class AudioStream:
+    """File-like reader over ffmpeg's stdout for uploading audio without a local file
+
+    Reading yields the encoded audio as ffmpeg produces it. If `keep_file` is
+    set, everything read is also written to that file. close() waits for
+    ffmpeg and raises RuntimeError if it failed, so a truncated stream is
+    never mistaken for complete audio.
+    """
+
+    def __init__(self, cmd, input_file, profile, keep_file=None, chunk_size=STREAM_CHUNK_SIZE):
+        self.input_file = input_file
+        self.profile = profile
+        self.keep_file = keep_file
+        self.chunk_size = chunk_size
+        self.bytes_read = 0
+        self._stderr = tempfile.TemporaryFile()
+        self._keep = open(keep_file, 'wb') if keep_file else None
+        self._closed = False
+        self.process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=self._stderr)
+
+    def read(self, size=-1):
+        data = self.process.stdout.read(size if size and size > 0 else -1)
+        self.bytes_read += len(data)
+        if self._keep is not None:
+            self._keep.write(data)
+        return data
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    def close(self):
+        """Wait for ffmpeg to finish and check that the stream is complete"""
+        if self._closed:
+            return
+        self._closed = True
+        
+        # Drain anything left unread so ffmpeg can exit
+        unread = sum(len(chunk) for chunk in self)
+        self.process.stdout.close()
+        returncode = self.process.wait()
+        if self._keep is not None:
+            self._keep.close()
+        
+        self._stderr.seek(0)
+        error = self._stderr.read().decode('utf-8', errors='replace')
+        self._stderr.close()
+        
+        if returncode != 0:
+            if self.keep_file and os.path.exists(self.keep_file):
+                os.remove(self.keep_file)
+            raise RuntimeError(f"FFmpeg stream from {self.input_file} failed: {error.strip()[-500:]}")
+        if unread:
+            print(f"⚠️  {unread} bytes of audio were not consumed by the upload")
+
+    def abort(self):
+        """Stop ffmpeg without checking the result (e.g. after a failed upload)"""
+        if self._closed:
+            return
+        self._closed = True
+        self.process.kill()
+        self.process.wait()
+        self.process.stdout.close()
+        self._stderr.close()
+        if self._keep is not None:
+            self._keep.close()
+            if os.path.exists(self.keep_file):
+                os.remove(self.keep_file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+def open_audio_stream(input_file, profile=DEFAULT_PROFILE, threads=None, keep_dir=None):
+    """Start ffmpeg extracting audio from a media file into a pipe
+
+    Args:
+        input_file: Video (or audio) file to read
+        profile: Extraction profile name, or 'auto' to choose with ffprobe
+        threads: Optional ffmpeg -threads limit
+        keep_dir: If set, also save the audio to <keep_dir>/<name><ext>
+
+    Returns:
+        AudioStream to pass to the upload
+    """
+    task = plan_extraction(input_file, keep_dir or '.', profile)
+    output_format, extension = STREAM_FORMATS[Path(task['output']).suffix]
+    keep_file = os.path.join(keep_dir, f"{Path(input_file).stem}{extension}") if keep_dir else None
+    
+    cmd = [
+        'ffmpeg',
+        '-i', input_file,
+        '-vn'  # No video
+    ]
+    cmd.extend(EXTRACTION_PROFILES[task['profile']]['args'])
+    if threads:
+        cmd.extend(['-threads', str(threads)])
+    cmd.extend([
+        '-nostats',
+        '-f', output_format,
+        'pipe:1'
+    ])
+    
+    print(f"🌊 Streaming audio from: {input_file} ({task['profile']}, {output_format})")
+    return AudioStream(cmd, input_file, task['profile'], keep_file=keep_file)
+
+def run_extractions(tasks, workers=DEFAULT_WORKERS, threads=None):
+    """Extract audio for several files using a pool of ffmpeg processes
+
+    Args:
+        tasks: List of extraction plans from plan_extraction()
+        workers: Number of extractions run at the same time
+        threads: Optional ffmpeg -threads limit per extraction
+
+    Returns:
+        List of result dicts (input, output, profile, success, elapsed, size_mb) in task order
+    """
+    def run_task(task):
+        output_file = task['output']
+        start_time = time.time()
+        success = extract_audio(task['input'], output_file, threads=threads,
+                                profile=task['profile'], duration_ms=task['duration_ms'])
+        elapsed = time.time() - start_time
+        size_mb = get_file_size_mb(output_file) if success and os.path.exists(output_file) else 0.0
+        return {
+            'input': task['input'],
+            'output': output_file,
+            'profile': task['profile'],
+            'success': success,
+            'elapsed': elapsed,
+            'size_mb': size_mb
+        }
+    
+    if not tasks:
+        return []
+    
+    workers = max(1, min(workers, len(tasks)))
+    if workers == 1:
+        return [run_task(task) for task in tasks]
+    
+    print(f"\n⚡ Extracting {len(tasks)} files with {workers} parallel ffmpeg workers"
+          + (f" ({threads} threads each)" if threads else ""))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run_task, tasks))
+
+def print_timing_summary(results, wall_time):
+    """Print per-file extraction timing and the aggregate speedup"""
+    if not results:
+        return
     
-    # Check if we're in workbench mode
-    current_dir = os.getcwd()
-    in_workbench = 'workbench/input' in current_dir or current_dir.endswith('input')
+    print(f"\n⏱️  EXTRACTION TIMING")
+    for result in results:
+        status = "✅" if result['success'] else "❌"
+        print(f"   {status} {result['input']} [{result['profile']}]: {result['elapsed']:.1f}s, {result['size_mb']:.1f} MB")
     
-    # Find all video and audio files
-    all_extensions = VIDEO_EXTENSIONS + AUDIO_EXTENSIONS
-    media_files = []
+    profiles = {}
+    for result in results:
+        if result['success']:
+            totals = profiles.setdefault(result['profile'], {'files': 0, 'elapsed': 0.0, 'size_mb': 0.0})
+            totals['files'] += 1
+            totals['elapsed'] += result['elapsed']
+            totals['size_mb'] += result['size_mb']
+    for profile, totals in sorted(profiles.items()):
+        description = EXTRACTION_PROFILES[profile]['description']
+        print(f"   📦 {profile} ({description}): {totals['files']} file(s), {totals['elapsed']:.1f}s, {totals['size_mb']:.1f} MB")
     
-    for ext in all_extensions:
-        media_files.extend(glob.glob(f"*{ext}"))
-        media_files.extend(glob.glob(f"*{ext.upper()}"))
+    total_time = sum(result['elapsed'] for result in results)
+    print(f"   Total ffmpeg time: {total_time:.1f}s, wall time: {wall_time:.1f}s", end="")
+    if wall_time > 0:
+        print(f" ({total_time / wall_time:.1f}x parallel speedup)")
+    else:
+        print()
+
+def get_default_output_dir(input_dir):
+    """Get the output directory matching an input directory
+
+    In workbench mode (.../workbench/input) transcripts live in the sibling
+    output directory; otherwise they sit next to the media files.
+    """
+    input_dir = os.path.abspath(input_dir)
+    if os.path.basename(input_dir) == 'input':
+        return os.path.join(os.path.dirname(input_dir), 'output')
+    return None
+
+def find_unprocessed_media_files(input_dir='.', output_dir=None, verbose=True, inventory=None):
+    """Find all media files in a directory that need processing
+
+    Args:
+        input_dir: Directory to search for media files
+        output_dir: Directory with one folder per processed file
+            (<output_dir>/<name>/<name>.json); None when processed folders sit
+            in input_dir. A <name>.json next to the media counts as processed too.
+        verbose: Print every file checked
+        inventory: Inventory from media_inventory.build_inventory to reuse
+            instead of listing the folders again
+    """
+    if inventory is None:
+        inventory = build_inventory(input_dir, output_dir, VIDEO_EXTENSIONS + AUDIO_EXTENSIONS)
+    unprocessed = []
     
-    print(f"   Found {len(media_files)} media files in directory")
+    if verbose:
+        print(f"   Found {len(inventory['media'])} media files in directory")
     
-    for media_file in media_files:
-        base_name = Path(media_file).stem
-        print(f"   Checking: {media_file}")
+    for media in inventory['media']:
+        media_file = media['path']
+        if verbose:
+            print(f"   Checking: {media_file}")
         
         # Check if already processed (has corresponding JSON)
-        if in_workbench:
-            # In workbench mode, check output directory
-            output_dir = current_dir.replace('/input', '/output')
-            json_file = os.path.join(output_dir, base_name, f"{base_name}.json")
-            print(f"      Looking for JSON at: {json_file}")
-        else:
-            # Normal mode - check current directory
-            json_file = f"{base_name}.json"
-            
-        if os.path.exists(json_file):
-            print(f"      Skipping - already processed (found {json_file})")
-            continue
-        
-        # Check if it's already in a folder
-        dirname = os.path.dirname(media_file)
-        if dirname and dirname != '.':
-            print(f"      Skipping - file is in subdirectory: {dirname}")
+        json_file = find_transcript(inventory, media_file)
+        if json_file:
+            if verbose:
+                print(f"      Skipping - already processed (found {json_file})")
             continue
         
         # Get file info
-        file_size_mb = get_file_size_mb(media_file)
-        file_ext = Path(media_file).suffix.lower()
+        file_size_mb = media['size'] / (1024 * 1024)
+        file_ext = media['extension']
         
         file_info = {
             'path': media_file,
@@ -138,8 +521,20 @@ def find_unprocessed_media_files():
     
     return unprocessed
 
-def preprocess_media_files():
-    """Main preprocessing function"""
+def preprocess_media_files(input_dir='.', output_dir=None, workers=DEFAULT_WORKERS, threads=None,
+                           profile=DEFAULT_PROFILE):
+    """Main preprocessing function
+
+    Args:
+        input_dir: Directory with media files; extracted audio is written here
+        output_dir: Directory with processed folders (see find_unprocessed_media_files)
+        workers: Number of ffmpeg extractions run at the same time
+        threads: Optional ffmpeg -threads limit per extraction
+        profile: Extraction profile name, or 'auto' to choose per file with ffprobe
+
+    Returns:
+        List of audio files ready for transcription after extraction
+    """
     print("🎬 Video Preprocessor for AssemblyAI Workbench")
     print("=" * 50)
     
@@ -149,16 +544,16 @@ def preprocess_media_files():
         print("   • macOS: brew install ffmpeg")
         print("   • Ubuntu: sudo apt install ffmpeg")
         print("   • Windows: Download from https://ffmpeg.org/download.html")
-        return
+        return []
     
     print("✅ FFmpeg is available")
     
     # Find unprocessed files
-    unprocessed = find_unprocessed_media_files()
+    unprocessed = find_unprocessed_media_files(input_dir, output_dir)
     
     if not unprocessed:
         print("✨ No unprocessed media files found")
-        return
+        return []
     
     # Categorize files
     videos = [f for f in unprocessed if f['is_video']]
@@ -170,108 +565,173 @@ def preprocess_media_files():
     print(f"   • {len(large_audios)} large audio files (>{MAX_FILE_SIZE_MB}MB)")
     print(f"   • {len(ready_audios)} ready audio files")
     
-    # Process files that need extraction
+    # Collect files that need extraction
     extracted_files = []
+    tasks = []
     
     for file_info in unprocessed:
         if not file_info['needs_extraction']:
             print(f"\n✅ {file_info['path']} ({file_info['size_mb']:.1f}MB) - Ready for transcription")
             continue
         
-        print(f"\n{'='*60}")
-        print(f"Processing: {file_info['path']} ({file_info['size_mb']:.1f}MB)")
-        print(f"{'='*60}")
-        
-        # Generate output filename
-        base_name = Path(file_info['path']).stem
-        output_file = f"{base_name}.mp3"
+        # Choose profile and output filename
+        task = plan_extraction(file_info['path'], input_dir, profile)
+        output_file = task['output']
         
-        # Check if MP3 already exists
+        # Check if extracted audio already exists
         if os.path.exists(output_file):
-            print(f"⚠️  MP3 already exists: {output_file}")
+            print(f"⚠️  Audio already exists: {output_file}")
             extracted_files.append(output_file)
             continue
         
-        # Extract audio
-        if extract_audio(file_info['path'], output_file):
-            extracted_files.append(output_file)
+        print(f"📋 Queued: {file_info['path']} ({file_info['size_mb']:.1f}MB, {task['profile']})")
+        tasks.append(task)
+    
+    # Extract audio in parallel
+    wall_start = time.time()
+    results = run_extractions(tasks, workers=workers, threads=threads)
+    wall_time = time.time() - wall_start
+    
+    for result in results:
+        if result['success']:
+            extracted_files.append(result['output'])
             
             # Check if extracted file is small enough
-            extracted_size = get_file_size_mb(output_file)
-            if extracted_size > MAX_FILE_SIZE_MB:
-                print(f"⚠️  Warning: Extracted audio is still large ({extracted_size:.1f}MB)")
-                print(f"   Consider using a lower bitrate or splitting the file")
+            if result['size_mb'] > MAX_FILE_SIZE_MB:
+                print(f"⚠️  Warning: Extracted audio is still large ({result['output']}: {result['size_mb']:.1f}MB)")
+                print(f"   batch_process will split it into chunks and transcribe them in parallel")
         else:
-            print(f"❌ Failed to extract audio from {file_info['path']}")
+            print(f"❌ Failed to extract audio from {result['input']}")
+    
+    print_timing_summary(results, wall_time)
+    extracted_inputs = {result['input'] for result in results if result['success']}
     
     # Summary
     print(f"\n{'='*50}")
     print("📊 PREPROCESSING SUMMARY")
     print(f"{'='*50}")
     print(f"📁 Total files found: {len(unprocessed)}")
-    print(f"🎬 Videos processed: {len([f for f in videos if f['path'] in extracted_files])}")
-    print(f"🎵 Large audios processed: {len([f for f in large_audios if f['path'] in extracted_files])}")
+    print(f"🎬 Videos processed: {len([f for f in videos if f['path'] in extracted_inputs])}")
+    print(f"🎵 Large audios processed: {len([f for f in large_audios if f['path'] in extracted_inputs])}")
     print(f"✅ Ready for transcription: {len(ready_audios) + len(extracted_files)}")
     
     if extracted_files:
         print(f"\n💡 Next step: Run batch-process.py to transcribe the extracted audio files")
+    
+    return [f['path'] for f in ready_audios] + extracted_files
 
-def main():
-    """Entry point"""
-    import sys
+def extract_files(files_to_process, output_dir='.', workers=DEFAULT_WORKERS, threads=None,
+                  profile=DEFAULT_PROFILE):
+    """Extract audio from specific video files
+
+    Args:
+        files_to_process: Video file paths
+        output_dir: Directory the extracted audio files are written to
+        workers: Number of ffmpeg extractions run at the same time
+        threads: Optional ffmpeg -threads limit per extraction
+        profile: Extraction profile name, or 'auto' to choose per file with ffprobe
+
+    Returns:
+        List of extracted (or already existing) audio files
+    """
+    print("🎬 Video Preprocessor for AssemblyAI Workbench")
+    print("=" * 50)
     
-    if len(sys.argv) > 1:
-        # Process specific files passed as arguments
-        files_to_process = sys.argv[1:]
-        print("🎬 Video Preprocessor for AssemblyAI Workbench")
-        print("=" * 50)
+    # Check ffmpeg
+    if not check_ffmpeg():
+        print("❌ FFmpeg not found! Please install ffmpeg:")
+        print("   • macOS: brew install ffmpeg")
+        print("   • Ubuntu: sudo apt install ffmpeg")
+        print("   • Windows: Download from https://ffmpeg.org/download.html")
+        return []
+    
+    print("✅ FFmpeg is available")
+    print(f"📁 Processing {len(files_to_process)} specified file(s)")
+    
+    tasks = []
+    audio_files = []
+    for file_path in files_to_process:
+        if not os.path.exists(file_path):
+            print(f"\n❌ File not found: {file_path}")
+            continue
         
-        # Check ffmpeg
-        if not check_ffmpeg():
-            print("❌ FFmpeg not found! Please install ffmpeg:")
-            print("   • macOS: brew install ffmpeg")
-            print("   • Ubuntu: sudo apt install ffmpeg")
-            print("   • Windows: Download from https://ffmpeg.org/download.html")
-            return
+        # Check if it's a video file
+        file_ext = Path(file_path).suffix.lower()
+        if file_ext not in VIDEO_EXTENSIONS:
+            print(f"\n⚠️  {file_path} is not a video file")
+            continue
         
-        print("✅ FFmpeg is available")
-        print(f"📁 Processing {len(files_to_process)} specified file(s)")
+        # Choose profile and output filename
+        task = plan_extraction(file_path, output_dir, profile)
+        output_file = task['output']
         
-        extracted_count = 0
-        for file_path in files_to_process:
-            if not os.path.exists(file_path):
-                print(f"\n❌ File not found: {file_path}")
-                continue
-            
-            # Check if it's a video file
-            file_ext = Path(file_path).suffix.lower()
-            if file_ext not in VIDEO_EXTENSIONS:
-                print(f"\n⚠️  {file_path} is not a video file")
-                continue
-            
-            print(f"\n{'='*60}")
-            print(f"Processing: {file_path}")
-            print(f"{'='*60}")
-            
-            # Generate output filename
-            base_name = Path(file_path).stem
-            output_file = f"{base_name}.mp3"
-            
-            # Check if MP3 already exists
-            if os.path.exists(output_file):
-                print(f"⚠️  MP3 already exists: {output_file}")
-                continue
-            
-            # Extract audio
-            if extract_audio(file_path, output_file):
-                extracted_count += 1
-                print(f"✅ Successfully extracted audio to: {output_file}")
+        # Check if extracted audio already exists
+        if os.path.exists(output_file):
+            print(f"⚠️  Audio already exists: {output_file}")
+            audio_files.append(output_file)
+            continue
         
-        print(f"\n{'='*50}")
-        print(f"📊 Processed {extracted_count} file(s)")
+        tasks.append(task)
+    
+    # Extract audio in parallel
+    wall_start = time.time()
+    results = run_extractions(tasks, workers=workers, threads=threads)
+    wall_time = time.time() - wall_start
+    
+    extracted_count = 0
+    for result in results:
+        if result['success']:
+            extracted_count += 1
+            audio_files.append(result['output'])
+            print(f"✅ Successfully extracted audio to: {result['output']}")
+    
+    print_timing_summary(results, wall_time)
+    
+    print(f"\n{'='*50}")
+    print(f"📊 Processed {extracted_count} file(s)")
+    return audio_files
+
+def parse_arguments(argv):
+    """Parse command line arguments for the preprocessor"""
+    parser = argparse.ArgumentParser(
+        description="Extract audio from video files for transcription"
+    )
+    parser.add_argument('files', nargs='*',
+                        help="Specific video files to process (default: all unprocessed files)")
+    parser.add_argument('-w', '--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"Number of ffmpeg extractions run at the same time (default: {DEFAULT_WORKERS})")
+    parser.add_argument('--threads', type=int, default=None,
+                        help="Limit ffmpeg to this many threads per extraction")
+    parser.add_argument('--profile', choices=list(EXTRACTION_PROFILES) + [AUTO_PROFILE], default=DEFAULT_PROFILE,
+                        help=f"Audio extraction profile (default: {DEFAULT_PROFILE}); "
+                             f"'auto' stream-copies accepted codecs and uses {AUTO_FALLBACK_PROFILE} otherwise")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.threads is not None and args.threads < 1:
+        parser.error("--threads must be at least 1")
+    return args
+
+def main():
+    """Entry point"""
+    import sys
+    
+    args = parse_arguments(sys.argv[1:])
+    
+    if args.files:
+        # Process specific files passed as arguments
+        extract_files(args.files, output_dir='.', workers=args.workers, threads=args.threads,
+                      profile=args.profile)
     else:
-        # Run normal batch mode
-        preprocess_media_files()
+        # Run normal batch mode on the current directory
+        input_dir = os.getcwd()
+        preprocess_media_files(
+            input_dir=input_dir,
+            output_dir=get_default_output_dir(input_dir),
+            workers=args.workers,
+            threads=args.threads,
+            profile=args.profile
+        )
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,258 @@
+"""
+Word Store - Compact columnar storage for transcript words
+
+AssemblyAI returns every word as a dict with five keys, which costs several
+hundred bytes per word once loaded. A WordStore keeps the same data in
+parallel columns instead: start and end times and confidences in typed arrays,
+speakers as small integer codes into a table of interned labels, and all word
+texts in one string buffer addressed by offsets. That is roughly 40 bytes per
+word.
+
+The renderers read a store directly through its columns. Existing code that
+expects a list of word dicts can index and iterate a store as before; it gets
+dict-compatible WordView objects backed by the columns.
+"""
+
+import io
+import math
+from array import array
+from operator import itemgetter
+from collections.abc import MutableMapping, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+WORD_KEYS = ('text', 'start', 'end', 'confidence', 'speaker')
+WORD_KEY_SET = frozenset(WORD_KEYS)
+
+def milliseconds(value):
+    """Word time as a whole number of milliseconds for the integer columns
+
+    Transcripts from the API use integers, but hand-edited files or other
+    tools may write floats such as 1200.0.
+    """
+    return value if type(value) is int else int(round(value))
+
+class WordStore(Sequence):
+    """Columnar, read-mostly store of transcript words"""
+
+    def __init__(self, starts, ends, confidences, speaker_codes, speakers, text, offsets, extras=None):
+        self.starts = starts
+        self.ends = ends
+        self.confidences = confidences
+        self.speaker_codes = speaker_codes
+        self.speakers = speakers
+        self.text = text
+        self.offsets = offsets
+        # Any keys beyond the standard five, as {word index: {key: value}}
+        self.extras = extras if extras is not None else {}
+        self._speaker_index = {label: code for code, label in enumerate(speakers)}
+
+    @classmethod
+    def from_words(cls, words):
+        """Build a store from an iterable of word dicts
+
+        The iterable is consumed once, so it can be a generator that never
+        holds all word dicts in memory at the same time.
+        """
+        starts = array('q')
+        ends = array('q')
+        confidences = array('d')
+        speaker_codes = array('I')
+        speakers = []
+        speaker_index = {}
+        buffer = io.StringIO()
+        offsets = array('Q', [0])
+        extras = {}
+        position = 0
+
+        for index, word in enumerate(words):
+            speaker = word.get('speaker')
+            code = speaker_index.get(speaker)
+            if code is None:
+                code = speaker_index[speaker] = len(speakers)
+                speakers.append(speaker)
+            text = word['text']
+            position += buffer.write(text)
+
+            starts.append(milliseconds(word['start']))
+            ends.append(milliseconds(word['end']))
+            confidences.append(word.get('confidence', math.nan))
+            speaker_codes.append(code)
+            offsets.append(position)
+            if len(word) != len(WORD_KEYS) or 'speaker' not in word or 'confidence' not in word:
+                extra = {key: word[key] for key in word if key not in WORD_KEY_SET}
+                if extra:
+                    extras[index] = extra
+
+        return cls(starts, ends, confidences, speaker_codes, speakers, buffer.getvalue(), offsets, extras)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [WordView(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("word index out of range")
+        return WordView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield WordView(self, index)
+
+    def text_at(self, index):
+        """Text of the word at an index"""
+        return self.text[self.offsets[index]:self.offsets[index + 1]]
+
+    def speaker_at(self, index):
+        """Speaker label of the word at an index"""
+        return self.speakers[self.speaker_codes[index]]
+
+    def texts(self):
+        """Iterate over all word texts"""
+        text = self.text
+        offsets = self.offsets
+        for index in range(len(self)):
+            yield text[offsets[index]:offsets[index + 1]]
+
+    def speaker_labels(self):
+        """Iterate over the speaker label of every word"""
+        return map(self.speakers.__getitem__, self.speaker_codes)
+
+    def rows(self):
+        """Iterate over (text, start, end, speaker) tuples, the fields the renderers use"""
+        return zip(self.texts(), self.starts, self.ends, self.speaker_labels())
+
+    def join_text(self, first, last, separator=' '):
+        """Join the texts of words[first:last]"""
+        return separator.join(self.text_at(index) for index in range(first, last))
+
+    def intern_speaker(self, label):
+        """Return the code for a speaker label, adding it to the table if new"""
+        code = self._speaker_index.get(label)
+        if code is None:
+            code = self._speaker_index[label] = len(self.speakers)
+            self.speakers.append(label)
+        return code
+
+    def rename_speakers(self, mapping):
+        """Rename speakers in place by rewriting the label table, not the words"""
+        self.speakers = [mapping.get(label, label) for label in self.speakers]
+        self._speaker_index = {}
+        for code, label in enumerate(self.speakers):
+            self._speaker_index.setdefault(label, code)
+
+    def canonical_speaker_codes(self):
+        """For every code, the first code with the same label
+
+        After a rename gives two speakers one label, their codes differ but
+        they are the same speaker; map codes through this list before
+        comparing them.
+        """
+        return [self._speaker_index[label] for label in self.speakers]
+
+    def to_words(self):
+        """Convert back to a list of plain word dicts"""
+        return [dict(view) for view in self]
+
+    def numpy_columns(self):
+        """Zero-copy NumPy views of the start, end and speaker code columns
+
+        Returns:
+            (starts, ends, speaker_codes) arrays, or None if NumPy is not installed
+        """
+        if np is None:
+            return None
+        return (np.frombuffer(self.starts, dtype=np.int64),
+                np.frombuffer(self.ends, dtype=np.int64),
+                np.frombuffer(self.speaker_codes, dtype=np.uint32))
+
+    @property
+    def nbytes(self):
+        """Approximate memory used by the columns and text buffer"""
+        columns = (self.starts, self.ends, self.confidences, self.speaker_codes, self.offsets)
+        return sum(column.itemsize * len(column) for column in columns) + len(self.text.encode('utf-8'))
+
+class WordView(MutableMapping):
+    """Dict-compatible view of one word in a WordStore
+
+    Reads and writes go straight to the store's columns; keys beyond the
+    standard five are kept per word. Word text is read-only because all
+    texts share one buffer.
+    """
+
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    def __getitem__(self, key):
+        store = self.store
+        if key == 'text':
+            return store.text_at(self.index)
+        if key == 'start':
+            return store.starts[self.index]
+        if key == 'end':
+            return store.ends[self.index]
+        if key == 'speaker':
+            return store.speaker_at(self.index)
+        if key == 'confidence':
+            confidence = store.confidences[self.index]
+            if not math.isnan(confidence):
+                return confidence
+            raise KeyError(key)
+        return store.extras.get(self.index, {})[key]
+
+    def __setitem__(self, key, value):
+        store = self.store
+        if key == 'start':
+            store.starts[self.index] = milliseconds(value)
+        elif key == 'end':
+            store.ends[self.index] = milliseconds(value)
+        elif key == 'confidence':
+            store.confidences[self.index] = value
+        elif key == 'speaker':
+            store.speaker_codes[self.index] = store.intern_speaker(value)
+        elif key == 'text':
+            raise TypeError("word text is read-only in a WordStore")
+        else:
+            store.extras.setdefault(self.index, {})[key] = value
+
+    def __delitem__(self, key):
+        extra = self.store.extras.get(self.index, {})
+        if key not in extra:
+            raise TypeError(f"cannot delete '{key}' from a word in a WordStore")
+        del extra[key]
+
+    def __iter__(self):
+        for key in WORD_KEYS:
+            if key != 'confidence' or not math.isnan(self.store.confidences[self.index]):
+                yield key
+        yield from self.store.extras.get(self.index, ())
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+def word_rows(words):
+    """Iterate over (text, start, end, speaker) for a WordStore or a list of word dicts"""
+    if isinstance(words, WordStore):
+        return words.rows()
+    return map(itemgetter('text', 'start', 'end', 'speaker'), words)
+
+def rename_word_speakers(words, mapping):
+    """Rename speakers in place in a WordStore or a list of word dicts"""
+    if isinstance(words, WordStore):
+        words.rename_speakers(mapping)
+        return
+    for word in words:
+        if word.get('speaker') in mapping:
+            word['speaker'] = mapping[word['speaker']]